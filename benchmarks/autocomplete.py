@@ -0,0 +1,89 @@
+"""Measure the keystroke latency of autocomplete over many candidates
+
+Each user types a candidate's name one character at a time, as Discord sends
+an autocomplete interaction per keystroke. The scan the commands used before
+checks every candidate on every keystroke, while the completer bisects for
+prefix matches and narrows the matches of the previous keystroke.
+
+Usage: ``python benchmarks/autocomplete.py [--candidates N] [--users N]``
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import random
+import statistics
+import string
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from scripty.functions import autocomplete  # noqa: E402
+
+
+def scan(choices: dict[str, str], query: str) -> dict[str, str]:
+    found: dict[str, str] = {}
+
+    for name, value in choices.items():
+        if len(found) == autocomplete.MAX_CHOICES:
+            break
+        if query.lower() in name.lower() or query.lower() in value.lower():
+            found[name] = value
+
+    return found
+
+
+def report(label: str, latencies: list[float]) -> None:
+    latencies.sort()
+    print(
+        f"{label:>9}: p50 {statistics.median(latencies) * 1e3:.2f} ms, "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1e3:.2f} ms, "
+        f"max {latencies[-1] * 1e3:.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    choices = {
+        "".join(rng.choices(string.ascii_letters + " ", k=rng.randint(6, 24)))
+        + f"#{index}": str(rng.getrandbits(60))
+        for index in range(args.candidates)
+    }
+
+    start = time.perf_counter()
+    completer = autocomplete.Completer(choices)
+    print(f"index build: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    names = list(choices)
+    typed = [rng.choice(names)[: rng.randint(3, 10)] for _ in range(args.users)]
+    # Users typing at the same time interleave their keystrokes
+    keystrokes = [
+        (user, query[:length])
+        for length in range(1, 11)
+        for user, query in enumerate(typed)
+        if length <= len(query)
+    ]
+
+    for label, complete in (
+        ("scan", lambda user, query: scan(choices, query)),
+        ("session", lambda user, query: completer.complete(query, session=user)),
+        ("stateless", lambda user, query: completer.complete(query)),
+    ):
+        latencies: list[float] = []
+
+        for user, query in keystrokes:
+            start = time.perf_counter()
+            complete(user, query)
+            latencies.append(time.perf_counter() - start)
+
+        report(label, latencies)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Load test the HTTP interaction server offline with signed requests
+
+Starts ``scripty.serve`` in process with a freshly generated signing key and
+sends it concurrent, correctly signed slash command interactions over
+localhost, then reports throughput and latency. Only commands which answer
+with the initial response, such as ``coin`` or ``dice``, avoid the network.
+
+Usage: ``python benchmarks/interactions.py [--command coin] [--requests N]``
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import collections
+import itertools
+import json
+import logging
+import pathlib
+import statistics
+import sys
+import time
+from typing import Any
+
+import aiohttp
+import hikari
+from nacl import signing
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from scripty import serve  # noqa: E402
+
+_ids = itertools.count(1)
+
+
+def command_payload(name: str, options: list[dict[str, Any]]) -> dict[str, Any]:
+    """Build a guild slash command interaction payload"""
+    return {
+        "id": str(next(_ids)),
+        "application_id": "1",
+        "type": 2,
+        "token": "benchmark",
+        "version": 1,
+        "guild_id": "2",
+        "channel_id": "3",
+        "locale": "en-US",
+        "guild_locale": "en-US",
+        "app_permissions": str(int(hikari.Permissions.all_permissions())),
+        "member": {
+            "user": {
+                "id": "4",
+                "username": "benchmark",
+                "discriminator": "0001",
+                "avatar": None,
+            },
+            "roles": [],
+            "joined_at": "2022-01-01T00:00:00+00:00",
+            "deaf": False,
+            "mute": False,
+            "permissions": str(int(hikari.Permissions.all_permissions())),
+        },
+        "data": {"id": "5", "name": name, "type": 1, "options": options},
+    }
+
+
+async def send(
+    session: aiohttp.ClientSession,
+    url: str,
+    key: signing.SigningKey,
+    payload: dict[str, Any],
+) -> tuple[int, float]:
+    """Sign and send an interaction, returning the status and latency"""
+    body = json.dumps(payload).encode()
+    timestamp = str(int(time.time())).encode()
+    headers = {
+        "Content-Type": "application/json",
+        "X-Signature-Ed25519": key.sign(timestamp + body).signature.hex(),
+        "X-Signature-Timestamp": timestamp.decode(),
+    }
+    start = time.perf_counter()
+
+    async with session.post(url, data=body, headers=headers) as response:
+        await response.read()
+        return response.status, time.perf_counter() - start
+
+
+async def run(args: argparse.Namespace) -> None:
+    key = signing.SigningKey.generate()
+    bot, _ = serve.build_rest_bot(args.modules, public_key=bytes(key.verify_key))
+    await bot.start(host="127.0.0.1", port=args.port, check_for_updates=False)
+    # Access logs for every request would dominate the measurement
+    logging.getLogger("hikari.interaction_server").setLevel(logging.WARNING)
+
+    url = f"http://127.0.0.1:{args.port}/"
+    options = json.loads(args.options)
+    statuses: collections.Counter[int] = collections.Counter()
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(session: aiohttp.ClientSession) -> None:
+        async with semaphore:
+            status, latency = await send(
+                session, url, key, command_payload(args.command, options)
+            )
+            statuses[status] += 1
+            latencies.append(latency)
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            await asyncio.gather(*(one(session) for _ in range(args.warmup)))
+            statuses.clear()
+            latencies.clear()
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one(session) for _ in range(args.requests)))
+            elapsed = time.perf_counter() - start
+    finally:
+        await bot.close()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{args.requests} x /{args.command} at concurrency {args.concurrency}: "
+        f"{args.requests / elapsed:.0f} req/s"
+    )
+    print(
+        f"  latency ms: p50 {quantiles[49] * 1000:.2f}  "
+        f"p95 {quantiles[94] * 1000:.2f}  p99 {quantiles[98] * 1000:.2f}"
+    )
+    print(f"  statuses: {dict(statuses)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--command", default="coin")
+    parser.add_argument("--options", default="[]", help="JSON command options")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--modules", nargs="+", default=list(serve.MODULES))
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""Measure the accuracy and throughput of the offline language identifier
+
+The sentences are short chat messages written separately from the samples
+the model is built from. A message the identifier is unsure of counts as
+abstained, which only costs a translation request, while a wrong language
+could skip a translation that was needed. The negative sentences are in
+languages the identifier does not report, or are too short to tell, so any
+language detected for them is wrong.
+
+Usage: ``python benchmarks/langid.py [--repeat N]``
+"""
+from __future__ import annotations
+
+import argparse
+import collections
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from scripty.functions import langid  # noqa: E402
+
+SENTENCES: dict[str, tuple[str, ...]] = {
+    "en": (
+        "Can someone help me set up the bot in my server?",
+        "I'm going to bed now, see you all tomorrow",
+        "that was the worst movie I have seen this year",
+        "does anyone want to play later tonight",
+    ),
+    "es": (
+        "¿Alguien sabe cómo configurar el bot en mi servidor?",
+        "Me voy a dormir, nos vemos mañana",
+        "esa fue la peor película que he visto este año",
+        "alguien quiere jugar más tarde esta noche",
+    ),
+    "fr": (
+        "Quelqu'un sait comment configurer le bot sur mon serveur ?",
+        "Je vais me coucher, à demain tout le monde",
+        "c'était le pire film que j'ai vu cette année",
+        "quelqu'un veut jouer plus tard ce soir",
+    ),
+    "de": (
+        "Weiß jemand, wie man den Bot auf meinem Server einrichtet?",
+        "Ich gehe jetzt schlafen, bis morgen",
+        "das war der schlechteste Film, den ich dieses Jahr gesehen habe",
+        "hat heute Abend noch jemand Lust zu spielen",
+    ),
+    "it": (
+        "Qualcuno sa come configurare il bot nel mio server?",
+        "Vado a dormire, ci vediamo domani",
+        "è stato il film peggiore che ho visto quest'anno",
+        "qualcuno vuole giocare più tardi stasera",
+    ),
+    "pt": (
+        "Alguém sabe como configurar o bot no meu servidor?",
+        "Vou dormir agora, até amanhã pessoal",
+        "foi o pior filme que eu vi este ano",
+        "alguém quer jogar mais tarde hoje à noite",
+    ),
+    "nl": (
+        "Weet iemand hoe ik de bot op mijn server instel?",
+        "Ik ga nu slapen, tot morgen allemaal",
+        "dat was de slechtste film die ik dit jaar heb gezien",
+        "wil iemand vanavond nog een potje spelen",
+    ),
+    "sv": (
+        "Vet någon hur man ställer in boten på min server?",
+        "Jag går och lägger mig nu, vi ses i morgon",
+        "det var den sämsta filmen jag har sett i år",
+        "vill någon spela senare i kväll",
+    ),
+    "pl": (
+        "Czy ktoś wie, jak skonfigurować bota na moim serwerze?",
+        "Idę spać, do zobaczenia jutro",
+        "to był najgorszy film, jaki widziałem w tym roku",
+        "czy ktoś chce pograć dziś wieczorem",
+    ),
+    "tr": (
+        "Botu sunucumda nasıl kuracağımı bilen var mı?",
+        "Şimdi yatmaya gidiyorum, yarın görüşürüz",
+        "bu yıl izlediğim en kötü filmdi",
+        "bu akşam oyun oynamak isteyen var mı",
+    ),
+    "id": (
+        "Ada yang tahu cara mengatur bot di server saya?",
+        "Saya mau tidur sekarang, sampai jumpa besok",
+        "itu film terburuk yang saya tonton tahun ini",
+        "ada yang mau main nanti malam",
+    ),
+    "ru": (
+        "Кто-нибудь знает, как настроить бота на моём сервере?",
+        "Я пойду спать, увидимся завтра",
+        "это был худший фильм, который я видел в этом году",
+        "кто-нибудь хочет поиграть сегодня вечером",
+    ),
+    "uk": (
+        "Хтось знає, як налаштувати бота на моєму сервері?",
+        "Я піду спати, побачимося завтра",
+        "це був найгірший фільм, який я бачив цього року",
+        "хтось хоче пограти сьогодні ввечері",
+    ),
+    "ja": ("今日はいい天気ですね", "明日また遊ぼう"),
+    "ko": ("안녕하세요 여러분", "내일 다시 만나요"),
+    "zh-CN": ("今天天气很好", "明天见"),
+    "ar": ("مرحبا بالجميع", "أراكم غدا"),
+    "el": ("Καλημέρα σε όλους", "Τα λέμε αύριο"),
+}
+
+NEGATIVE: dict[str, tuple[str, ...]] = {
+    "da": (
+        "Er der nogen, der ved, hvordan man sætter botten op på min server?",
+        "Jeg går i seng nu, vi ses i morgen",
+        "det var den værste film, jeg har set i år",
+        "er der nogen, der vil spille senere i aften",
+    ),
+    "no": (
+        "Er det noen som vet hvordan jeg setter opp boten på serveren min?",
+        "Jeg legger meg nå, vi ses i morgen",
+        "det var den verste filmen jeg har sett i år",
+        "er det noen som vil spille senere i kveld",
+    ),
+    "ca": (
+        "Algú sap com configurar el bot al meu servidor?",
+        "Me'n vaig a dormir, ens veiem demà",
+        "va ser la pitjor pel·lícula que he vist aquest any",
+        "algú vol jugar més tard aquesta nit",
+    ),
+    "gl": (
+        "Alguén sabe como configurar o bot no meu servidor?",
+        "Vou durmir, vémonos mañá",
+        "foi a peor película que vin este ano",
+        "alguén quere xogar máis tarde esta noite",
+    ),
+    "af": (
+        "Weet iemand hoe om die bot op my bediener op te stel?",
+        "Ek gaan nou slaap, sien julle môre",
+        "dit was die slegste fliek wat ek hierdie jaar gesien het",
+        "wil iemand later vanaand speel",
+    ),
+    "ms": (
+        "Ada sesiapa tahu cara menyediakan bot dalam pelayan saya?",
+        "Saya nak tidur sekarang, jumpa esok",
+        "itu filem paling teruk yang saya tonton tahun ini",
+        "ada sesiapa nak main malam nanti",
+    ),
+    "ga": (
+        "An bhfuil a fhios ag aon duine conas an bota a shocrú ar mo fhreastalaí?",
+        "Táim ag dul a chodladh anois, feicfidh mé sibh amárach",
+        "ba é sin an scannán is measa a chonaic mé i mbliana",
+        "an bhfuil aon duine ag iarraidh imirt níos déanaí anocht",
+    ),
+    "fy": (
+        "Wit immen hoe't ik de bot op myn server ynstel?",
+        "Ik gean no sliepe, oant moarn",
+        "dat wie de minste film dy't ik dit jier sjoen haw",
+        "wol immen fannacht noch in potsje spylje",
+    ),
+    "bg": (
+        "Някой знае ли как да настроя бота на моя сървър?",
+        "Отивам да спя, ще се видим утре",
+        "това беше най-лошият филм, който съм гледал тази година",
+        "някой иска ли да играе по-късно тази вечер",
+    ),
+    "mk": (
+        "Дали некој знае како да го поставам ботот на мојот сервер?",
+        "Одам да спијам, се гледаме утре",
+        "тоа беше најлошиот филм што го гледав оваа година",
+        "дали некој сака да игра подоцна вечерва",
+    ),
+    "be": (
+        "Хтосьці ведае, як наладзіць бота на маім серверы?",
+        "Я пайду спаць, убачымся заўтра",
+        "гэта быў найгоршы фільм, які я бачыў у гэтым годзе",
+        "хтосьці хоча пагуляць сёння ўвечары",
+    ),
+    "zh-TW": ("今天天氣很好", "明天見", "有人知道怎麼在我的伺服器設定機器人嗎"),
+    "mr": (
+        "मी आता झोपायला जातो, उद्या भेटू",
+        "हा या वर्षातील सर्वात वाईट चित्रपट होता",
+    ),
+    "ne": (
+        "म अब सुत्न जान्छु, भोलि भेटौंला",
+        "यो यस वर्षको सबैभन्दा नराम्रो फिल्म थियो",
+    ),
+    "ur": ("میں اب سونے جا رہا ہوں، کل ملتے ہیں", "یہ اس سال کی سب سے بری فلم تھی"),
+    "chat": ("lol ok", "gg wp", "omg lmao", "brb xD", "hahaha"),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    langid.detect("warm up the n-gram models")
+    langid.detect("прогреть модели")
+    print(f"model build: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    outcomes: dict[str, collections.Counter[str]] = {}
+
+    for language, sentences in SENTENCES.items():
+        outcomes[language] = collections.Counter()
+
+        for sentence in sentences:
+            detected = langid.detect(sentence)
+
+            if detected is None:
+                outcomes[language]["abstained"] += 1
+            elif detected == language:
+                outcomes[language]["correct"] += 1
+            else:
+                outcomes[language]["wrong"] += 1
+                print(f"  {language} detected as {detected}: {sentence}")
+
+    for language, sentences in NEGATIVE.items():
+        outcomes[f"not {language}"] = outcome = collections.Counter()
+
+        for sentence in sentences:
+            detected = langid.detect(sentence)
+
+            if detected is None:
+                outcome["correct"] += 1
+            else:
+                outcome["wrong"] += 1
+                print(f"  {language} detected as {detected}: {sentence}")
+
+    total = collections.Counter[str]()
+
+    for language, outcome in outcomes.items():
+        total.update(outcome)
+        print(
+            f"{language:>9}: {outcome['correct']} correct, "
+            f"{outcome['abstained']} abstained, {outcome['wrong']} wrong"
+        )
+
+    count = sum(total.values())
+    print(
+        f"accuracy {total['correct'] / count:.1%}, "
+        f"abstained {total['abstained'] / count:.1%}, "
+        f"wrong {total['wrong'] / count:.1%}"
+    )
+
+    sentences = [sentence for group in SENTENCES.values() for sentence in group]
+    start = time.perf_counter()
+
+    for _ in range(args.repeat):
+        for sentence in sentences:
+            langid.detect(sentence)
+
+    elapsed = time.perf_counter() - start
+    calls = args.repeat * len(sentences)
+    print(
+        f"throughput {calls / elapsed:.0f} messages/s, "
+        f"{elapsed / calls * 1e6:.0f} us each"
+    )
+
+
+if __name__ == "__main__":
+    main()
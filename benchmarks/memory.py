@@ -0,0 +1,284 @@
+"""Measure gateway cache memory per guild for different cache settings
+
+Fills a bot's cache with synthetic guilds, as if they had arrived in guild
+create events, and reports the resident memory growth per 1000 guilds. Each
+profile runs in a fresh interpreter so the measurements do not interfere.
+
+Usage: ``python benchmarks/memory.py [--guilds N] [--members N] [--messages N]``
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import pathlib
+import subprocess
+import sys
+from typing import Any, Callable
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+PROFILES = ("default", "modules", "modules-no-util")
+COMPONENTS = ("guilds", "channels", "roles", "emojis", "members", "messages")
+CHANNELS = 30
+ROLES = 20
+EMOJIS = 10
+
+
+def _user(user_id: int) -> dict[str, Any]:
+    return {
+        "id": str(user_id),
+        "username": f"user{user_id}",
+        "discriminator": "0001",
+        "avatar": None,
+    }
+
+
+def guild_payload(guild_id: int, members: int) -> dict[str, Any]:
+    """Build a guild create payload with synthetic channels, roles and members"""
+    base = guild_id * 100_000
+    return {
+        "id": str(guild_id),
+        "name": f"guild {guild_id}",
+        "icon": None,
+        "splash": None,
+        "discovery_splash": None,
+        "owner_id": str(base + 1),
+        "afk_channel_id": None,
+        "afk_timeout": 300,
+        "verification_level": 0,
+        "default_message_notifications": 0,
+        "explicit_content_filter": 0,
+        "mfa_level": 0,
+        "application_id": None,
+        "system_channel_id": None,
+        "system_channel_flags": 0,
+        "rules_channel_id": None,
+        "vanity_url_code": None,
+        "description": None,
+        "banner": None,
+        "premium_tier": 0,
+        "preferred_locale": "en-US",
+        "public_updates_channel_id": None,
+        "nsfw_level": 0,
+        "features": [],
+        "joined_at": "2022-01-01T00:00:00+00:00",
+        "large": members > 250,
+        "member_count": members,
+        "roles": [
+            {
+                "id": str(guild_id if role == 0 else base + 10_000 + role),
+                "name": f"role {role}",
+                "color": 0,
+                "hoist": False,
+                "icon": None,
+                "unicode_emoji": None,
+                "position": role,
+                "permissions": "0",
+                "managed": False,
+                "mentionable": False,
+            }
+            for role in range(ROLES)
+        ],
+        "emojis": [
+            {
+                "id": str(base + 20_000 + emoji),
+                "name": f"emoji{emoji}",
+                "roles": [],
+                "require_colons": True,
+                "managed": False,
+                "animated": False,
+                "available": True,
+            }
+            for emoji in range(EMOJIS)
+        ],
+        "stickers": [],
+        "channels": [
+            {
+                "id": str(base + 30_000 + channel),
+                "type": 0,
+                "guild_id": str(guild_id),
+                "name": f"channel-{channel}",
+                "position": channel,
+                "permission_overwrites": [],
+                "nsfw": False,
+                "parent_id": None,
+                "topic": None,
+                "last_message_id": None,
+                "rate_limit_per_user": 0,
+            }
+            for channel in range(CHANNELS)
+        ],
+        "threads": [],
+        "members": [
+            {
+                "user": _user(base + 40_000 + member),
+                "nick": None,
+                "roles": [str(base + 10_001)],
+                "joined_at": "2022-01-01T00:00:00+00:00",
+                "deaf": False,
+                "mute": False,
+            }
+            for member in range(members)
+        ],
+        "presences": [],
+        "voice_states": [],
+    }
+
+
+def message_payload(guild_id: int, message: int) -> dict[str, Any]:
+    """Build a message create payload in the first channel of a guild"""
+    base = guild_id * 100_000
+    return {
+        "id": str(base + 90_000 + message),
+        "channel_id": str(base + 30_000),
+        "guild_id": str(guild_id),
+        "author": _user(base + 40_000),
+        "content": "synthetic message content " * 4,
+        "timestamp": "2022-01-01T00:00:00+00:00",
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+        "flags": 0,
+    }
+
+
+def _settings(profile: str) -> Any:
+    import hikari
+
+    from scripty.functions import gateway
+
+    if profile == "default":
+        return hikari.impl.CacheSettings()
+
+    disabled = ["util"] if profile == "modules-no-util" else []
+    return gateway.cache_settings_for(gateway.enabled_modules(disabled))
+
+
+def _rss() -> int:
+    import psutil
+
+    gc.collect()
+    return psutil.Process().memory_info().rss
+
+
+def measure(profile: str, guilds: int, members: int, messages: int) -> dict[str, int]:
+    """Get the resident memory growth in bytes from filling each cache component"""
+    import hikari
+
+    bot = hikari.GatewayBot("", banner=None, cache_settings=_settings(profile))
+    cache = bot.cache
+    factory = bot.entity_factory
+    me = hikari.Snowflake(1)
+
+    # Payloads are built up front so only the cached entities are measured
+    payloads = [guild_payload(guild_id, members) for guild_id in range(1, guilds + 1)]
+    growth: dict[str, int] = {}
+
+    def fill(component: str, store: Callable[[Any], None]) -> None:
+        before = _rss()
+        for payload in payloads:
+            # A fresh definition per component, as definitions keep what they
+            # deserialized alive
+            store(factory.deserialize_gateway_guild(payload, user_id=me))
+        growth[component] = _rss() - before
+
+    fill("guilds", lambda definition: cache.set_guild(definition.guild()))
+    fill(
+        "channels",
+        lambda definition: [
+            cache.set_guild_channel(channel)
+            for channel in definition.channels().values()
+        ],
+    )
+    fill(
+        "roles",
+        lambda definition: [
+            cache.set_role(role) for role in definition.roles().values()
+        ],
+    )
+    fill(
+        "emojis",
+        lambda definition: [
+            cache.set_emoji(emoji) for emoji in definition.emojis().values()
+        ],
+    )
+    fill(
+        "members",
+        lambda definition: [
+            cache.set_member(member) for member in definition.members().values()
+        ],
+    )
+    fill(
+        "messages",
+        lambda definition: [
+            cache.set_message(
+                factory.deserialize_message(message_payload(definition.id, message))
+            )
+            for message in range(messages)
+        ],
+    )
+    return growth
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guilds", type=int, default=2000)
+    parser.add_argument("--members", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=5)
+    parser.add_argument("--profile", choices=PROFILES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        print(
+            json.dumps(measure(args.profile, args.guilds, args.members, args.messages))
+        )
+        return
+
+    print(
+        f"{args.guilds} guilds, {args.members} members, {CHANNELS} channels, "
+        f"{ROLES} roles and {args.messages} messages each"
+    )
+
+    print(f"  {'MiB RSS per 1k guilds':<22}" + "".join(f"{c:>9}" for c in COMPONENTS))
+
+    for profile in PROFILES:
+        result = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--profile",
+                profile,
+                "--guilds",
+                str(args.guilds),
+                "--members",
+                str(args.members),
+                "--messages",
+                str(args.messages),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=dict(os.environ, PYTHONPATH=str(ROOT)),
+        )
+        growth = json.loads(result.stdout.strip().splitlines()[-1])
+        per_thousand = {
+            component: growth[component] / args.guilds * 1000 / 2**20
+            for component in COMPONENTS
+        }
+        print(
+            f"  {profile:<16}{sum(per_thousand.values()):>6.1f}"
+            + "".join(f"{per_thousand[c]:>9.1f}" for c in COMPONENTS)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Measure the cold start time of the bot without connecting to Discord
+
+Runs each measurement in a fresh interpreter from a temporary directory with
+a dummy config, so no private config, token or network access is needed.
+
+Usage: ``python benchmarks/startup.py [--runs N] [--top N] [--module NAME]``
+"""
+from __future__ import annotations
+
+import argparse
+import collections
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+CONFIG = """\
+AERO_API_KEY = ""
+CLIENT_ID = 0
+DISCORD_TOKEN = ""
+GUILD_ID_PRIMARY = 0
+GUILD_ID_SECONDARY = 0
+THE_CAT_API_KEY = ""
+"""
+
+# Builds the bot and its client, loading every module, then reports the time
+READY = """\
+import time
+start = time.perf_counter()
+from scripty import bot
+bot.build_bot()
+print(time.perf_counter() - start)
+"""
+
+
+def _run(cwd: str, *args: str) -> subprocess.CompletedProcess[str]:
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def import_times(cwd: str, module: str) -> dict[str, int]:
+    """Get the self import time in microseconds of each top-level package"""
+    result = _run(cwd, "-X", "importtime", "-c", f"import {module}")
+    totals: collections.Counter[str] = collections.Counter()
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        self_us, _, name = line[len("import time:") :].split("|")
+        totals[name.strip().split(".")[0]] += int(self_us)
+
+    return totals
+
+
+def ready_time(cwd: str) -> float:
+    """Get the wall time in seconds to build a bot with all modules loaded"""
+    output = _run(cwd, "-c", READY).stdout.strip().splitlines()
+    return float(output[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--module", default="scripty.bot")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cwd:
+        pathlib.Path(cwd, "config.toml").write_text(CONFIG)
+
+        totals = import_times(cwd, args.module)
+        print(f"import time of {args.module} by package (self, ms)")
+
+        for name, self_us in totals.most_common(args.top):
+            print(f"  {name:<24} {self_us / 1000:>8.1f}")
+
+        print(f"  {'total':<24} {sum(totals.values()) / 1000:>8.1f}")
+
+        times = [ready_time(cwd) for _ in range(args.runs)]
+        print(
+            f"ready client over {args.runs} runs (s): "
+            f"min {min(times):.3f}  median {statistics.median(times):.3f}  "
+            f"max {max(times):.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Measure the memory and CPU of timing out many live views
+
+Each view used to time out on a task of its own, and the command that
+started it waited for it in another parked coroutine. The timer wheel keeps
+one small handle per view instead. Both sides restart every timeout once,
+as an interaction does, and then stop every view.
+
+Usage: ``python benchmarks/timers.py [--views N]``
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import pathlib
+import sys
+import time
+import tracemalloc
+from typing import Callable, Protocol
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from scripty.functions import timers  # noqa: E402
+
+TIMEOUT = 30.0
+
+
+class View(Protocol):
+    def refresh(self) -> None: ...
+
+    def stop(self) -> None: ...
+
+
+class TaskView:
+    """The shape of a view timing out on its own task"""
+
+    def __init__(self) -> None:
+        self.stopped = asyncio.Event()
+        self.refreshed = asyncio.Event()
+        self.timeout_task = asyncio.create_task(self._timeout())
+        # The command coroutine waiting for the view
+        self.waiter = asyncio.create_task(self.stopped.wait())
+
+    async def _timeout(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self.refreshed.wait(), TIMEOUT)
+            except asyncio.TimeoutError:
+                self.stopped.set()
+                return
+
+            self.refreshed.clear()
+
+    def refresh(self) -> None:
+        self.refreshed.set()
+
+    def stop(self) -> None:
+        self.timeout_task.cancel()
+        self.stopped.set()
+
+
+class WheelView:
+    """The shape of a view timing out on the shared wheel"""
+
+    def __init__(self, wheel: timers.TimerWheel) -> None:
+        self.expiry = wheel.schedule(TIMEOUT, self.stop)
+
+    def refresh(self) -> None:
+        self.expiry.reschedule(TIMEOUT)
+
+    def stop(self) -> None:
+        self.expiry.cancel()
+
+
+async def measure(label: str, count: int, start: Callable[[], list[View]]) -> None:
+    tracemalloc.start()
+    views = start()
+    await asyncio.sleep(0)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    for view in views:
+        view.stop()
+    await asyncio.sleep(0.01)
+    gc.collect()
+
+    cpu = time.process_time()
+    views = start()
+    await asyncio.sleep(0)
+    started = time.process_time() - cpu
+
+    cpu = time.process_time()
+    for view in views:
+        view.refresh()
+    await asyncio.sleep(0)
+    refreshed = time.process_time() - cpu
+
+    cpu = time.process_time()
+    for view in views:
+        view.stop()
+    await asyncio.sleep(0)
+    stopped = time.process_time() - cpu
+
+    print(
+        f"{label:>6}: {memory / count:.0f} B/view, start {started * 1e3:.0f} ms, "
+        f"refresh {refreshed * 1e3:.0f} ms, stop {stopped * 1e3:.0f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--views", type=int, default=50_000)
+    args = parser.parse_args()
+    wheel = timers.TimerWheel()
+
+    # A loop each, so that one side's cancelled tasks are not counted for the other
+    asyncio.run(
+        measure("tasks", args.views, lambda: [TaskView() for _ in range(args.views)])
+    )
+    asyncio.run(
+        measure(
+            "wheel", args.views, lambda: [WheelView(wheel) for _ in range(args.views)]
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
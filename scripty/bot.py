@@ -1,73 +1,238 @@
 from __future__ import annotations
 
-__all__: tuple[str, ...] = ("start_app",)
+__all__: tuple[str, ...] = (
+    "close_shared_dependencies",
+    "set_shared_dependencies",
+    "start_app",
+)
 
 import functools
+import pathlib
 
-import aiohttp
 import alluka
 import hikari
-import miru
 import plane
 import tanjun
 
 from scripty import config, errors
-from scripty.functions import datastore, helpers
-
-
-def create_client(bot: hikari.GatewayBot, ds: datastore.DataStore) -> tanjun.Client:
+from scripty.functions import (
+    chunking,
+    cluster,
+    components,
+    datastore,
+    declare,
+    exporter,
+    gateway,
+    helpers,
+    instrument,
+    metrics,
+    polls,
+    resolve,
+    sampler,
+    sessions,
+    snapshot,
+    translate,
+    upstream,
+    watchdog,
+)
+
+
+def create_client(
+    bot: hikari.GatewayBot, ds: datastore.DataStore, modules: list[str]
+) -> tanjun.Client:
     """Create the tanjun client"""
     return (
         tanjun.Client.from_gateway_bot(
             bot,
             mention_prefix=True,
-            declare_global_commands=True,
+            declare_global_commands=False,
         )
-        .load_modules("scripty.modules")
+        .load_modules(*(f"scripty.modules.{module}" for module in modules))
         .add_client_callback(tanjun.ClientCallbackNames.STARTING, on_client_starting)
+        .add_client_callback(tanjun.ClientCallbackNames.STARTED, on_client_started)
         .add_client_callback(tanjun.ClientCallbackNames.CLOSING, on_client_closing)
+        .add_client_callback(
+            tanjun.ClientCallbackNames.CLOSING, close_shared_dependencies
+        )
         .set_type_dependency(datastore.DataStore, ds)
-        .set_hooks(tanjun.AnyHooks().set_on_error(errors.on_error))
+        .set_hooks(create_hooks())
+    )
+
+
+def create_hooks() -> tanjun.AnyHooks:
+    """Create the global hooks shared by every client"""
+    return (
+        tanjun.AnyHooks()
+        .set_on_error(errors.on_error)
+        .add_on_error(instrument.on_error)
+        .set_pre_execution(instrument.pre_execution)
+        .set_post_execution(instrument.post_execution)
     )
 
 
-def build_bot() -> tuple[hikari.GatewayBot, tanjun.Client]:
-    """Build the bot"""
+def build_bot(
+    cluster_state: cluster.ClusterState | None = None,
+) -> tuple[hikari.GatewayBot, tanjun.Client]:
+    """Build the bot
+
+    Parameters
+    ----------
+    cluster_state : cluster.ClusterState | None
+        The position of this process when run as a cluster worker
+    """
     ds = datastore.DataStore()
     on_bot_started_as_partial = functools.partial(on_bot_started, ds=ds)
-    intents = hikari.Intents.ALL_UNPRIVILEGED | hikari.Intents.GUILD_MEMBERS
+    modules = gateway.enabled_modules(config.DISABLED_MODULES)
 
-    bot = hikari.GatewayBot(config.DISCORD_TOKEN, intents=intents)
-    bot.subscribe(hikari.StartedEvent, on_bot_started_as_partial)
+    store = (
+        sessions.SessionStore(
+            pathlib.Path(config.STATE_DIR, "sessions"),
+            max_guilds=config.RESUME_MAX_GUILDS,
+        )
+        if config.RESUME_SESSIONS
+        else None
+    )
 
-    client = create_client(bot, ds)
+    bot = sessions.ResumableGatewayBot(
+        config.DISCORD_TOKEN,
+        store=store,
+        intents=gateway.intents_for(modules),
+        auto_chunk_members=False,
+        cache_settings=gateway.cache_settings_for(
+            modules, max_messages=config.MAX_MESSAGES
+        ),
+    )
+    bot.subscribe(hikari.StartedEvent, on_bot_started_as_partial)
+    bot.subscribe(
+        hikari.InteractionCreateEvent, components.ROUTER.on_interaction_create
+    )
 
-    miru.load(bot)
+    client = create_client(bot, ds, modules)
+    components.ROUTER.set_injector(client.injector)
+    client.set_type_dependency(
+        cluster.ClusterState, cluster_state or cluster.ClusterState()
+    )
 
     return bot, client
 
 
+def set_shared_dependencies(client: tanjun.Client) -> None:
+    """Set the dependencies both the gateway and interaction server clients use
+
+    They are closed by `close_shared_dependencies`.
+    """
+    client.set_type_dependency(upstream.UpstreamClient, upstream.UpstreamClient())
+    translation_cache = translate.TranslationCache(
+        size=config.TRANSLATION_CACHE_SIZE,
+        path=(
+            pathlib.Path(config.STATE_DIR, "translations.sqlite3")
+            if config.TRANSLATION_DISK_CACHE
+            else None
+        ),
+    )
+    client.set_type_dependency(translate.TranslationCache, translation_cache)
+    client.set_type_dependency(
+        translate.Translator, translate.Translator(cache=translation_cache)
+    )
+
+
+async def close_shared_dependencies(
+    upstream_client: alluka.Injected[upstream.UpstreamClient],
+    translation_cache: alluka.Injected[translate.TranslationCache],
+) -> None:
+    """Close the dependencies set by `set_shared_dependencies`"""
+    await upstream_client.close()
+    translation_cache.close()
+
+
 def start_app() -> None:
     """Start the application"""
     bot, _ = build_bot()
-    bot.run()
+    bot.run(large_threshold=gateway.LARGE_THRESHOLD)
 
 
-async def on_client_starting(client: alluka.Injected[tanjun.Client]) -> None:
+async def on_client_starting(
+    client: alluka.Injected[tanjun.Client],
+    bot: alluka.Injected[hikari.GatewayBot],
+    cluster_state: alluka.Injected[cluster.ClusterState],
+) -> None:
     """Setup to execute during client startup"""
-    client.set_type_dependency(aiohttp.ClientSession, aiohttp.ClientSession())
+    set_shared_dependencies(client)
+    # Every worker and interaction server counts votes in the same file
+    poll_board = polls.PollBoard(
+        client.rest, path=pathlib.Path(config.STATE_DIR, "polls.sqlite3")
+    )
+    await poll_board.start()
+    client.set_type_dependency(polls.PollBoard, poll_board)
     client.set_type_dependency(plane.Client, plane.Client(config.AERO_API_KEY))
+    client.set_type_dependency(resolve.Resolver, resolve.Resolver(bot.cache, bot.rest))
+
+    system_sampler = sampler.SystemSampler()
+    system_sampler.start()
+    client.set_type_dependency(sampler.SystemSampler, system_sampler)
+
+    loop_monitor = watchdog.LoopMonitor()
+    loop_monitor.start()
+    client.set_type_dependency(watchdog.LoopMonitor, loop_monitor)
+
+    cluster_state.start(bot.cache)
+
+    # Guild keyed caches are local to each worker, so each has its own file
+    snapshot.REGISTRY.start(
+        pathlib.Path(config.STATE_DIR, f"caches-{cluster_state.worker}.snapshot")
+    )
+
+    chunk_scheduler = chunking.ChunkScheduler(bot)
+    chunk_scheduler.start()
+    client.set_type_dependency(chunking.ChunkScheduler, chunk_scheduler)
+
+    metrics.HEARTBEAT_LATENCY.set_function(lambda: bot.heartbeat_latency)
+    # Each worker exports its own metrics, on the port after the last worker's
+    metrics_server = exporter.MetricsServer(
+        config.METRICS_HOST,
+        config.METRICS_PORT + cluster_state.worker if config.METRICS_PORT else 0,
+        cache=bot.cache,
+    )
+
+    if config.METRICS_PORT:
+        await metrics_server.start()
+
+    client.set_type_dependency(exporter.MetricsServer, metrics_server)
+
+
+async def on_client_started(
+    client: alluka.Injected[tanjun.Client],
+    cluster_state: alluka.Injected[cluster.ClusterState],
+) -> None:
+    """Declare application commands once the client has started"""
+    # Commands are shared by the whole application, so one worker declares them,
+    # unless they are served over HTTP where Discord sends every interaction
+    if cluster_state.worker == 0 and not config.SERVE_INTERACTIONS:
+        await declare.sync_commands(client)
 
 
 async def on_client_closing(
-    session: alluka.Injected[aiohttp.ClientSession],
+    poll_board: alluka.Injected[polls.PollBoard],
     pc: alluka.Injected[plane.Client],
+    system_sampler: alluka.Injected[sampler.SystemSampler],
+    metrics_server: alluka.Injected[exporter.MetricsServer],
+    loop_monitor: alluka.Injected[watchdog.LoopMonitor],
+    cluster_state: alluka.Injected[cluster.ClusterState],
+    chunk_scheduler: alluka.Injected[chunking.ChunkScheduler],
 ) -> None:
     """Actions to perform while client shutdown"""
-    await session.close()
+    await poll_board.close()
     await pc.close()
+    await system_sampler.close()
+    await metrics_server.close()
+    await loop_monitor.close()
+    await cluster_state.close()
+    await chunk_scheduler.close()
+    await snapshot.REGISTRY.close()
+    components.ROUTER.close()
 
 
 async def on_bot_started(_: hikari.StartingEvent, ds: datastore.DataStore) -> None:
     """Called after bot is fully started"""
     ds.start_time = helpers.datetime_utcnow_aware()
+    metrics.READY.set(1)
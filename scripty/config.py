@@ -3,10 +3,26 @@ from __future__ import annotations
 __all__: tuple[str, ...] = (
     "AERO_API_KEY",
     "CLIENT_ID",
+    "CLUSTER_WORKERS",
+    "DEV_GUILD_COMMANDS",
+    "DISABLED_MODULES",
     "DISCORD_TOKEN",
     "GUILD_ID_PRIMARY",
     "GUILD_ID_SECONDARY",
+    "INTERACTION_HOST",
+    "INTERACTION_PORT",
+    "MAX_MESSAGES",
+    "METRICS_HOST",
+    "METRICS_PORT",
+    "PUBLIC_KEY",
+    "RESUME_MAX_GUILDS",
+    "RESUME_SESSIONS",
+    "SERVE_INTERACTIONS",
+    "SHARD_COUNT",
+    "STATE_DIR",
     "THE_CAT_API_KEY",
+    "TRANSLATION_CACHE_SIZE",
+    "TRANSLATION_DISK_CACHE",
 )
 
 from typing import Final
@@ -27,3 +43,44 @@ DISCORD_TOKEN: Final[str] = config["DISCORD_TOKEN"]
 GUILD_ID_PRIMARY: Final[int] = config["GUILD_ID_PRIMARY"]
 GUILD_ID_SECONDARY: Final[int] = config["GUILD_ID_SECONDARY"]
 THE_CAT_API_KEY: Final[str] = config["THE_CAT_API_KEY"]
+
+# Optional settings fall back to their defaults when absent so that existing
+# private config files keep working.
+# Cluster workers listen on METRICS_PORT plus their worker number
+METRICS_HOST: Final[str] = config.get("METRICS_HOST", "127.0.0.1")
+METRICS_PORT: Final[int] = config.get("METRICS_PORT", 0)
+
+# Zero selects the shard count recommended by Discord and one worker per CPU
+SHARD_COUNT: Final[int] = config.get("SHARD_COUNT", 0)
+CLUSTER_WORKERS: Final[int] = config.get("CLUSTER_WORKERS", 0)
+
+# Local state kept between restarts, such as the declared command hashes
+STATE_DIR: Final[str] = config.get("STATE_DIR", ".scripty")
+
+# Declare application commands to the configured guilds instead of globally
+DEV_GUILD_COMMANDS: Final[bool] = config.get("DEV_GUILD_COMMANDS", False)
+
+# Modules not to load, along with the intents and cache only they need
+DISABLED_MODULES: Final[list[str]] = config.get("DISABLED_MODULES", [])
+
+# Zero disables the message cache, which no module currently reads
+MAX_MESSAGES: Final[int] = config.get("MAX_MESSAGES", 0)
+
+# Interaction server of ``python -m scripty.serve``, an empty public key is
+# fetched from the application instead
+INTERACTION_HOST: Final[str] = config.get("INTERACTION_HOST", "0.0.0.0")
+INTERACTION_PORT: Final[int] = config.get("INTERACTION_PORT", 8080)
+PUBLIC_KEY: Final[str] = config.get("PUBLIC_KEY", "")
+
+# Set when the application's Interactions Endpoint URL points at
+# ``python -m scripty.serve``, which then declares the application commands
+SERVE_INTERACTIONS: Final[bool] = config.get("SERVE_INTERACTIONS", False)
+
+# Keep shard sessions on shutdown and resume them on the next start, which only
+# pays off for shards with at most ``RESUME_MAX_GUILDS`` guilds to fetch again
+RESUME_SESSIONS: Final[bool] = config.get("RESUME_SESSIONS", False)
+RESUME_MAX_GUILDS: Final[int] = config.get("RESUME_MAX_GUILDS", 100)
+
+# Translations kept in memory, and whether to also keep them in ``STATE_DIR``
+TRANSLATION_CACHE_SIZE: Final[int] = config.get("TRANSLATION_CACHE_SIZE", 4096)
+TRANSLATION_DISK_CACHE: Final[bool] = config.get("TRANSLATION_DISK_CACHE", False)
@@ -1,6 +1,6 @@
 __all__: tuple[str, ...] = ("AERO_API", "AERO_HEADERS", "INVITE_URL")
 
-from typing import Final
+from typing import TYPE_CHECKING, Final
 
 import hikari
 
@@ -9,6 +9,17 @@ from scripty.functions import helpers
 
 AERO_API: Final[str] = "https://ravy.org/api/v1"
 AERO_HEADERS: Final[dict[str, str]] = {"Authorization": f"Ravy {config.AERO_API_KEY}"}
-INVITE_URL: Final[str] = helpers.generate_oauth(
-    config.CLIENT_ID, permissions=hikari.Permissions.ADMINISTRATOR
-)
+
+if TYPE_CHECKING:
+    INVITE_URL: str
+
+
+def __getattr__(name: str) -> str:
+    # Built on first access rather than at import
+    if name == "INVITE_URL":
+        value = globals()["INVITE_URL"] = helpers.generate_oauth(
+            config.CLIENT_ID, permissions=hikari.Permissions.ADMINISTRATOR
+        )
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
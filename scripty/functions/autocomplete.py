@@ -0,0 +1,180 @@
+"""Incremental matching of autocompleted option values"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("Completer", "normalize", "session_of")
+
+import array
+import bisect
+import unicodedata
+from typing import Hashable, Iterable, Mapping
+
+import tanjun
+
+from scripty.functions import cache
+
+MAX_CHOICES = 25
+"""The most choices Discord shows for an autocompleted option"""
+MAX_SESSION_MATCHES = 10_000
+"""Match sets larger than this are not kept for narrowing, to bound memory"""
+_SESSION_DEPTH = 4
+
+
+def normalize(text: str) -> str:
+    """Fold case and accents so that ``"cafe"`` matches ``"Café"``
+
+    Parameters
+    ----------
+    text : str
+        The text to normalize
+
+    Returns
+    -------
+    str
+        The text to compare queries and candidates with
+    """
+    if text.isascii():
+        return text.lower()
+
+    return "".join(
+        char
+        for char in unicodedata.normalize("NFKD", text.casefold())
+        if not unicodedata.combining(char)
+    )
+
+
+def session_of(ctx: tanjun.abc.AutocompleteContext) -> Hashable:
+    """Key the keystrokes of one user in one option together
+
+    Parameters
+    ----------
+    ctx : tanjun.abc.AutocompleteContext
+        The context of the autocomplete interaction
+
+    Returns
+    -------
+    Hashable
+        The session key to pass to `Completer.complete`
+    """
+    return (ctx.author.id, ctx.triggering_name, ctx.focused.name)
+
+
+class Completer:
+    """Ranked matching over a fixed set of choices
+
+    Candidates are normalized once. A query matches a candidate when it is
+    found in its name or value, and names starting with the query rank
+    first, found by bisecting the sorted names. Each session remembers the
+    matches of its last few queries, so typing ``"abc"`` after ``"ab"`` only
+    filters the matches of ``"ab"`` instead of scanning every candidate.
+
+    Parameters
+    ----------
+    choices : Mapping[str, str] | Iterable[tuple[str, str]]
+        The names shown and the values submitted
+    limit : int
+        The most choices to return
+    session_ttl : float
+        Seconds a session's matches are kept after its last keystroke
+    sessions : int
+        The most sessions to keep matches for
+    """
+
+    def __init__(
+        self,
+        choices: Mapping[str, str] | Iterable[tuple[str, str]],
+        *,
+        limit: int = MAX_CHOICES,
+        session_ttl: float = 30.0,
+        sessions: int = 128,
+    ) -> None:
+        items = list(choices.items() if isinstance(choices, Mapping) else choices)
+        self.names = tuple(name for name, _ in items)
+        self.values = tuple(value for _, value in items)
+        self.limit = limit
+        # The name comes first so that sorted keys are sorted by name, and the
+        # separator cannot be typed so a query never spans both
+        self._keys = tuple(
+            f"{normalize(name)}\0{normalize(value)}" for name, value in items
+        )
+        order = sorted(range(len(items)), key=self._keys.__getitem__)
+        self._sorted_keys = [self._keys[index] for index in order]
+        self._sorted_order = array.array("I", order)
+        self._sessions: cache.TTLCache[
+            Hashable, list[tuple[str, array.array[int]]]
+        ] = cache.TTLCache(ttl=session_ttl, cache_len=sessions)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def complete(
+        self, query: str, *, session: Hashable | None = None
+    ) -> dict[str, str]:
+        """Get the best choices for what has been typed so far
+
+        Parameters
+        ----------
+        query : str
+            The partial option value
+        session : Hashable | None
+            The session to narrow the previous matches of, see `session_of`
+
+        Returns
+        -------
+        dict[str, str]
+            Names mapped to values, prefix matches first
+        """
+        query = normalize(query)
+
+        if not query:
+            return dict(zip(self.names[: self.limit], self.values[: self.limit]))
+
+        ranked: list[int] = []
+        position = bisect.bisect_left(self._sorted_keys, query)
+
+        while (
+            len(ranked) < self.limit
+            and position < len(self._sorted_keys)
+            and self._sorted_keys[position].startswith(query)
+        ):
+            ranked.append(self._sorted_order[position])
+            position += 1
+
+        prefixed = set(ranked)
+
+        for index in self._matches(query, session):
+            if len(ranked) == self.limit:
+                break
+
+            if index not in prefixed:
+                ranked.append(index)
+
+        return {self.names[index]: self.values[index] for index in ranked}
+
+    def _matches(self, query: str, session: Hashable | None) -> array.array[int]:
+        history = (self._sessions.get(session) if session is not None else None) or []
+        narrowest: array.array[int] | None = None
+        narrowest_query = ""
+
+        for previous, matches in history:
+            if query.startswith(previous) and len(previous) > len(narrowest_query):
+                narrowest, narrowest_query = matches, previous
+
+        keys = self._keys
+
+        if narrowest is None:
+            matches = array.array(
+                "I", (index for index, key in enumerate(keys) if query in key)
+            )
+        elif narrowest_query == query:
+            matches = narrowest
+        else:
+            matches = array.array(
+                "I", (index for index in narrowest if query in keys[index])
+            )
+
+        if session is not None and len(matches) <= MAX_SESSION_MATCHES:
+            history = [entry for entry in history if entry[0] != query]
+            history.append((query, matches))
+            self._sessions.set(session, history[-_SESSION_DEPTH:])
+
+        return matches
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-__all__: tuple[str, ...] = ("LRUCachedDict",)
+__all__: tuple[str, ...] = ("LRUCachedDict", "TTLCache")
 
+import time
 from collections import OrderedDict
-from typing import Any
+from typing import Any, Generic, Hashable, Iterator, TypeVar
+
+_KT = TypeVar("_KT", bound=Hashable)
+_VT = TypeVar("_VT")
 
 
 # https://gist.github.com/davesteele/44793cd0348f59f8fadd49d7799bd306
@@ -30,3 +34,63 @@ class LRUCachedDict(OrderedDict[Any, Any]):
         super().move_to_end(key)
 
         return val
+
+
+class TTLCache(Generic[_KT, _VT]):
+    """Cache with a limited length whose entries expire after a time to live.
+
+    Expired entries are dropped lazily when looked up, and the least recently
+    used entries are ejected when the cache is full.
+    """
+
+    def __init__(self, *, ttl: float, cache_len: int) -> None:
+        self.ttl = ttl
+        self.cache_len = cache_len
+        self._entries: OrderedDict[_KT, tuple[float, _VT]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: _KT) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: _KT) -> _VT | None:
+        """Get an unexpired item from the cache and move it to the end."""
+        try:
+            expires, value = self._entries[key]
+        except KeyError:
+            return None
+
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: _KT, value: _VT, *, ttl: float | None = None) -> None:
+        """Set an item in the cache, optionally overriding the time to live."""
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.cache_len:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: _KT) -> _VT | None:
+        """Remove an item from the cache, returning it if it was unexpired."""
+        value = self.get(key)
+        self._entries.pop(key, None)
+        return value
+
+    def clear(self) -> None:
+        """Remove all items from the cache."""
+        self._entries.clear()
+
+    def items(self) -> Iterator[tuple[_KT, _VT, float]]:
+        """Iterate over unexpired items and their remaining time to live."""
+        now = time.monotonic()
+
+        for key, (expires, value) in list(self._entries.items()):
+            if expires > now:
+                yield key, value, expires - now
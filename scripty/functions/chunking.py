@@ -0,0 +1,243 @@
+"""On-demand member chunking for the guilds which need their members"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = (
+    "BACKGROUND",
+    "INTERACTIVE",
+    "ChunkScheduler",
+    "pre_execution",
+)
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Final
+
+import alluka
+import hikari
+import tanjun
+
+_LOGGER = logging.getLogger("scripty.chunking")
+
+INTERACTIVE: Final[int] = 0
+"""Priority of chunk requests for guilds a command is being run in"""
+BACKGROUND: Final[int] = 1
+"""Priority of chunk requests to restore guilds after a reconnect"""
+
+
+class ChunkScheduler:
+    """Request guild member chunks only for guilds that use them
+
+    Requests are sent one at a time from a priority queue, at most ``rate`` per
+    second, so that a burst of demand does not spike CPU or exhaust the
+    gateway send rate limit. Members of guilds which have not been used for
+    ``idle`` seconds are evicted from the cache.
+
+    Parameters
+    ----------
+    bot : hikari.GatewayBot
+        The bot to request chunks and evict members with
+    rate : float
+        Maximum chunk requests sent per second
+    idle : float
+        Seconds after the last use before a guild's members are evicted
+    interval : float
+        Seconds between checks for idle guilds
+    """
+
+    def __init__(
+        self,
+        bot: hikari.GatewayBot,
+        *,
+        rate: float = 2.0,
+        idle: float = 1800.0,
+        interval: float = 60.0,
+    ) -> None:
+        self.bot = bot
+        self.rate = rate
+        self.idle = idle
+        self.interval = interval
+        self.enabled = hikari.Intents.GUILD_MEMBERS in bot.intents and (
+            hikari.api.CacheComponents.MEMBERS in bot.cache.settings.components
+        )
+        self._queue: list[tuple[int, int, hikari.Snowflake]] = []
+        self._counter = itertools.count()
+        self._pending: dict[hikari.Snowflake, int] = {}
+        self._chunked: set[hikari.Snowflake] = set()
+        self._last_used: dict[hikari.Snowflake, float] = {}
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task[None]] = []
+
+    @property
+    def chunked(self) -> frozenset[hikari.Snowflake]:
+        """The guilds with all their members cached"""
+        return frozenset(self._chunked)
+
+    def request(
+        self,
+        guild: hikari.SnowflakeishOr[hikari.PartialGuild],
+        priority: int = INTERACTIVE,
+    ) -> None:
+        """Mark a guild as used and queue a chunk request if it needs one
+
+        Parameters
+        ----------
+        guild : hikari.SnowflakeishOr[hikari.PartialGuild]
+            The guild whose members are needed
+        priority : int
+            The priority of the request, lower is sent first
+        """
+        if not self.enabled:
+            return
+
+        guild_id = hikari.Snowflake(guild)
+        self._last_used[guild_id] = time.monotonic()
+
+        if (
+            guild_id in self._chunked
+            or self._pending.get(guild_id, priority + 1) <= priority
+        ):
+            return
+
+        self._pending[guild_id] = priority
+        heapq.heappush(self._queue, (priority, next(self._counter), guild_id))
+        self._wakeup.set()
+
+    def start(self) -> None:
+        """Start sending chunk requests and evicting idle guilds"""
+        if not self.enabled or self._tasks:
+            return
+
+        self.bot.subscribe(hikari.MemberChunkEvent, self._on_member_chunk)
+        self.bot.subscribe(hikari.GuildAvailableEvent, self._on_guild_available)
+        self.bot.subscribe(hikari.GuildJoinEvent, self._on_guild_available)
+        self.bot.subscribe(hikari.GuildLeaveEvent, self._on_guild_leave)
+        self._tasks = [
+            asyncio.create_task(self._send(), name="chunk scheduler"),
+            asyncio.create_task(self._evict(), name="chunk evictor"),
+        ]
+
+    async def close(self) -> None:
+        """Stop sending chunk requests and evicting idle guilds"""
+        if not self._tasks:
+            return
+
+        self.bot.unsubscribe(hikari.MemberChunkEvent, self._on_member_chunk)
+        self.bot.unsubscribe(hikari.GuildAvailableEvent, self._on_guild_available)
+        self.bot.unsubscribe(hikari.GuildJoinEvent, self._on_guild_available)
+        self.bot.unsubscribe(hikari.GuildLeaveEvent, self._on_guild_leave)
+
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def evict_idle(self) -> list[hikari.Snowflake]:
+        """Evict the cached members of guilds which have been idle too long
+
+        Returns
+        -------
+        list[hikari.Snowflake]
+            The guilds whose members were evicted
+        """
+        cutoff = time.monotonic() - self.idle
+        idle = [
+            guild_id
+            for guild_id, last_used in self._last_used.items()
+            if last_used < cutoff
+        ]
+        evicted: list[hikari.Snowflake] = []
+
+        for guild_id in idle:
+            del self._last_used[guild_id]
+
+            if guild_id in self._chunked:
+                self._chunked.discard(guild_id)
+                self._clear_members(guild_id)
+                evicted.append(guild_id)
+
+        return evicted
+
+    def _clear_members(self, guild_id: hikari.Snowflake) -> None:
+        # The bot's own member is kept, permission checks rely on it
+        me = self.bot.cache.get_me()
+        own_member = me and self.bot.cache.get_member(guild_id, me)
+        self.bot.cache.clear_members_for_guild(guild_id)
+
+        if own_member:
+            self.bot.cache.set_member(own_member)
+
+    def _pop(self) -> hikari.Snowflake | None:
+        while self._queue:
+            priority, _, guild_id = heapq.heappop(self._queue)
+
+            # Skip entries superseded by a higher priority request
+            if self._pending.get(guild_id) == priority:
+                del self._pending[guild_id]
+                return guild_id
+
+        return None
+
+    async def _send(self) -> None:
+        while True:
+            guild_id = self._pop()
+
+            if guild_id is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            if guild_id in self._chunked or guild_id not in self._last_used:
+                continue
+
+            try:
+                await self.bot.request_guild_members(guild_id)
+            except hikari.ComponentStateConflictError:
+                _LOGGER.debug("could not request chunks for guild %s", guild_id)
+            except Exception:
+                # One failed request must not stop chunking for every guild
+                _LOGGER.exception("failed to request chunks for guild %s", guild_id)
+
+            await asyncio.sleep(1 / self.rate)
+
+    async def _evict(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+
+            if evicted := self.evict_idle():
+                _LOGGER.debug("evicted members of %s idle guilds", len(evicted))
+
+    async def _on_member_chunk(self, event: hikari.MemberChunkEvent) -> None:
+        if event.chunk_index == event.chunk_count - 1:
+            self._chunked.add(event.guild_id)
+
+    async def _on_guild_available(
+        self, event: hikari.GuildAvailableEvent | hikari.GuildJoinEvent
+    ) -> None:
+        # Guild create events carry every member of guilds under the large
+        # threshold, while a reconnect resets the members of larger guilds
+        if not event.guild.is_large:
+            self._chunked.add(event.guild_id)
+
+        elif event.guild_id in self._chunked:
+            self._chunked.discard(event.guild_id)
+            self.request(event.guild_id, BACKGROUND)
+
+    async def _on_guild_leave(self, event: hikari.GuildLeaveEvent) -> None:
+        self._chunked.discard(event.guild_id)
+        self._last_used.pop(event.guild_id, None)
+
+
+async def pre_execution(
+    ctx: tanjun.abc.Context,
+    scheduler: alluka.Injected[ChunkScheduler | None],
+) -> None:
+    """Command hook which requests the members of the guild a command runs in
+
+    Does nothing when commands are served without a gateway to chunk over.
+    """
+    if scheduler is not None and ctx.guild_id is not None:
+        scheduler.request(ctx.guild_id, INTERACTIVE)
@@ -0,0 +1,128 @@
+"""State shared between the worker processes of a shard cluster
+
+Each worker owns a contiguous range of shards. Discord routes every gateway
+event and interaction for a guild to the shard that guild belongs to, so
+guild keyed module state and caches, such as the ban cache, only ever live
+in the one process which serves that guild and never need to be shared.
+Only bot-wide figures, like the guild count, are aggregated across workers
+through shared memory.
+"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("ClusterState", "shard_ranges")
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import hikari
+
+if TYPE_CHECKING:
+    from multiprocessing.sharedctypes import SynchronizedArray
+
+
+def shard_ranges(shard_count: int, workers: int) -> list[list[int]]:
+    """Split shard IDs into contiguous, evenly sized ranges
+
+    Parameters
+    ----------
+    shard_count : int
+        The total number of shards
+    workers : int
+        The number of ranges to split into
+
+    Returns
+    -------
+    list[list[int]]
+        The shard IDs for each worker
+    """
+    workers = max(1, min(workers, shard_count))
+    size, remainder = divmod(shard_count, workers)
+    ranges: list[list[int]] = []
+    start = 0
+
+    for worker in range(workers):
+        end = start + size + (1 if worker < remainder else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+
+    return ranges
+
+
+class ClusterState:
+    """The position of this process within a cluster
+
+    Parameters
+    ----------
+    worker : int
+        The index of this worker
+    workers : int
+        The number of workers in the cluster
+    guild_counts : SynchronizedArray[int] | None
+        Shared memory with one guild count slot per worker, ``None`` when not
+        running as part of a cluster
+    interval : float
+        Seconds between publishing this worker's guild count
+    """
+
+    def __init__(
+        self,
+        worker: int = 0,
+        workers: int = 1,
+        guild_counts: SynchronizedArray[int] | None = None,
+        *,
+        interval: float = 15.0,
+    ) -> None:
+        self.worker = worker
+        self.workers = workers
+        self.interval = interval
+        self._guild_counts = guild_counts
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def is_clustered(self) -> bool:
+        """Whether this process is one worker of a cluster"""
+        return self._guild_counts is not None
+
+    def guild_count(self) -> int | None:
+        """Get the number of guilds across all workers
+
+        Returns
+        -------
+        int
+            The total guild count last published by each worker
+        None
+            If this process is not part of a cluster
+        """
+        if self._guild_counts is None:
+            return None
+
+        with self._guild_counts.get_lock():
+            return sum(self._guild_counts)
+
+    def start(self, cache: hikari.api.Cache) -> None:
+        """Start publishing this worker's guild count from the gateway cache"""
+        if self._guild_counts is not None and self._task is None:
+            self._task = asyncio.create_task(
+                self._publish(cache, self._guild_counts), name="cluster publisher"
+            )
+
+    async def close(self) -> None:
+        """Stop publishing"""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
+
+    async def _publish(
+        self, cache: hikari.api.Cache, guild_counts: SynchronizedArray[int]
+    ) -> None:
+        while True:
+            guild_counts[self.worker] = len(cache.get_guilds_view())
+            await asyncio.sleep(self.interval)
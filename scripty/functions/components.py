@@ -0,0 +1,421 @@
+"""Stateless component handlers routed by custom ID"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = (
+    "Handler",
+    "ROUTER",
+    "Router",
+    "ephemeral",
+    "message_age",
+    "pack",
+    "unpack",
+    "update",
+)
+
+import logging
+import string
+from typing import Awaitable, Callable, NamedTuple, Sequence
+
+import alluka
+import hikari
+
+from scripty.functions import embeds, helpers, metrics, timers
+
+Handler = Callable[..., Awaitable[hikari.api.InteractionMessageBuilder]]
+"""Answers an interaction from the fields of its custom ID
+
+It is called with the interaction and the fields, and may request injected
+dependencies once the router has an injector.
+"""
+
+MAX_CUSTOM_ID = 100
+"""The longest custom ID Discord accepts"""
+_SEPARATOR = ":"
+_DIGITS = string.digits + string.ascii_lowercase
+
+_LOGGER = logging.getLogger("scripty.components")
+
+
+def pack(number: int) -> str:
+    """Write a non-negative integer in base 36 to keep custom IDs short
+
+    Parameters
+    ----------
+    number : int
+        The integer to write, such as a snowflake
+
+    Returns
+    -------
+    str
+        The integer in base 36, which `unpack` reads
+    """
+    if number < 0:
+        raise ValueError("only non-negative integers can be packed")
+
+    digits: list[str] = []
+
+    while True:
+        number, digit = divmod(number, 36)
+        digits.append(_DIGITS[digit])
+
+        if not number:
+            return "".join(reversed(digits))
+
+
+def unpack(text: str) -> int:
+    """Read an integer written by `pack`
+
+    Parameters
+    ----------
+    text : str
+        The integer in base 36
+
+    Returns
+    -------
+    int
+        The integer
+    """
+    return int(text, 36)
+
+
+def message_age(message: hikari.Message) -> float:
+    """Get the seconds since a message was last edited or else sent
+
+    Parameters
+    ----------
+    message : hikari.Message
+        The message the component is attached to
+
+    Returns
+    -------
+    float
+        The age of the message in seconds
+    """
+    changed = message.edited_timestamp or message.created_at
+    return (helpers.datetime_utcnow_aware() - changed).total_seconds()
+
+
+def update(
+    embed: hikari.Embed | None = None,
+    components: Sequence[hikari.api.ComponentBuilder] | None = None,
+) -> hikari.api.InteractionMessageBuilder:
+    """Build a response editing the message of the component
+
+    Parameters
+    ----------
+    embed : hikari.Embed | None
+        The embed to replace the message's embeds with, or None to keep them
+    components : Sequence[hikari.api.ComponentBuilder] | None
+        The components to replace the message's components with, or None to
+        keep them
+
+    Returns
+    -------
+    hikari.api.InteractionMessageBuilder
+        The response to return from a handler
+    """
+    builder = hikari.impl.InteractionMessageBuilder(
+        hikari.ResponseType.MESSAGE_UPDATE,
+        components=list(components) if components is not None else hikari.UNDEFINED,
+    )
+
+    if embed is not None:
+        builder.add_embed(embed)
+
+    return builder
+
+
+def ephemeral(embed: hikari.Embed) -> hikari.api.InteractionMessageBuilder:
+    """Build a response only the user of the component sees
+
+    Parameters
+    ----------
+    embed : hikari.Embed
+        The embed to respond with
+
+    Returns
+    -------
+    hikari.api.InteractionMessageBuilder
+        The response to return from a handler
+    """
+    return hikari.impl.InteractionMessageBuilder(
+        hikari.ResponseType.MESSAGE_CREATE, flags=hikari.MessageFlag.EPHEMERAL
+    ).add_embed(embed)
+
+
+def _timed_out() -> list[hikari.api.ComponentBuilder]:
+    return [
+        hikari.impl.ActionRowBuilder()
+        .add_button(hikari.ButtonStyle.SECONDARY, "timed-out")
+        .set_label("Timed out")
+        .set_is_disabled(True)
+        .add_to_container()
+    ]
+
+
+def _is_disabled(message: hikari.Message) -> bool:
+    return all(
+        getattr(component, "is_disabled", True)
+        for row in message.components
+        for component in row.components
+    )
+
+
+class _Route(NamedTuple):
+    handler: Handler
+    max_age: float | None
+    owned: bool
+
+
+class Router:
+    """Dispatch component interactions by the name their custom ID starts with
+
+    A custom ID is a handler name followed by fields, separated by colons,
+    so that everything a handler needs travels with the message. Nothing is
+    kept per message, and any process answers components sent by any other,
+    including from before a restart.
+
+    An owned handler's first field is the ID of the only user allowed to use
+    the component. A component whose message was not sent or edited within
+    the handler's ``max_age`` is disabled instead of being handled. Messages
+    passed to `schedule_timeout` are also disabled once they reach that age,
+    which only keeps their channel and message IDs on a shared timer wheel.
+    """
+
+    def __init__(self) -> None:
+        self._routes: dict[str, _Route] = {}
+        self._injector: alluka.abc.Client | None = None
+        self._timers = timers.TimerWheel(tick=1.0)
+        self._timeouts: dict[tuple[int, int], timers.Timer] = {}
+
+    def set_injector(self, injector: alluka.abc.Client) -> None:
+        """Resolve the injected dependencies of handlers with ``injector``
+
+        Parameters
+        ----------
+        injector : alluka.abc.Client
+            Usually the injector of the tanjun client
+        """
+        self._injector = injector
+
+    def add_handler(
+        self,
+        name: str,
+        handler: Handler,
+        *,
+        max_age: float | None = None,
+        owned: bool = False,
+    ) -> None:
+        """Route the custom IDs starting with ``name`` to ``handler``
+
+        Parameters
+        ----------
+        name : str
+            The name which starts the custom IDs, without colons
+        handler : Handler
+            Called with the interaction and the fields after the name, and
+            after the owner of owned handlers
+        max_age : float | None
+            Seconds without an edit after which the components time out
+        owned : bool
+            Whether only the user in the first field may use the components
+        """
+        if _SEPARATOR in name:
+            raise ValueError(f"handler name {name!r} contains {_SEPARATOR!r}")
+
+        if name in self._routes:
+            raise ValueError(f"handler name {name!r} is already routed")
+
+        self._routes[name] = _Route(handler, max_age, owned)
+
+    def handler(
+        self, name: str, *, max_age: float | None = None, owned: bool = False
+    ) -> Callable[[Handler], Handler]:
+        """Decorator form of `add_handler`"""
+
+        def decorator(handler: Handler) -> Handler:
+            self.add_handler(name, handler, max_age=max_age, owned=owned)
+            return handler
+
+        return decorator
+
+    def custom_id(self, name: str, *fields: str | int) -> str:
+        """Build a custom ID routed to a handler
+
+        Parameters
+        ----------
+        name : str
+            The name of the handler
+        *fields : str | int
+            The fields passed to the handler, integers are packed
+
+        Returns
+        -------
+        str
+            The custom ID
+        """
+        custom_id = _SEPARATOR.join(
+            (
+                name,
+                *(pack(field) if isinstance(field, int) else field for field in fields),
+            )
+        )
+
+        if len(custom_id) > MAX_CUSTOM_ID:
+            raise ValueError(f"custom ID {custom_id!r} is too long")
+
+        return custom_id
+
+    def schedule_timeout(
+        self, rest: hikari.api.RESTClient, name: str, message: hikari.Message
+    ) -> None:
+        """Disable the components of a message once it reaches the max age
+
+        The message is fetched when the timer fires, and if it was edited
+        since, such as by a handler, the timer is restarted for the rest of
+        the max age instead.
+
+        Parameters
+        ----------
+        rest : hikari.api.RESTClient
+            The client to fetch and edit the message with
+        name : str
+            The name of the handler whose ``max_age`` applies
+        message : hikari.Message
+            The message which was sent with the components
+        """
+        max_age = self._routes[name].max_age
+
+        if max_age is None:
+            raise ValueError(f"handler {name!r} has no max age")
+
+        key = (int(message.channel_id), int(message.id))
+
+        if (timer := self._timeouts.pop(key, None)) is not None:
+            timer.cancel()
+
+        self._timeouts[key] = self._timers.schedule(
+            max_age, lambda: self._time_out(rest, key, max_age)
+        )
+
+    def close(self) -> None:
+        """Cancel the scheduled timeouts"""
+        for timer in self._timeouts.values():
+            timer.cancel()
+
+        self._timeouts.clear()
+
+    async def _time_out(
+        self, rest: hikari.api.RESTClient, key: tuple[int, int], max_age: float
+    ) -> None:
+        timer = self._timeouts.get(key)
+
+        try:
+            message: hikari.Message | None = await rest.fetch_message(*key)
+        except (hikari.NotFoundError, hikari.ForbiddenError) as exc:
+            _LOGGER.debug("could not fetch message %s to time out: %r", key[1], exc)
+            message = None
+
+        # The router was closed or the timeout scheduled again meanwhile
+        if timer is None or self._timeouts.get(key) is not timer:
+            return
+
+        # Deleted, or finished by a handler which disabled the components
+        if message is None or _is_disabled(message):
+            del self._timeouts[key]
+            return
+
+        # Edited by a handler since, so the age is counted from the edit
+        if (age := message_age(message)) < max_age:
+            timer.reschedule(max_age - age)
+            return
+
+        del self._timeouts[key]
+
+        try:
+            await rest.edit_message(*key, components=_timed_out())
+        except (hikari.NotFoundError, hikari.ForbiddenError) as exc:
+            _LOGGER.debug("could not time out message %s: %r", key[1], exc)
+
+    async def dispatch(
+        self, interaction: hikari.ComponentInteraction
+    ) -> hikari.api.InteractionMessageBuilder | None:
+        """Answer a component interaction
+
+        Parameters
+        ----------
+        interaction : hikari.ComponentInteraction
+            The interaction to answer
+
+        Returns
+        -------
+        hikari.api.InteractionMessageBuilder | None
+            The response, or None when no handler is routed the custom ID
+        """
+        name, *fields = interaction.custom_id.split(_SEPARATOR)
+        route = self._routes.get(name)
+
+        if route is None:
+            return None
+
+        if route.owned:
+            if unpack(fields[0]) != interaction.user.id:
+                metrics.COMPONENT_INTERACTIONS.inc(name, "not_owner")
+                return ephemeral(
+                    embeds.Embed(
+                        title="Error",
+                        description="This command was not invoked by you!",
+                    )
+                )
+
+            fields = fields[1:]
+
+        if route.max_age is not None and (
+            message_age(interaction.message) > route.max_age
+        ):
+            metrics.COMPONENT_INTERACTIONS.inc(name, "timed_out")
+            return update(components=_timed_out())
+
+        metrics.COMPONENT_INTERACTIONS.inc(name, "handled")
+
+        if self._injector is None:
+            return await route.handler(interaction, fields)
+
+        return await self._injector.call_with_async_di(
+            route.handler, interaction, fields
+        )
+
+    async def on_interaction_create(self, event: hikari.InteractionCreateEvent) -> None:
+        """Answer routed component interactions received over the gateway"""
+        if not isinstance(event.interaction, hikari.ComponentInteraction):
+            return
+
+        response = await self.on_rest_interaction(event.interaction)
+        await event.interaction.create_initial_response(
+            response.type,
+            response.content,
+            flags=response.flags,
+            components=response.components,
+            embeds=response.embeds,
+        )
+
+    async def on_rest_interaction(
+        self, interaction: hikari.ComponentInteraction
+    ) -> hikari.api.InteractionMessageBuilder:
+        """Answer component interactions received over HTTP"""
+        response = await self.dispatch(interaction)
+
+        if response is None:
+            metrics.COMPONENT_INTERACTIONS.inc("unknown", "unrouted")
+            return ephemeral(
+                embeds.Embed(
+                    title="Error",
+                    description="This component is no longer available",
+                )
+            )
+
+        return response
+
+
+ROUTER = Router()
+"""The router every module registers its component handlers with"""
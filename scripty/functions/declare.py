@@ -0,0 +1,142 @@
+"""Application command declaration which skips unchanged command sets"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("command_hash", "declare_commands", "sync_commands")
+
+import hashlib
+import itertools
+import json
+import logging
+import pathlib
+
+import hikari
+import tanjun
+
+from scripty import config
+
+_LOGGER = logging.getLogger("scripty.declare")
+
+
+def command_hash(
+    client: tanjun.Client, entity_factory: hikari.api.EntityFactory
+) -> str:
+    """Hash the serialized builders of the client's global application commands
+
+    Parameters
+    ----------
+    client : tanjun.Client
+        The client to hash the commands of
+    entity_factory : hikari.api.EntityFactory
+        The entity factory used to serialize the builders
+
+    Returns
+    -------
+    str
+        The hex digest of the command set, independent of declaration order
+    """
+    commands = itertools.chain(
+        client.iter_slash_commands(global_only=True),
+        client.iter_menu_commands(global_only=True),
+    )
+    serialized = sorted(
+        json.dumps(command.build().build(entity_factory), sort_keys=True, default=str)
+        for command in commands
+    )
+
+    digest = hashlib.sha256()
+    digest.update(str(client.default_app_cmd_permissions).encode())
+    digest.update(str(client.dms_enabled_for_app_cmds).encode())
+
+    for command in serialized:
+        digest.update(command.encode())
+
+    return digest.hexdigest()
+
+
+async def declare_commands(
+    client: tanjun.Client,
+    path: pathlib.Path,
+    *,
+    guild: hikari.UndefinedOr[
+        hikari.SnowflakeishOr[hikari.PartialGuild]
+    ] = hikari.UNDEFINED,
+    force: bool = False,
+) -> bool:
+    """Declare the client's application commands if they changed since last time
+
+    The hash of each declared command set is stored on disk per target, so a
+    restart with unchanged commands makes no API calls at all.
+
+    Parameters
+    ----------
+    client : tanjun.Client
+        The client to declare the commands of
+    path : pathlib.Path
+        The file the declared hashes are stored in
+    guild : hikari.UndefinedOr[hikari.SnowflakeishOr[hikari.PartialGuild]]
+        The guild to declare the commands in, otherwise declared globally
+    force : bool
+        Whether to declare even if the commands are unchanged
+
+    Returns
+    -------
+    bool
+        Whether the commands were declared
+    """
+    target = "global" if guild is hikari.UNDEFINED else str(int(guild))
+    digest = command_hash(client, client.rest.entity_factory)
+
+    try:
+        declared: dict[str, str] = json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        declared = {}
+
+    if not force and declared.get(target) == digest:
+        _LOGGER.info("skipping %s command declaration as nothing changed", target)
+        return False
+
+    await client.declare_global_commands(guild=guild, force=force)
+
+    declared[target] = digest
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(declared))
+
+    return True
+
+
+async def sync_commands(
+    client: tanjun.Client,
+    *,
+    force: bool = False,
+) -> bool:
+    """Declare the application commands to the configured targets
+
+    Commands are declared globally, or to the primary and secondary guilds
+    when ``DEV_GUILD_COMMANDS`` is enabled, as guild commands update instantly.
+
+    Parameters
+    ----------
+    client : tanjun.Client
+        The client to declare the commands of
+    force : bool
+        Whether to declare even if the commands are unchanged
+
+    Returns
+    -------
+    bool
+        Whether the commands were declared to any target
+    """
+    path = pathlib.Path(config.STATE_DIR, "commands.json")
+
+    if not config.DEV_GUILD_COMMANDS:
+        return await declare_commands(client, path, force=force)
+
+    declared = False
+
+    for guild_id in (config.GUILD_ID_PRIMARY, config.GUILD_ID_SECONDARY):
+        if guild_id:
+            declared |= await declare_commands(
+                client, path, guild=guild_id, force=force
+            )
+
+    return declared
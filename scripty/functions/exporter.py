@@ -0,0 +1,117 @@
+"""Local HTTP endpoint for metrics scraping and orchestrator probes"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("MetricsServer",)
+
+import asyncio
+import contextlib
+
+import hikari
+from aiohttp import web
+
+from scripty.functions import metrics
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+class MetricsServer:
+    """Serve the metrics registry along with liveness and readiness probes
+
+    Routes
+    ------
+    ``/metrics``
+        The registry in the Prometheus text format
+    ``/healthz``
+        Always ``200`` while the process is serving
+    ``/readyz``
+        ``200`` once the bot has fully started, otherwise ``503``
+
+    Parameters
+    ----------
+    host : str
+        The interface to bind to
+    port : int
+        The port to bind to
+    cache : hikari.api.Cache | None
+        The gateway cache to report the sizes of. Its views copy on access so
+        the sizes are refreshed on an interval rather than on every scrape.
+    cache_interval : float
+        Seconds between refreshes of the gateway cache sizes
+    registry : metrics.Registry
+        The registry to expose, defaults to the global registry
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        cache: hikari.api.Cache | None = None,
+        cache_interval: float = 30.0,
+        registry: metrics.Registry = metrics.REGISTRY,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.cache = cache
+        self.cache_interval = cache_interval
+        self.registry = registry
+        self._runner: web.AppRunner | None = None
+        self._cache_task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Start serving in the background on the running event loop"""
+        app = web.Application()
+        app.router.add_get("/metrics", self._metrics)
+        app.router.add_get("/healthz", self._healthz)
+        app.router.add_get("/readyz", self._readyz)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+        if self.cache is not None:
+            self._cache_task = asyncio.create_task(
+                self._watch_cache(self.cache), name="metrics cache watcher"
+            )
+
+    async def close(self) -> None:
+        """Stop serving"""
+        if self._cache_task is not None:
+            self._cache_task.cancel()
+
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._cache_task
+
+            self._cache_task = None
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _watch_cache(self, cache: hikari.api.Cache) -> None:
+        while True:
+            metrics.CACHE_SIZE.set(len(cache.get_guilds_view()), "guilds")
+            metrics.CACHE_SIZE.set(len(cache.get_guild_channels_view()), "channels")
+            metrics.CACHE_SIZE.set(len(cache.get_roles_view()), "roles")
+            metrics.CACHE_SIZE.set(
+                sum(len(members) for members in cache.get_members_view().values()),
+                "members",
+            )
+            metrics.CACHE_SIZE.set(len(cache.get_messages_view()), "messages")
+
+            await asyncio.sleep(self.cache_interval)
+
+    async def _metrics(self, _: web.Request) -> web.Response:
+        return web.Response(
+            body=self.registry.expose().encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+    async def _healthz(self, _: web.Request) -> web.Response:
+        return web.Response(text="ok")
+
+    async def _readyz(self, _: web.Request) -> web.Response:
+        if metrics.READY.get():
+            return web.Response(text="ready")
+
+        return web.Response(status=503, text="starting")
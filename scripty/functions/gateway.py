@@ -0,0 +1,106 @@
+"""Gateway intents and cache components required by each module"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = (
+    "BASE",
+    "LARGE_THRESHOLD",
+    "MODULES",
+    "Requirements",
+    "cache_settings_for",
+    "enabled_modules",
+    "intents_for",
+)
+
+from typing import Final, Iterable, Mapping, NamedTuple
+
+import hikari
+
+_Cache = hikari.api.CacheComponents
+_Intents = hikari.Intents
+
+
+class Requirements(NamedTuple):
+    """The gateway intents and cache components a module relies on"""
+
+    intents: hikari.Intents = _Intents.NONE
+    cache: hikari.api.CacheComponents = _Cache.NONE
+
+
+# Needed regardless of the loaded modules: guild create events, channel lookups
+# for command contexts and the resolver, and the own user for mention prefixes
+BASE: Final[Requirements] = Requirements(
+    _Intents.GUILDS, _Cache.GUILDS | _Cache.GUILD_CHANNELS | _Cache.ME
+)
+
+# Members of larger guilds are only cached when chunked on demand
+LARGE_THRESHOLD: Final[int] = 50
+
+MODULES: Final[Mapping[str, Requirements]] = {
+    "automod": Requirements(_Intents.GUILD_MESSAGES | _Intents.GUILD_MEMBERS),
+    # Owner commands are message commands
+    "dev": Requirements(_Intents.GUILD_MESSAGES | _Intents.DM_MESSAGES),
+    "fun": Requirements(),
+    "help": Requirements(),
+    "misc": Requirements(),
+    # Members come resolved with the interactions, only ban events are needed
+    "mod": Requirements(_Intents.GUILD_BANS),
+    "util": Requirements(
+        _Intents.GUILD_MEMBERS | _Intents.GUILD_EMOJIS,
+        _Cache.MEMBERS | _Cache.ROLES | _Cache.EMOJIS,
+    ),
+}
+
+
+def enabled_modules(disabled: Iterable[str] = ()) -> list[str]:
+    """Get the names of the modules to load
+
+    Parameters
+    ----------
+    disabled : Iterable[str]
+        The names of the modules not to load
+
+    Returns
+    -------
+    list[str]
+        The names of every known module which is not disabled
+    """
+    disabled = set(disabled)
+    return [module for module in MODULES if module not in disabled]
+
+
+def intents_for(modules: Iterable[str]) -> hikari.Intents:
+    """Get the gateway intents required by the given modules"""
+    intents = BASE.intents
+
+    for module in modules:
+        intents |= MODULES[module].intents
+
+    return intents
+
+
+def cache_settings_for(
+    modules: Iterable[str], *, max_messages: int = 0
+) -> hikari.impl.CacheSettings:
+    """Get cache settings which only cache what the given modules read
+
+    Parameters
+    ----------
+    modules : Iterable[str]
+        The names of the loaded modules
+    max_messages : int
+        The number of messages to cache, zero disables the message cache
+
+    Returns
+    -------
+    hikari.impl.CacheSettings
+        The cache settings to build the bot with
+    """
+    components = BASE.cache
+
+    for module in modules:
+        components |= MODULES[module].cache
+
+    if max_messages:
+        components |= _Cache.MESSAGES
+
+    return hikari.impl.CacheSettings(components=components, max_messages=max_messages)
@@ -33,13 +33,11 @@ __all__: tuple[str, ...] = (
 
 import asyncio
 import datetime
-import functools
 import pathlib
 import re
 import urllib.parse
 from typing import Generator, Iterable, Literal
 
-import dateparser
 import hikari
 
 
@@ -154,6 +152,21 @@ def get_modules(
     return path.rglob("[!_]*.py")
 
 
+def _parse_future_date(duration: str) -> datetime.datetime | None:
+    # dateparser and its locale data are slow to import, so they are only
+    # loaded on first use and in the executor rather than on the event loop
+    import dateparser
+
+    return dateparser.parse(
+        duration,
+        settings={
+            "RETURN_AS_TIMEZONE_AWARE": True,
+            "PREFER_DATES_FROM": "future",
+            "STRICT_PARSING": True,
+        },
+    )
+
+
 async def parse_to_future_datetime(duration: str) -> datetime.datetime | None:
     """Parse string duration to datetime
 
@@ -170,18 +183,7 @@ async def parse_to_future_datetime(duration: str) -> datetime.datetime | None:
         If the duration is not parsable or is in the past
     """
     loop = asyncio.get_event_loop()
-    duration_parsed = await loop.run_in_executor(
-        None,
-        functools.partial(
-            dateparser.parse,
-            date_string=duration,
-            settings={
-                "RETURN_AS_TIMEZONE_AWARE": True,
-                "PREFER_DATES_FROM": "future",
-                "STRICT_PARSING": True,
-            },
-        ),
-    )
+    duration_parsed = await loop.run_in_executor(None, _parse_future_date, duration)
 
     if duration_parsed is None or duration_parsed < datetime_utcnow_aware():
         return None
@@ -207,18 +209,7 @@ async def parse_to_timedelta_from_now(duration: str) -> datetime.timedelta | Non
     now = datetime_utcnow_aware()
 
     loop = asyncio.get_event_loop()
-    duration_parsed = await loop.run_in_executor(
-        None,
-        functools.partial(
-            dateparser.parse,
-            date_string=duration,
-            settings={
-                "RETURN_AS_TIMEZONE_AWARE": True,
-                "PREFER_DATES_FROM": "future",
-                "STRICT_PARSING": True,
-            },
-        ),
-    )
+    duration_parsed = await loop.run_in_executor(None, _parse_future_date, duration)
 
     if duration_parsed is None or duration_parsed < now:
         return None
@@ -0,0 +1,141 @@
+"""Latency and error instrumentation for commands and event listeners"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = (
+    "Timing",
+    "listener",
+    "on_error",
+    "post_execution",
+    "pre_execution",
+    "slowest",
+)
+
+import functools
+import time
+from typing import Any, Awaitable, Callable, Literal, NamedTuple, TypeVar, cast
+
+import tanjun
+
+from scripty.functions import metrics
+
+_ListenerT = TypeVar("_ListenerT", bound=Callable[..., Awaitable[None]])
+
+# Keyed by context id as tanjun contexts are slotted and cannot be weakly
+# referenced, entries are always removed by the post execution hook
+_started: dict[int, float] = {}
+
+
+class Timing(NamedTuple):
+    """Summarized latency of a command or listener"""
+
+    name: str
+    count: int
+    errors: int
+    mean: float
+    p95: float
+
+
+def _command_name(ctx: tanjun.abc.Context) -> str:
+    # Slash contexts only know the top level name they were triggered with
+    if isinstance(ctx, tanjun.abc.SlashContext) and ctx.command is not None:
+        names: list[str] = []
+        command: tanjun.abc.BaseSlashCommand | None = ctx.command
+
+        while command is not None:
+            names.append(command.name)
+            command = command.parent
+
+        return " ".join(reversed(names))
+
+    return ctx.triggering_name
+
+
+async def pre_execution(ctx: tanjun.abc.Context) -> None:
+    """Hook called before a command is executed"""
+    _started[id(ctx)] = time.perf_counter()
+    metrics.COMMAND_INVOCATIONS.inc(_command_name(ctx))
+
+
+async def post_execution(ctx: tanjun.abc.Context) -> None:
+    """Hook called after a command is executed, even when it errors"""
+    started = _started.pop(id(ctx), None)
+
+    if started is not None:
+        metrics.COMMAND_LATENCY.observe(
+            time.perf_counter() - started, _command_name(ctx)
+        )
+
+
+async def on_error(ctx: tanjun.abc.Context, _: Exception) -> None:
+    """Hook called when a command raises, counting the error without deciding
+    whether it should be suppressed"""
+    metrics.COMMAND_ERRORS.inc(_command_name(ctx))
+
+
+def listener(callback: _ListenerT) -> _ListenerT:
+    """Wrap an event listener to record its latency, calls and errors
+
+    The wrapper keeps the signature of the listener so that dependency
+    injection still resolves its parameters.
+
+    Parameters
+    ----------
+    callback : Callable[..., Awaitable[None]]
+        The listener to wrap
+
+    Returns
+    -------
+    Callable[..., Awaitable[None]]
+        The wrapped listener
+    """
+    name = f"{callback.__module__.rsplit('.', 1)[-1]}.{callback.__name__}"
+
+    @functools.wraps(callback)
+    async def wrapper(*args: Any, **kwargs: Any) -> None:
+        metrics.LISTENER_INVOCATIONS.inc(name)
+        started = time.perf_counter()
+
+        try:
+            await callback(*args, **kwargs)
+        except Exception:
+            metrics.LISTENER_ERRORS.inc(name)
+            raise
+        finally:
+            metrics.LISTENER_LATENCY.observe(time.perf_counter() - started, name)
+
+    return cast(_ListenerT, wrapper)
+
+
+def slowest(kind: Literal["command", "listener"], limit: int = 10) -> list[Timing]:
+    """Get the commands or listeners with the highest mean latency
+
+    Parameters
+    ----------
+    kind : Literal["command", "listener"]
+        Whether to rank commands or listeners
+    limit : int
+        The maximum number of results
+
+    Returns
+    -------
+    list[Timing]
+        The timings ordered from slowest to fastest
+    """
+    if kind == "command":
+        latency, errors = metrics.COMMAND_LATENCY, metrics.COMMAND_ERRORS
+    else:
+        latency, errors = metrics.LISTENER_LATENCY, metrics.LISTENER_ERRORS
+
+    timings = [
+        Timing(
+            labels[0],
+            latency.count(*labels),
+            int(errors.get(*labels)),
+            latency.mean(*labels),
+            latency.quantile(0.95, *labels),
+        )
+        for labels in latency.labels()
+    ]
+    timings.sort(key=lambda timing: timing.mean, reverse=True)
+
+    return timings[:limit]
@@ -0,0 +1,342 @@
+"""Sample text the language identifier builds its n-gram profiles from
+
+Each sample mixes common function words with everyday chat phrasing, since
+that is what the translate commands mostly see. Only languages sharing a
+script with another need a sample, the rest are identified by their script.
+
+`LOOKALIKES` are close relatives of the sampled languages. They are never
+reported, and only keep their text from being mistaken for a sampled
+language.
+"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("LOOKALIKES", "SAMPLES")
+
+from typing import Final
+
+SAMPLES: Final[dict[str, str]] = {
+    "en": (
+        "The quick brown fox jumps over the lazy dog. I think that we should "
+        "meet at the station tomorrow morning, because the train leaves early "
+        "and there is nothing else to do. Have you seen what they posted in "
+        "the other channel? It was really funny and everyone was laughing "
+        "about it for hours. Please let me know when you are ready, and do not "
+        "forget to bring the keys with you. This is the best game I have ever "
+        "played, although the ending was a bit strange. Thank you for your "
+        "help, I would not have finished the work without you. What are you "
+        "doing this weekend? The weather should be nice and warm, so maybe we "
+        "could go for a walk through the park near the river. Which of these "
+        "would you like to read first? They were talking with their friends "
+        "while the children played outside in the garden."
+    ),
+    "es": (
+        "El rápido zorro marrón salta sobre el perro perezoso. Creo que "
+        "deberíamos encontrarnos en la estación mañana por la mañana, porque el "
+        "tren sale temprano y no hay nada más que hacer. ¿Has visto lo que "
+        "publicaron en el otro canal? Fue muy gracioso y todos se reían durante "
+        "horas. Por favor avísame cuando estés listo, y no olvides traer las "
+        "llaves contigo. Este es el mejor juego que he jugado nunca, aunque el "
+        "final fue un poco extraño. Gracias por tu ayuda, no habría terminado "
+        "el trabajo sin ti. ¿Qué vas a hacer este fin de semana? El tiempo "
+        "debería ser bueno y cálido, así que quizás podríamos dar un paseo por "
+        "el parque cerca del río. Ellos hablaban con sus amigos mientras los "
+        "niños jugaban afuera en el jardín. Nosotros también queremos ir."
+    ),
+    "fr": (
+        "Le renard brun rapide saute par-dessus le chien paresseux. Je pense "
+        "que nous devrions nous retrouver à la gare demain matin, parce que le "
+        "train part tôt et qu'il n'y a rien d'autre à faire. Est-ce que tu as "
+        "vu ce qu'ils ont publié dans l'autre salon ? C'était vraiment drôle et "
+        "tout le monde en a ri pendant des heures. Dis-moi quand tu es prêt, et "
+        "n'oublie pas d'apporter les clés avec toi. C'est le meilleur jeu "
+        "auquel j'ai jamais joué, même si la fin était un peu étrange. Merci "
+        "pour ton aide, je n'aurais pas fini le travail sans toi. Qu'est-ce que "
+        "tu fais ce week-end ? Il devrait faire beau et chaud, alors peut-être "
+        "que nous pourrions nous promener dans le parc près de la rivière. Ils "
+        "parlaient avec leurs amis pendant que les enfants jouaient dehors."
+    ),
+    "de": (
+        "Der schnelle braune Fuchs springt über den faulen Hund. Ich denke, "
+        "dass wir uns morgen früh am Bahnhof treffen sollten, weil der Zug "
+        "früh abfährt und es sonst nichts zu tun gibt. Hast du gesehen, was "
+        "sie im anderen Kanal gepostet haben? Es war wirklich lustig und alle "
+        "haben stundenlang darüber gelacht. Bitte sag mir Bescheid, wenn du "
+        "fertig bist, und vergiss nicht, die Schlüssel mitzubringen. Das ist "
+        "das beste Spiel, das ich je gespielt habe, auch wenn das Ende ein "
+        "bisschen seltsam war. Danke für deine Hilfe, ohne dich hätte ich die "
+        "Arbeit nicht geschafft. Was machst du am Wochenende? Das Wetter soll "
+        "schön und warm werden, also könnten wir vielleicht einen Spaziergang "
+        "durch den Park am Fluss machen. Sie sprachen mit ihren Freunden, "
+        "während die Kinder draußen im Garten spielten. Wir möchten auch mit."
+    ),
+    "it": (
+        "La rapida volpe marrone salta sopra il cane pigro. Penso che "
+        "dovremmo incontrarci alla stazione domani mattina, perché il treno "
+        "parte presto e non c'è nient'altro da fare. Hai visto cosa hanno "
+        "pubblicato nell'altro canale? Era davvero divertente e tutti ne hanno "
+        "riso per ore. Per favore fammi sapere quando sei pronto, e non "
+        "dimenticare di portare le chiavi con te. Questo è il gioco più bello "
+        "a cui abbia mai giocato, anche se il finale era un po' strano. Grazie "
+        "per il tuo aiuto, non avrei finito il lavoro senza di te. Cosa fai "
+        "questo fine settimana? Il tempo dovrebbe essere bello e caldo, quindi "
+        "forse potremmo fare una passeggiata nel parco vicino al fiume. Loro "
+        "parlavano con i loro amici mentre i bambini giocavano fuori nel "
+        "giardino. Anche noi vogliamo venire con voi."
+    ),
+    "pt": (
+        "A rápida raposa marrom pula sobre o cão preguiçoso. Eu acho que "
+        "devíamos nos encontrar na estação amanhã de manhã, porque o trem sai "
+        "cedo e não há mais nada para fazer. Você viu o que eles postaram no "
+        "outro canal? Foi muito engraçado e todo mundo riu disso por horas. Por "
+        "favor me avise quando estiver pronto, e não se esqueça de trazer as "
+        "chaves com você. Este é o melhor jogo que eu já joguei, embora o final "
+        "tenha sido um pouco estranho. Obrigado pela sua ajuda, eu não teria "
+        "terminado o trabalho sem você. O que você vai fazer neste fim de "
+        "semana? O tempo deve estar bom e quente, então talvez a gente possa "
+        "dar um passeio pelo parque perto do rio. Eles conversavam com os "
+        "amigos enquanto as crianças brincavam lá fora no jardim. Nós também "
+        "queremos ir, não é verdade? São coisas que acontecem."
+    ),
+    "nl": (
+        "De snelle bruine vos springt over de luie hond. Ik denk dat we "
+        "morgenochtend op het station moeten afspreken, omdat de trein vroeg "
+        "vertrekt en er verder niets te doen is. Heb je gezien wat ze in het "
+        "andere kanaal hebben gepost? Het was echt grappig en iedereen heeft "
+        "er urenlang om gelachen. Laat me alsjeblieft weten wanneer je klaar "
+        "bent, en vergeet niet de sleutels mee te nemen. Dit is het beste spel "
+        "dat ik ooit heb gespeeld, hoewel het einde een beetje vreemd was. "
+        "Bedankt voor je hulp, zonder jou had ik het werk niet afgemaakt. Wat "
+        "ga je dit weekend doen? Het weer zou mooi en warm moeten zijn, dus "
+        "misschien kunnen we een wandeling maken door het park bij de rivier. "
+        "Zij praatten met hun vrienden terwijl de kinderen buiten in de tuin "
+        "speelden. Wij willen ook graag mee, want het is gezellig."
+    ),
+    "sv": (
+        "Den snabba bruna räven hoppar över den lata hunden. Jag tycker att "
+        "vi borde träffas på stationen i morgon bitti, eftersom tåget går "
+        "tidigt och det inte finns något annat att göra. Har du sett vad de "
+        "lade upp i den andra kanalen? Det var verkligen roligt och alla "
+        "skrattade åt det i flera timmar. Säg till när du är klar, och glöm "
+        "inte att ta med dig nycklarna. Det här är det bästa spelet jag "
+        "någonsin har spelat, även om slutet var lite konstigt. Tack för din "
+        "hjälp, jag hade inte blivit klar med arbetet utan dig. Vad ska du "
+        "göra i helgen? Vädret ska bli fint och varmt, så vi kanske kan ta en "
+        "promenad genom parken vid floden. De pratade med sina vänner medan "
+        "barnen lekte ute i trädgården. Vi vill också följa med."
+    ),
+    "pl": (
+        "Szybki brązowy lis przeskakuje nad leniwym psem. Myślę, że powinniśmy "
+        "spotkać się jutro rano na dworcu, ponieważ pociąg odjeżdża wcześnie i "
+        "nie ma nic innego do roboty. Widziałeś, co wrzucili na drugi kanał? "
+        "To było naprawdę śmieszne i wszyscy się z tego śmiali przez wiele "
+        "godzin. Daj mi znać, kiedy będziesz gotowy, i nie zapomnij zabrać ze "
+        "sobą kluczy. To najlepsza gra, w jaką kiedykolwiek grałem, chociaż "
+        "zakończenie było trochę dziwne. Dziękuję za pomoc, bez ciebie nie "
+        "skończyłbym tej pracy. Co robisz w ten weekend? Pogoda ma być ładna i "
+        "ciepła, więc może moglibyśmy pójść na spacer po parku nad rzeką. "
+        "Rozmawiali ze swoimi przyjaciółmi, podczas gdy dzieci bawiły się na "
+        "dworze w ogrodzie. My też chcemy iść, jeśli to możliwe."
+    ),
+    "tr": (
+        "Hızlı kahverengi tilki tembel köpeğin üzerinden atlar. Bence yarın "
+        "sabah istasyonda buluşmalıyız, çünkü tren erken kalkıyor ve "
+        "yapılacak başka bir şey yok. Diğer kanalda ne paylaştıklarını gördün "
+        "mü? Gerçekten çok komikti ve herkes saatlerce buna güldü. Hazır "
+        "olduğunda lütfen bana haber ver ve anahtarları yanına almayı unutma. "
+        "Bu şimdiye kadar oynadığım en iyi oyun, ama sonu biraz tuhaftı. "
+        "Yardımın için teşekkür ederim, sen olmadan bu işi bitiremezdim. Bu "
+        "hafta sonu ne yapıyorsun? Hava güzel ve sıcak olacakmış, belki nehrin "
+        "yanındaki parkta yürüyüşe çıkabiliriz. Çocuklar bahçede oynarken "
+        "onlar arkadaşlarıyla konuşuyorlardı. Biz de gelmek istiyoruz, "
+        "değil mi? Bugün çok güzel bir gün oldu."
+    ),
+    "id": (
+        "Rubah cokelat yang cepat melompati anjing yang malas. Saya pikir kita "
+        "harus bertemu di stasiun besok pagi, karena keretanya berangkat pagi "
+        "dan tidak ada hal lain yang bisa dilakukan. Apakah kamu sudah melihat "
+        "apa yang mereka unggah di saluran lain? Itu benar-benar lucu dan "
+        "semua orang menertawakannya selama berjam-jam. Tolong beri tahu saya "
+        "kalau kamu sudah siap, dan jangan lupa membawa kuncinya. Ini adalah "
+        "permainan terbaik yang pernah saya mainkan, walaupun akhirnya agak "
+        "aneh. Terima kasih atas bantuanmu, saya tidak akan menyelesaikan "
+        "pekerjaan ini tanpa kamu. Apa yang akan kamu lakukan akhir pekan ini? "
+        "Cuacanya seharusnya cerah dan hangat, jadi mungkin kita bisa berjalan "
+        "jalan di taman dekat sungai. Mereka berbicara dengan teman-teman "
+        "mereka sementara anak-anak bermain di luar di kebun."
+    ),
+    "ru": (
+        "Быстрая коричневая лиса прыгает через ленивую собаку. Я думаю, что "
+        "нам стоит встретиться на вокзале завтра утром, потому что поезд "
+        "уходит рано и больше нечего делать. Ты видел, что они выложили в "
+        "другом канале? Это было очень смешно, и все смеялись над этим "
+        "несколько часов. Пожалуйста, дай мне знать, когда будешь готов, и не "
+        "забудь взять с собой ключи. Это лучшая игра, в которую я когда-либо "
+        "играл, хотя концовка была немного странной. Спасибо за помощь, без "
+        "тебя я бы не закончил эту работу. Что ты делаешь в эти выходные? "
+        "Погода должна быть хорошей и тёплой, так что, может быть, мы могли бы "
+        "погулять в парке у реки. Они разговаривали со своими друзьями, пока "
+        "дети играли на улице в саду. Мы тоже хотим пойти."
+    ),
+    "uk": (
+        "Швидка коричнева лисиця стрибає через ледачого пса. Я думаю, що нам "
+        "варто зустрітися на вокзалі завтра вранці, тому що потяг "
+        "відправляється рано і більше нічого робити. Ти бачив, що вони "
+        "виклали в іншому каналі? Це було дуже смішно, і всі сміялися з цього "
+        "кілька годин. Будь ласка, дай мені знати, коли будеш готовий, і не "
+        "забудь узяти з собою ключі. Це найкраща гра, в яку я коли-небудь "
+        "грав, хоча кінцівка була трохи дивною. Дякую за допомогу, без тебе я "
+        "б не закінчив цю роботу. Що ти робиш у ці вихідні? Погода має бути "
+        "гарною і теплою, тож, можливо, ми могли б погуляти в парку біля "
+        "річки. Вони розмовляли зі своїми друзями, поки діти гралися надворі "
+        "в саду. Ми теж хочемо піти, це ж їхнє свято."
+    ),
+}
+
+LOOKALIKES: Final[dict[str, str]] = {
+    "da": (
+        "Den hurtige brune ræv springer over den dovne hund. Jeg synes, at vi "
+        "skal mødes på stationen i morgen tidlig, fordi toget kører tidligt, og "
+        "der er ikke andet at lave. Har du set, hvad de skrev i den anden "
+        "kanal? Det var virkelig sjovt, og alle grinede af det i flere timer. "
+        "Sig til, når du er klar, og glem ikke at tage nøglerne med. Det er det "
+        "bedste spil, jeg nogensinde har spillet, selvom slutningen var lidt "
+        "mærkelig. Tak for din hjælp, jeg ville ikke have gjort arbejdet "
+        "færdigt uden dig. Hvad skal du lave i weekenden? Vejret skulle blive "
+        "godt og varmt, så måske kunne vi gå en tur gennem parken ved åen. "
+        "Hvilken af dem vil du læse først? De snakkede med deres venner, mens "
+        "børnene legede ude i haven."
+    ),
+    "no": (
+        "Den raske brune reven hopper over den late hunden. Jeg synes vi burde "
+        "møtes på stasjonen i morgen tidlig, fordi toget går tidlig og det er "
+        "ikke noe annet å gjøre. Har du sett hva de la ut i den andre kanalen? "
+        "Det var skikkelig morsomt, og alle lo av det i flere timer. Si ifra "
+        "når du er klar, og ikke glem å ta med deg nøklene. Dette er det beste "
+        "spillet jeg noen gang har spilt, selv om slutten var litt rar. Takk "
+        "for hjelpen, jeg hadde ikke blitt ferdig med arbeidet uten deg. Hva "
+        "skal du gjøre i helgen? Været skal visst bli fint og varmt, så kanskje "
+        "vi kunne gå en tur gjennom parken ved elva. Hvilken av disse vil du "
+        "lese først? De snakket med vennene sine mens barna lekte ute i hagen."
+    ),
+    "ca": (
+        "La guineu marró ràpida salta per sobre del gos mandrós. Crec que "
+        "hauríem de trobar-nos a l'estació demà al matí, perquè el tren surt "
+        "d'hora i no hi ha res més a fer. Has vist el que han publicat a "
+        "l'altre canal? Va ser molt divertit i tothom en va riure durant hores. "
+        "Si us plau, avisa'm quan estiguis a punt, i no t'oblidis de portar les "
+        "claus. Aquest és el millor joc al qual he jugat mai, tot i que el "
+        "final va ser una mica estrany. Gràcies per la teva ajuda, no hauria "
+        "acabat la feina sense tu. Què fas aquest cap de setmana? El temps "
+        "hauria de ser bo i càlid, així que potser podríem fer un passeig pel "
+        "parc a prop del riu. Quin d'aquests vols llegir primer? Ells parlaven "
+        "amb els seus amics mentre els nens jugaven fora al jardí."
+    ),
+    "gl": (
+        "O raposo marrón rápido salta por riba do can preguiceiro. Coido que "
+        "deberiamos atoparnos na estación mañá pola mañá, porque o tren sae "
+        "cedo e non hai nada máis que facer. Viches o que publicaron na outra "
+        "canle? Foi moi gracioso e todo o mundo estivo a rir durante horas. Por "
+        "favor avísame cando esteas listo, e non esquezas traer as chaves "
+        "contigo. Este é o mellor xogo ao que xoguei nunca, aínda que o final "
+        "foi un pouco estraño. Grazas pola túa axuda, non tería rematado o "
+        "traballo sen ti. Que fas esta fin de semana? O tempo debería ser bo e "
+        "cálido, así que quizais poderiamos dar un paseo polo parque preto do "
+        "río. Cal destes queres ler primeiro? Eles falaban cos seus amigos "
+        "mentres os nenos xogaban fóra no xardín."
+    ),
+    "af": (
+        "Die vinnige bruin jakkals spring oor die lui hond. Ek dink ons moet "
+        "môreoggend by die stasie ontmoet, want die trein vertrek vroeg en daar "
+        "is niks anders om te doen nie. Het jy gesien wat hulle in die ander "
+        "kanaal geplaas het? Dit was regtig snaaks en almal het ure lank "
+        "daaroor gelag. Laat my asseblief weet wanneer jy gereed is, en moenie "
+        "vergeet om die sleutels saam te bring nie. Dit is die beste speletjie "
+        "wat ek nog ooit gespeel het, al was die einde bietjie vreemd. Dankie "
+        "vir jou hulp, ek sou nie die werk sonder jou klaargemaak het nie. Wat "
+        "doen jy hierdie naweek? Die weer behoort lekker warm te wees, so "
+        "miskien kan ons 'n entjie deur die park naby die rivier stap. Watter "
+        "een van hierdie wil jy eerste lees? Hulle het met hul vriende gesels "
+        "terwyl die kinders buite in die tuin gespeel het."
+    ),
+    "ms": (
+        "Musang perang yang pantas melompat ke atas anjing yang malas. Saya "
+        "rasa kita patut berjumpa di stesen esok pagi, sebab kereta api "
+        "bertolak awal dan tiada apa-apa lagi yang boleh dibuat. Awak dah "
+        "tengok apa yang mereka siarkan dalam saluran lain? Memang kelakar dan "
+        "semua orang ketawa berjam-jam. Tolong beritahu saya bila awak dah "
+        "sedia, dan jangan lupa bawa kunci sekali. Ini permainan paling best "
+        "yang pernah saya main, walaupun pengakhirannya agak pelik. Terima "
+        "kasih atas bantuan awak, saya takkan siapkan kerja ini tanpa awak. "
+        "Awak buat apa hujung minggu ini? Cuaca sepatutnya baik dan panas, jadi "
+        "mungkin kita boleh berjalan-jalan di taman berhampiran sungai. Yang "
+        "mana satu awak nak baca dulu? Mereka berbual dengan kawan-kawan mereka "
+        "sementara budak-budak bermain di luar dalam taman."
+    ),
+    "ga": (
+        "Léimeann an sionnach donn tapa thar an madra leisciúil. Sílim gur "
+        "chóir dúinn bualadh le chéile ag an stáisiún maidin amárach, mar "
+        "fágann an traein go luath agus níl aon rud eile le déanamh. An bhfaca "
+        "tú an rud a chuir siad suas sa chainéal eile? Bhí sé an-ghreannmhar "
+        "agus bhí gach duine ag gáire faoi ar feadh uaireanta. Cuir in iúl dom "
+        "nuair a bheidh tú réidh, le do thoil, agus ná déan dearmad na "
+        "heochracha a thabhairt leat. Seo an cluiche is fearr a d'imir mé "
+        "riamh, cé go raibh an deireadh rud beag aisteach. Go raibh maith agat "
+        "as do chabhair, ní bheadh an obair críochnaithe agam gan tú. Cad atá "
+        "ar siúl agat an deireadh seachtaine seo? Ba cheart go mbeadh an "
+        "aimsir go deas te, mar sin b'fhéidir go bhféadfaimis siúlóid a "
+        "dhéanamh tríd an bpáirc in aice leis an abhainn. Bhí siad ag caint "
+        "lena gcairde fad a bhí na páistí ag súgradh amuigh sa ghairdín."
+    ),
+    "fy": (
+        "De flugge brune foks springt oer de luie hûn. Ik tink dat wy moarn "
+        "betiid by it stasjon ôfprate moatte, want de trein giet ier en der is "
+        "neat oars te dwaan. Hasto sjoen wat se yn it oare kanaal set hawwe? It "
+        "wie echt grappich en elkenien hat der oeren om laitsje moatten. Lit my "
+        "asjebleaft witte wannear'tsto klear bist, en ferjit de kaaien net mei "
+        "te nimmen. Dit is it bêste spul dat ik ea spile haw, al wie it ein wat "
+        "nuver. Tige tank foar dyn help, sûnder dy hie ik it wurk net "
+        "ôfmakke. Wat dochsto dit wykein? It waar soe moai en waarm wêze "
+        "moatte, dus miskien kinne wy in kuier meitsje troch it park by de "
+        "rivier. Hokker fan dizze wolsto earst lêze? Se praten mei harren "
+        "freonen wylst de bern bûten yn 'e tún boarten."
+    ),
+    "bg": (
+        "Бързата кафява лисица прескача мързеливото куче. Мисля, че трябва да "
+        "се срещнем на гарата утре сутринта, защото влакът тръгва рано и няма "
+        "какво друго да правим. Видя ли какво публикуваха в другия канал? Беше "
+        "наистина смешно и всички се смяха на това с часове. Моля те, кажи ми, "
+        "когато си готов, и не забравяй да донесеш ключовете. Това е "
+        "най-хубавата игра, която съм играл някога, въпреки че краят беше "
+        "малко странен. Благодаря ти за помощта, нямаше да завърша работата "
+        "без теб. Какво ще правиш този уикенд? Времето трябва да е хубаво и "
+        "топло, така че може би ще се разходим из парка край реката. Коя от "
+        "тези искаш да прочетеш първо? Те си говореха с приятелите си, докато "
+        "децата играеха навън в градината."
+    ),
+    "mk": (
+        "Брзата кафеава лисица скока преку мрзливото куче. Мислам дека треба "
+        "да се најдеме на станицата утре наутро, бидејќи возот тргнува рано и "
+        "нема ништо друго да се прави. Дали виде што објавија во другиот "
+        "канал? Беше навистина смешно и сите се смееја на тоа со часови. Те "
+        "молам кажи ми кога ќе бидеш подготвен, и не заборавај да ги донесеш "
+        "клучевите. Ова е најдобрата игра што некогаш сум ја играл, иако "
+        "крајот беше малку чуден. Ти благодарам за помошта, немаше да ја "
+        "завршам работата без тебе. Што правиш овој викенд? Времето треба да "
+        "биде убаво и топло, па можеби ќе прошетаме низ паркот покрај реката. "
+        "Која од овие сакаш прво да ја прочиташ? Тие разговараа со своите "
+        "пријатели додека децата си играа надвор во градината."
+    ),
+    "be": (
+        "Хуткая карычневая ліса пераскоквае праз лянівага сабаку. Я думаю, "
+        "што нам трэба сустрэцца на вакзале заўтра раніцай, бо цягнік "
+        "адыходзіць рана і больш няма чаго рабіць. Ты бачыў, што яны выклалі ў "
+        "іншым канале? Было вельмі смешна, і ўсе смяяліся з гэтага некалькі "
+        "гадзін. Калі ласка, скажы мне, калі будзеш гатовы, і не забудзь узяць "
+        "з сабой ключы. Гэта лепшая гульня, у якую я калі-небудзь гуляў, хоць "
+        "канцоўка была крыху дзіўнай. Дзякуй за дапамогу, я б не скончыў "
+        "працу без цябе. Што ты робіш на гэтых выходных? Надвор'е павінна быць "
+        "добрым і цёплым, таму, магчыма, мы маглі б прагуляцца па парку каля "
+        "ракі. Што з гэтага ты хочаш прачытаць першым? Яны размаўлялі са "
+        "сваімі сябрамі, пакуль дзеці гулялі на двары ў садзе."
+    ),
+}
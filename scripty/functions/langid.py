@@ -0,0 +1,295 @@
+"""Offline language identification from scripts and character n-grams
+
+Some scripts are only used by one language, so counting the scripts of the
+letters is enough to identify them. Text in a shared script is scored with a
+naive Bayes model over character 1 to 3-grams built from `langdata.SAMPLES`
+and `langdata.LOOKALIKES` the first time it is needed, and only a sampled
+language leading every other by a wide margin is reported. Anything else is
+left for the translation service to identify.
+"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("Identifier", "detect", "is_same_language", "script_of")
+
+import array
+import bisect
+import collections
+import functools
+import math
+from typing import Final
+
+from scripty.functions import langdata
+
+# Start and end of the blocks of each script which are told apart, in order
+_SCRIPT_RANGES: Final[tuple[tuple[int, int, str], ...]] = (
+    (0x0041, 0x005A, "Latin"),
+    (0x0061, 0x007A, "Latin"),
+    (0x00C0, 0x024F, "Latin"),
+    (0x0370, 0x03FF, "Greek"),
+    (0x0400, 0x052F, "Cyrillic"),
+    (0x0530, 0x058F, "Armenian"),
+    (0x0590, 0x05FF, "Hebrew"),
+    (0x0600, 0x06FF, "Arabic"),
+    (0x0750, 0x077F, "Arabic"),
+    (0x0900, 0x097F, "Devanagari"),
+    (0x0980, 0x09FF, "Bengali"),
+    (0x0A00, 0x0A7F, "Gurmukhi"),
+    (0x0A80, 0x0AFF, "Gujarati"),
+    (0x0B80, 0x0BFF, "Tamil"),
+    (0x0C00, 0x0C7F, "Telugu"),
+    (0x0C80, 0x0CFF, "Kannada"),
+    (0x0D00, 0x0D7F, "Malayalam"),
+    (0x0E00, 0x0E7F, "Thai"),
+    (0x10A0, 0x10FF, "Georgian"),
+    (0x1100, 0x11FF, "Hangul"),
+    (0x1E00, 0x1EFF, "Latin"),
+    (0x3040, 0x309F, "Hiragana"),
+    (0x30A0, 0x30FF, "Katakana"),
+    (0x3130, 0x318F, "Hangul"),
+    (0x3400, 0x4DBF, "Han"),
+    (0x4E00, 0x9FFF, "Han"),
+    (0xAC00, 0xD7AF, "Hangul"),
+)
+_SCRIPT_STARTS: Final[list[int]] = [start for start, _, _ in _SCRIPT_RANGES]
+
+# Scripts used by a single language Google Translate supports, as its codes.
+# Arabic, Bengali, Devanagari, Han and Hebrew are each written by several.
+_SCRIPT_LANGUAGES: Final[dict[str, str]] = {
+    "Armenian": "hy",
+    "Georgian": "ka",
+    "Greek": "el",
+    "Gujarati": "gu",
+    "Gurmukhi": "pa",
+    "Hangul": "ko",
+    "Hiragana": "ja",
+    "Kannada": "kn",
+    "Katakana": "ja",
+    "Malayalam": "ml",
+    "Tamil": "ta",
+    "Telugu": "te",
+    "Thai": "th",
+}
+
+MAX_CHARS: Final[int] = 400
+"""Only the start of longer text is looked at"""
+MIN_LETTERS: Final[int] = 3
+"""Shorter text is not identified at all"""
+MIN_NGRAM_LETTERS: Final[int] = 12
+"""Shorter text in a shared script is not identified"""
+MARGIN: Final[float] = 0.05
+"""How far the mean score of a sampled language has to lead every other"""
+
+
+def _script(char: str) -> str | None:
+    point = ord(char)
+    index = bisect.bisect_right(_SCRIPT_STARTS, point) - 1
+
+    if index >= 0:
+        start, end, script = _SCRIPT_RANGES[index]
+        if start <= point <= end:
+            return script
+
+    return None
+
+
+def script_of(text: str) -> tuple[str | None, collections.Counter[str]]:
+    """Find the script most letters of the text are written in
+
+    Parameters
+    ----------
+    text : str
+        The text to look at
+
+    Returns
+    -------
+    tuple[str | None, collections.Counter[str]]
+        The dominant script, or ``None`` if there are no letters, and the
+        letter count of every script
+    """
+    scripts = collections.Counter(
+        script for char in text[:MAX_CHARS] if (script := _script(char)) is not None
+    )
+
+    if not scripts:
+        return None, scripts
+
+    return scripts.most_common(1)[0][0], scripts
+
+
+def _ngrams(text: str) -> collections.Counter[str]:
+    grams: collections.Counter[str] = collections.Counter()
+
+    for word in "".join(char if char.isalpha() else " " for char in text).split():
+        padded = f" {word} "
+        grams.update(padded[index] for index in range(1, len(padded) - 1))
+        grams.update(padded[index : index + 2] for index in range(len(padded) - 1))
+        grams.update(padded[index : index + 3] for index in range(len(padded) - 2))
+
+    return grams
+
+
+class Identifier:
+    """A naive Bayes language model over character n-grams
+
+    The log probabilities of every known n-gram are kept in one flat float
+    array, with a dict mapping each n-gram to its row.
+
+    Parameters
+    ----------
+    samples : dict[str, str]
+        Sample text per language code
+    lookalikes : dict[str, str] | None
+        Sample text of languages which are scored but never reported
+    """
+
+    def __init__(
+        self, samples: dict[str, str], lookalikes: dict[str, str] | None = None
+    ) -> None:
+        self.reported = frozenset(samples)
+        samples = {**samples, **(lookalikes or {})}
+        self.languages = tuple(samples)
+        counts = {language: _ngrams(text.lower()) for language, text in samples.items()}
+        grams = sorted({gram for count in counts.values() for gram in count})
+        self._rows = {gram: row for row, gram in enumerate(grams)}
+        self._scores = array.array("f")
+
+        # Add-one smoothing, so unseen n-grams cost the same as seen-once ones
+        denominators = {
+            language: math.log(sum(count.values()) + len(grams))
+            for language, count in counts.items()
+        }
+
+        for gram in grams:
+            self._scores.extend(
+                math.log(counts[language][gram] + 1) - denominators[language]
+                for language in self.languages
+            )
+
+    def scores(self, text: str) -> dict[str, float]:
+        """Score each language by the mean log probability of the n-grams
+
+        Parameters
+        ----------
+        text : str
+            The text to score
+
+        Returns
+        -------
+        dict[str, float]
+            The score of every language, higher is more likely
+        """
+        width = len(self.languages)
+        totals = [0.0] * width
+        seen = 0
+
+        for gram, count in _ngrams(text[:MAX_CHARS].lower()).items():
+            # An n-gram no language has does not tell them apart
+            if (row := self._rows.get(gram)) is None:
+                continue
+
+            seen += count
+            base = row * width
+
+            for index in range(width):
+                totals[index] += count * self._scores[base + index]
+
+        return {
+            language: total / seen if seen else 0.0
+            for language, total in zip(self.languages, totals)
+        }
+
+    def detect(self, text: str, *, margin: float = MARGIN) -> str | None:
+        """Identify the language of text
+
+        Parameters
+        ----------
+        text : str
+            The text to identify
+        margin : float
+            How far the best mean score has to lead the next one
+
+        Returns
+        -------
+        str | None
+            The language code, or ``None`` if no reported language clearly
+            leads
+        """
+        scores = sorted(self.scores(text).items(), key=lambda item: -item[1])
+
+        if not scores or len(scores) > 1 and scores[0][1] - scores[1][1] < margin:
+            return None
+
+        # A lookalike leading means the text is in a language not sampled
+        return scores[0][0] if scores[0][0] in self.reported else None
+
+
+@functools.cache
+def _identifier(script: str) -> Identifier:
+    return Identifier(
+        {
+            language: text
+            for language, text in langdata.SAMPLES.items()
+            if script_of(text)[0] == script
+        },
+        {
+            language: text
+            for language, text in langdata.LOOKALIKES.items()
+            if script_of(text)[0] == script
+        },
+    )
+
+
+def detect(text: str) -> str | None:
+    """Identify the language of text without any request
+
+    Parameters
+    ----------
+    text : str
+        The text to identify
+
+    Returns
+    -------
+    str | None
+        The Google Translate code of the language, or ``None`` if it could not
+        be identified confidently
+    """
+    script, scripts = script_of(text)
+    letters = sum(scripts.values())
+
+    if script is None or letters < MIN_LETTERS:
+        return None
+
+    # Only Japanese mixes kana into Han, which alone may also be either Chinese
+    if script == "Han" and (scripts["Hiragana"] or scripts["Katakana"]):
+        return "ja"
+
+    if language := _SCRIPT_LANGUAGES.get(script):
+        return language
+
+    if letters < MIN_NGRAM_LETTERS:
+        return None
+
+    return _identifier(script).detect(text)
+
+
+def is_same_language(detected: str, target: str) -> bool:
+    """Whether a detected language is the target, ignoring Chinese variants
+
+    Parameters
+    ----------
+    detected : str
+        A detected language code
+    target : str
+        The language code translated to
+
+    Returns
+    -------
+    bool
+        Whether translating would not change the language
+    """
+    detected = detected.lower()
+    target = target.lower()
+
+    return detected == target or (
+        not detected.startswith("zh") and detected == target.split("-")[0]
+    )
@@ -0,0 +1,160 @@
+"""Shared Reddit listings revalidated with conditional requests"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("Listing", "Submission", "parse_submissions")
+
+import asyncio
+import logging
+import math
+import time
+from typing import Any, NamedTuple
+
+from scripty import errors
+from scripty.functions import upstream
+
+_LOGGER = logging.getLogger("scripty.listing")
+
+
+class Submission(NamedTuple):
+    """The fields of a submission needed to show it"""
+
+    title: str
+    permalink: str
+    url: str
+
+
+def parse_submissions(listing: Any) -> tuple[Submission, ...]:
+    """Keep the safe for work image submissions of a listing
+
+    Parameters
+    ----------
+    listing : Any
+        A decoded Reddit listing
+
+    Returns
+    -------
+    tuple[Submission, ...]
+        The compact records of the submissions to show
+    """
+    return tuple(
+        Submission(
+            (
+                data["title"][:255] + "\U00002026"
+                if len(data["title"]) > 256
+                else data["title"]
+            ),
+            f"https://reddit.com{data['permalink']}",
+            data["url"],
+        )
+        for child in listing["data"]["children"]
+        if not (data := child["data"])["over_18"] and not data["is_video"]
+    )
+
+
+class Listing:
+    """A listing shared by every command invocation
+
+    The submissions are fetched once and then served from memory. When they
+    are older than ``max_age`` they are still served while a single
+    background request revalidates them with the ``ETag`` and
+    ``Last-Modified`` of the last response, so an unchanged listing costs an
+    empty ``304`` response.
+
+    Parameters
+    ----------
+    service : upstream.Service
+        The upstream the listing is requested from
+    url : str
+        The URL of the listing
+    headers : dict[str, str] | None
+        Headers sent with every request
+    max_age : float
+        Seconds after which the listing is revalidated
+    """
+
+    def __init__(
+        self,
+        service: upstream.Service,
+        url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        max_age: float = 300.0,
+    ) -> None:
+        self.service = service
+        self.url = url
+        self.headers = headers or {}
+        self.max_age = max_age
+        self.submissions: tuple[Submission, ...] = ()
+        # The monotonic clock may start at zero, so the listing is stale until
+        # it is first fetched however recently the host booted
+        self._fetched_at = -math.inf
+        self._validators: dict[str, str] = {}
+        self._refresh: asyncio.Task[None] | None = None
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the listing should be revalidated"""
+        return time.monotonic() - self._fetched_at > self.max_age
+
+    async def get(self, client: upstream.UpstreamClient) -> tuple[Submission, ...]:
+        """Get the submissions, only waiting for a request if there are none
+
+        Parameters
+        ----------
+        client : upstream.UpstreamClient
+            The client to revalidate with
+
+        Returns
+        -------
+        tuple[Submission, ...]
+            The shared submissions, which must not be modified
+        """
+        if self.is_stale and self._refresh is None:
+            self._refresh = asyncio.create_task(self._revalidate(client))
+
+        if not self.submissions and self._refresh is not None:
+            await asyncio.shield(self._refresh)
+
+        return self.submissions
+
+    async def _revalidate(self, client: upstream.UpstreamClient) -> None:
+        try:
+            response = await client.request(
+                self.service,
+                "GET",
+                self.url,
+                headers={**self.headers, **self._validators},
+            )
+
+            if response.status == 304:
+                self._fetched_at = time.monotonic()
+                return
+
+            if not response.ok:
+                raise errors.HTTPError(
+                    f"{self.service.name} responded with {response.status}"
+                )
+
+            submissions = parse_submissions(response.json())
+        except (errors.HTTPError, KeyError, TypeError, ValueError) as exc:
+            # Stale submissions are better than none, waiters see the error
+            if not self.submissions:
+                raise
+
+            # Retried after another max age rather than on every call
+            _LOGGER.warning("failed to revalidate %s: %r", self.url, exc)
+            self._fetched_at = time.monotonic()
+            return
+        finally:
+            self._refresh = None
+
+        self.submissions = submissions
+        self._fetched_at = time.monotonic()
+        self._validators = {
+            request: value
+            for request, response_header in (
+                ("If-None-Match", "ETag"),
+                ("If-Modified-Since", "Last-Modified"),
+            )
+            if (value := response.headers.get(response_header)) is not None
+        }
@@ -0,0 +1,436 @@
+"""In-process metrics exposed in the Prometheus text format
+
+Every metric is updated in place by the code it measures so that rendering
+an exposition is a walk over a handful of small dicts.
+"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = (
+    "AUTOMOD_INFLIGHT",
+    "CACHE_SIZE",
+    "COMMAND_ERRORS",
+    "COMMAND_INVOCATIONS",
+    "COMMAND_LATENCY",
+    "COMPONENT_INTERACTIONS",
+    "Counter",
+    "GATEWAY_SESSIONS",
+    "Gauge",
+    "HEARTBEAT_LATENCY",
+    "Histogram",
+    "LISTENER_ERRORS",
+    "LISTENER_INVOCATIONS",
+    "LISTENER_LATENCY",
+    "LOOP_LAG",
+    "LOOP_STALLS",
+    "PREFETCH",
+    "READY",
+    "REGISTRY",
+    "Registry",
+    "TRANSLATION_CACHE",
+    "TRANSLATIONS_SKIPPED",
+    "UPSTREAM_HEDGES",
+    "UPSTREAM_LATENCY",
+    "UPSTREAM_REQUESTS",
+    "UPSTREAM_RETRIES",
+    "upstream_trace_config",
+)
+
+import abc
+import bisect
+import math
+import types
+from typing import Callable, Iterator, TypeVar
+
+import aiohttp
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+_MetricT = TypeVar("_MetricT", bound="_Metric")
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+
+    pairs = (
+        f'{name}="'
+        + value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        + '"'
+        for name, value in zip(names, values)
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+class _Metric(abc.ABC):
+    kind: str = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def _check_labels(self, labels: tuple[str, ...]) -> None:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {labels}"
+            )
+
+    @abc.abstractmethod
+    def samples(self) -> Iterator[str]:
+        """Yield the sample lines of this metric"""
+
+    def expose(self) -> Iterator[str]:
+        """Yield the exposition lines of this metric"""
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self.samples()
+
+
+class Counter(_Metric):
+    """A monotonically increasing value per label set"""
+
+    kind = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Increment the counter for the label values"""
+        self._check_labels(labels)
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def get(self, *labels: str) -> float:
+        """Get the current value for the label values"""
+        return self._values.get(labels, 0.0)
+
+    def items(self) -> Iterator[tuple[tuple[str, ...], float]]:
+        """Iterate over label values and their current value"""
+        return iter(self._values.items())
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in self._values.items():
+            yield (
+                f"{self.name}{_format_labels(self.labelnames, labels)} "
+                f"{_format_value(value)}"
+            )
+
+
+class Gauge(Counter):
+    """A value per label set that can go up and down
+
+    A gauge may instead be backed by a function that is called on exposition,
+    which must be cheap to call.
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._functions: dict[tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        """Set the gauge for the label values"""
+        self._check_labels(labels)
+        self._values[labels] = value
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        """Decrement the gauge for the label values"""
+        self.inc(*labels, amount=-amount)
+
+    def set_function(self, function: Callable[[], float], *labels: str) -> None:
+        """Back the gauge for the label values with a function"""
+        self._check_labels(labels)
+        self._functions[labels] = function
+
+    def remove_function(self, *labels: str) -> None:
+        """Stop backing the gauge for the label values with a function"""
+        self._check_labels(labels)
+        self._functions.pop(labels, None)
+
+    def get(self, *labels: str) -> float:
+        if function := self._functions.get(labels):
+            return function()
+        return super().get(*labels)
+
+    def samples(self) -> Iterator[str]:
+        yield from super().samples()
+
+        for labels, function in self._functions.items():
+            yield (
+                f"{self.name}{_format_labels(self.labelnames, labels)} "
+                f"{_format_value(function())}"
+            )
+
+
+class Histogram(_Metric):
+    """Observations counted into fixed buckets per label set"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        *,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+        # Non-cumulative bucket counts per label set with a trailing +Inf
+        # bucket, cumulated only when exposed
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record an observation for the label values"""
+        try:
+            counts = self._counts[labels]
+        except KeyError:
+            self._check_labels(labels)
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0.0
+
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    def labels(self) -> Iterator[tuple[str, ...]]:
+        """Iterate over the label values which have observations"""
+        return iter(self._counts)
+
+    def count(self, *labels: str) -> int:
+        """Get the number of observations for the label values"""
+        return sum(self._counts.get(labels, ()))
+
+    def mean(self, *labels: str) -> float:
+        """Get the mean observation for the label values"""
+        count = self.count(*labels)
+        return self._sums[labels] / count if count else 0.0
+
+    def quantile(self, quantile: float, *labels: str) -> float:
+        """Estimate a quantile as the upper bound of the bucket it falls in
+
+        Observations past the last bucket are reported as infinite.
+        """
+        counts = self._counts.get(labels)
+
+        if not counts:
+            return 0.0
+
+        rank = quantile * sum(counts)
+        cumulative = 0
+
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+
+        return math.inf
+
+    def samples(self) -> Iterator[str]:
+        for labels, counts in self._counts.items():
+            cumulative = 0
+            names = (*self.labelnames, "le")
+
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket"
+                    f"{_format_labels(names, (*labels, _format_value(bound)))} "
+                    f"{cumulative}"
+                )
+
+            label_string = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_string} {_format_value(self._sums[labels])}"
+            yield f"{self.name}_count{label_string} {cumulative}"
+
+
+class Registry:
+    """A collection of metrics rendered together"""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _MetricT) -> _MetricT:
+        """Register a metric, returning it for assignment"""
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name} is already registered")
+
+        self._metrics[metric.name] = metric
+        return metric
+
+    def expose(self) -> str:
+        """Render all registered metrics in the Prometheus text format"""
+        return (
+            "\n".join(
+                line for metric in self._metrics.values() for line in metric.expose()
+            )
+            + "\n"
+        )
+
+
+REGISTRY = Registry()
+
+READY = REGISTRY.register(Gauge("scripty_ready", "Whether the bot has fully started"))
+HEARTBEAT_LATENCY = REGISTRY.register(
+    Gauge("scripty_heartbeat_latency_seconds", "Mean gateway heartbeat latency")
+)
+COMMAND_LATENCY = REGISTRY.register(
+    Histogram(
+        "scripty_command_latency_seconds",
+        "Command execution latency",
+        ("command",),
+    )
+)
+COMMAND_INVOCATIONS = REGISTRY.register(
+    Counter("scripty_command_invocations_total", "Command invocations", ("command",))
+)
+COMMAND_ERRORS = REGISTRY.register(
+    Counter("scripty_command_errors_total", "Command errors", ("command",))
+)
+LISTENER_LATENCY = REGISTRY.register(
+    Histogram(
+        "scripty_listener_latency_seconds",
+        "Event listener execution latency",
+        ("listener",),
+    )
+)
+LISTENER_INVOCATIONS = REGISTRY.register(
+    Counter(
+        "scripty_listener_invocations_total", "Event listener calls", ("listener",)
+    )
+)
+LISTENER_ERRORS = REGISTRY.register(
+    Counter("scripty_listener_errors_total", "Event listener errors", ("listener",))
+)
+CACHE_SIZE = REGISTRY.register(
+    Gauge("scripty_cache_entries", "Number of entries per cache", ("cache",))
+)
+AUTOMOD_INFLIGHT = REGISTRY.register(
+    Gauge("scripty_automod_inflight", "Automod checks currently awaiting upstream")
+)
+LOOP_LAG = REGISTRY.register(
+    Histogram(
+        "scripty_loop_lag_seconds",
+        "Event loop scheduling lag",
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+    )
+)
+LOOP_STALLS = REGISTRY.register(
+    Counter("scripty_loop_stalls_total", "Event loop stalls past the threshold")
+)
+GATEWAY_SESSIONS = REGISTRY.register(
+    Counter(
+        "scripty_gateway_sessions_total",
+        "Shard starts by whether a stored session was resumed",
+        ("outcome",),
+    )
+)
+COMPONENT_INTERACTIONS = REGISTRY.register(
+    Counter(
+        "scripty_component_interactions_total",
+        "Component interactions routed by custom ID, per handler and result",
+        ("handler", "result"),
+    )
+)
+PREFETCH = REGISTRY.register(
+    Counter(
+        "scripty_prefetch_total",
+        "Prefetched results taken, or fetched on a miss, per buffer",
+        ("buffer", "result"),
+    )
+)
+TRANSLATION_CACHE = REGISTRY.register(
+    Counter(
+        "scripty_translation_cache_lookups_total",
+        "Translation cache lookups by the tier they were answered from",
+        ("result",),
+    )
+)
+TRANSLATIONS_SKIPPED = REGISTRY.register(
+    Counter(
+        "scripty_translations_skipped_total",
+        "Translations skipped as the text was already in the target language",
+    )
+)
+UPSTREAM_REQUESTS = REGISTRY.register(
+    Counter(
+        "scripty_upstream_requests_total",
+        "Requests made to upstream HTTP services",
+        ("host", "status"),
+    )
+)
+UPSTREAM_LATENCY = REGISTRY.register(
+    Histogram(
+        "scripty_upstream_latency_seconds",
+        "Upstream request latency including retries",
+        ("service",),
+    )
+)
+UPSTREAM_RETRIES = REGISTRY.register(
+    Counter(
+        "scripty_upstream_retries_total", "Retried upstream requests", ("service",)
+    )
+)
+UPSTREAM_HEDGES = REGISTRY.register(
+    Counter(
+        "scripty_upstream_hedges_total", "Hedged upstream requests", ("service",)
+    )
+)
+
+
+async def _on_request_end(
+    _: aiohttp.ClientSession,
+    __: types.SimpleNamespace,
+    params: aiohttp.TraceRequestEndParams,
+) -> None:
+    UPSTREAM_REQUESTS.inc(params.url.host or "", str(params.response.status))
+
+
+async def _on_request_exception(
+    _: aiohttp.ClientSession,
+    __: types.SimpleNamespace,
+    params: aiohttp.TraceRequestExceptionParams,
+) -> None:
+    UPSTREAM_REQUESTS.inc(params.url.host or "", "error")
+
+
+def upstream_trace_config() -> aiohttp.TraceConfig:
+    """Create a trace config which counts requests made by a client session
+
+    Returns
+    -------
+    aiohttp.TraceConfig
+        The trace config to pass to ``aiohttp.ClientSession``
+    """
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_end.append(_on_request_end)
+    trace_config.on_request_exception.append(_on_request_exception)
+    return trace_config
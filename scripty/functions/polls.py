@@ -0,0 +1,497 @@
+"""Polls voted on with buttons and tallied in a shared database"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("NUMBERS", "Poll", "PollBoard")
+
+import asyncio
+import contextlib
+import datetime
+import json
+import logging
+import pathlib
+import sqlite3
+import threading
+import time
+from typing import Any, Iterator, Sequence
+
+import hikari
+
+from scripty.functions import components, embeds, helpers, metrics, timers
+
+_LOGGER = logging.getLogger("scripty.polls")
+
+NUMBERS: tuple[str, ...] = (
+    "1️⃣",
+    "2️⃣",
+    "3️⃣",
+    "4️⃣",
+    "5️⃣",
+    "6️⃣",
+    "7️⃣",
+    "8️⃣",
+    "9️⃣",
+    "🔟",
+)
+"""The emojis the options of a poll are numbered with"""
+_BAR_WIDTH = 12
+_ROW_WIDTH = 5
+_POLL_COLUMNS = "message_id, channel_id, author, topic, options, closes_at"
+
+
+class Poll:
+    """The options of a poll and its tallies when last read
+
+    Parameters
+    ----------
+    message_id : int
+        The message the poll is shown in
+    channel_id : int
+        The channel of the message
+    author : int
+        The ID of the user who may close the poll
+    topic : str
+        The question of the poll
+    options : Sequence[str]
+        The answers to vote for
+    closes_at : float
+        The Unix time at which voting ends
+    counts : Sequence[int] | None
+        The votes for each option
+    """
+
+    __slots__ = (
+        "author",
+        "channel_id",
+        "closes_at",
+        "counts",
+        "message_id",
+        "options",
+        "topic",
+    )
+
+    def __init__(
+        self,
+        message_id: int,
+        channel_id: int,
+        author: int,
+        topic: str,
+        options: Sequence[str],
+        closes_at: float,
+        counts: Sequence[int] | None = None,
+    ) -> None:
+        self.message_id = message_id
+        self.channel_id = channel_id
+        self.author = author
+        self.topic = topic
+        self.options = tuple(options)
+        self.closes_at = closes_at
+        self.counts = list(counts) if counts is not None else [0] * len(self.options)
+
+    def embed(self, *, closed: bool = False) -> embeds.Embed:
+        """Render the tallies of the poll"""
+        total = sum(self.counts)
+        lines: list[str] = []
+
+        for number, option, count in zip(NUMBERS, self.options, self.counts):
+            share = count / total if total else 0.0
+            bar = "█" * round(share * _BAR_WIDTH)
+            lines.append(
+                f"{number} {option}\n" f"`{bar:░<{_BAR_WIDTH}}` {count} ({share:.0%})"
+            )
+
+        closes_at = datetime.datetime.fromtimestamp(
+            self.closes_at, datetime.timezone.utc
+        )
+        lines.append(
+            f"{total} votes, "
+            + (
+                "closed"
+                if closed
+                else f"closes {helpers.discord_timestamp(closes_at, 'R')}"
+            )
+        )
+
+        return embeds.Embed(title=self.topic, description="\n\n".join(lines))
+
+    def buttons(self) -> list[hikari.api.ComponentBuilder]:
+        """Build the buttons to vote and close the poll with"""
+        rows: list[hikari.api.ComponentBuilder] = []
+
+        for start in range(0, len(self.options), _ROW_WIDTH):
+            row = hikari.impl.ActionRowBuilder()
+
+            for option in range(start, min(start + _ROW_WIDTH, len(self.options))):
+                row.add_button(
+                    hikari.ButtonStyle.SECONDARY,
+                    components.ROUTER.custom_id("poll", option),
+                ).set_emoji(NUMBERS[option]).add_to_container()
+
+            rows.append(row)
+
+        rows.append(
+            hikari.impl.ActionRowBuilder()
+            .add_button(
+                hikari.ButtonStyle.DANGER,
+                components.ROUTER.custom_id("poll-close", self.author),
+            )
+            .set_label("Close")
+            .add_to_container()
+        )
+        return rows
+
+
+def _poll_from_row(row: tuple[Any, ...]) -> Poll:
+    message_id, channel_id, author, topic, options, closes_at = row
+    return Poll(message_id, channel_id, author, topic, json.loads(options), closes_at)
+
+
+class PollBoard:
+    """The open polls, whose messages are edited at most once per debounce
+
+    Votes are kept in a SQLite database, which is the only copy of the
+    tallies, so every process sharing the file counts the votes of every
+    poll. A vote schedules an edit of its poll's message, so a burst of votes
+    costs a single edit per process, and the edit reads the tallies from the
+    database. Closed polls keep their final tallies, and open polls are
+    restored after a restart.
+
+    Parameters
+    ----------
+    rest : hikari.api.RESTClient
+        The client poll messages are edited with
+    path : pathlib.Path | None
+        The database file shared by every process, ``None`` to keep the polls
+        in memory for this process only
+    debounce : float
+        Seconds between the first vote and the edit showing it
+    """
+
+    def __init__(
+        self,
+        rest: hikari.api.RESTClient,
+        *,
+        path: pathlib.Path | None = None,
+        debounce: float = 2.0,
+    ) -> None:
+        self.rest = rest
+        self.debounce = debounce
+        self._open: dict[int, Poll] = {}
+        self._timers = timers.TimerWheel(tick=1.0)
+        self._edits: dict[int, timers.Timer] = {}
+        self._closes: dict[int, timers.Timer] = {}
+        self._lock = threading.Lock()
+
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Transactions are begun explicitly, to hold the write lock between
+        # checking a poll is open and counting a vote for it
+        self._db: sqlite3.Connection | None = sqlite3.connect(
+            path or ":memory:", check_same_thread=False, isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS polls ("
+            "message_id INTEGER PRIMARY KEY, channel_id INTEGER, author INTEGER,"
+            " topic TEXT, options TEXT, closes_at REAL, closed INTEGER)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS votes ("
+            "message_id INTEGER, voter INTEGER, option INTEGER,"
+            " PRIMARY KEY (message_id, voter)) WITHOUT ROWID"
+        )
+
+        metrics.CACHE_SIZE.set_function(lambda: len(self._open), "polls.open")
+
+    async def get(self, message_id: int) -> Poll | None:
+        """Get an open poll by the ID of its message
+
+        A poll opened by another process is read from the database.
+        """
+        if (poll := self._open.get(message_id)) is not None:
+            return poll
+
+        poll = await asyncio.to_thread(self._select_poll, message_id)
+
+        # Checked again as the poll may have been read meanwhile
+        if poll is not None and message_id not in self._open:
+            self._track(poll)
+
+        return self._open.get(message_id)
+
+    async def start(self) -> None:
+        """Restore the polls which are still open, to close them in time"""
+        for poll in await asyncio.to_thread(self._select_open):
+            self._track(poll)
+
+    async def open(self, poll: Poll) -> None:
+        """Start accepting votes for a poll
+
+        Parameters
+        ----------
+        poll : Poll
+            The poll, whose message has been sent
+        """
+        await asyncio.to_thread(self._insert, poll)
+        self._track(poll)
+
+    async def vote(self, poll: Poll, voter: int, option: int) -> int | None:
+        """Vote for an option, or withdraw the vote when voting for it again
+
+        The vote shows once the message of the poll is next edited.
+
+        Parameters
+        ----------
+        poll : Poll
+            The poll to vote in
+        voter : int
+            The ID of the user voting
+        option : int
+            The index of the option voted for
+
+        Returns
+        -------
+        int | None
+            The option the user now votes for, or None if withdrawn
+
+        Raises
+        ------
+        KeyError
+            If the poll was closed, possibly by another process
+        """
+        option = await asyncio.to_thread(self._vote, poll.message_id, voter, option)
+
+        if poll.message_id not in self._edits:
+            self._edits[poll.message_id] = self._timers.schedule(
+                self.debounce, lambda: self._edit(poll)
+            )
+
+        return option
+
+    async def close_poll(self, message_id: int, *, edit: bool = True) -> Poll | None:
+        """Stop accepting votes and show the final tallies
+
+        Parameters
+        ----------
+        message_id : int
+            The message of the poll
+        edit : bool
+            Whether to edit the message to show the final tallies, which is
+            not needed when responding to an interaction on it
+
+        Returns
+        -------
+        Poll | None
+            The closed poll, or None if it was not open
+        """
+        if (poll := await self.get(message_id)) is None:
+            return None
+
+        self._forget(poll)
+
+        # Only the process closing it first shows the final tallies
+        if (counts := await asyncio.to_thread(self._close, poll)) is None:
+            return None
+
+        poll.counts = counts
+
+        if edit:
+            await self._show_closed(poll)
+
+        return poll
+
+    async def close(self) -> None:
+        """Show the votes not edited in yet and stop the timers
+
+        The open polls are restored by `start` after a restart.
+        """
+        pending = [self._open[message_id] for message_id in self._edits]
+
+        for timer in (*self._edits.values(), *self._closes.values()):
+            timer.cancel()
+
+        self._edits.clear()
+        self._closes.clear()
+
+        for poll in pending:
+            await self._edit(poll)
+
+        metrics.CACHE_SIZE.remove_function("polls.open")
+
+        if self._db is not None:
+            with self._lock:
+                self._db.close()
+            self._db = None
+
+    def _track(self, poll: Poll) -> None:
+        self._open[poll.message_id] = poll
+        self._closes[poll.message_id] = self._timers.schedule(
+            poll.closes_at - time.time(), lambda: self.close_poll(poll.message_id)
+        )
+
+    def _forget(self, poll: Poll) -> None:
+        self._open.pop(poll.message_id, None)
+
+        for pending in (self._edits, self._closes):
+            if (timer := pending.pop(poll.message_id, None)) is not None:
+                timer.cancel()
+
+    async def _edit(self, poll: Poll) -> None:
+        self._edits.pop(poll.message_id, None)
+
+        if poll.message_id not in self._open:
+            return
+
+        poll.counts, closed = await asyncio.to_thread(self._select_counts, poll)
+
+        # Closed by another process, which showed the final tallies
+        if closed:
+            self._forget(poll)
+            return
+
+        try:
+            await self.rest.edit_message(
+                poll.channel_id, poll.message_id, embed=poll.embed()
+            )
+        except hikari.NotFoundError:
+            # The message was deleted, so nobody can vote any more
+            self._forget(poll)
+            await asyncio.to_thread(self._close, poll)
+            return
+        except hikari.HTTPError as exc:
+            _LOGGER.warning("failed to edit poll %s: %r", poll.message_id, exc)
+
+        # Closing the poll meanwhile, here or in another process, showed the
+        # final tallies before this edit replaced them
+        poll.counts, closed = await asyncio.to_thread(self._select_counts, poll)
+
+        if closed:
+            self._forget(poll)
+            await self._show_closed(poll)
+
+    async def _show_closed(self, poll: Poll) -> None:
+        try:
+            await self.rest.edit_message(
+                poll.channel_id,
+                poll.message_id,
+                embed=poll.embed(closed=True),
+                components=[],
+            )
+        except hikari.HTTPError as exc:
+            _LOGGER.warning("failed to show closed poll %s: %r", poll.message_id, exc)
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        if self._db is None:
+            raise RuntimeError("the poll board is closed")
+
+        with self._lock:
+            # Takes the write lock at once, which other processes wait for
+            self._db.execute("BEGIN IMMEDIATE")
+
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+            self._db.execute("COMMIT")
+
+    def _insert(self, poll: Poll) -> None:
+        with self._transaction() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO polls VALUES (?, ?, ?, ?, ?, ?, 0)",
+                (
+                    poll.message_id,
+                    poll.channel_id,
+                    poll.author,
+                    poll.topic,
+                    json.dumps(poll.options),
+                    poll.closes_at,
+                ),
+            )
+
+    def _vote(self, message_id: int, voter: int, option: int) -> int | None:
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT closed FROM polls WHERE message_id = ?", (message_id,)
+            ).fetchone()
+
+            if row is None or row[0]:
+                raise KeyError(message_id)
+
+            previous = db.execute(
+                "SELECT option FROM votes WHERE message_id = ? AND voter = ?",
+                (message_id, voter),
+            ).fetchone()
+
+            if previous is not None and previous[0] == option:
+                db.execute(
+                    "DELETE FROM votes WHERE message_id = ? AND voter = ?",
+                    (message_id, voter),
+                )
+                return None
+
+            db.execute(
+                "INSERT OR REPLACE INTO votes VALUES (?, ?, ?)",
+                (message_id, voter, option),
+            )
+            return option
+
+    def _close(self, poll: Poll) -> list[int] | None:
+        with self._transaction() as db:
+            closed = db.execute(
+                "UPDATE polls SET closed = 1 WHERE message_id = ? AND NOT closed",
+                (poll.message_id,),
+            ).rowcount
+
+        if not closed:
+            return None
+
+        counts, _ = self._select_counts(poll)
+        return counts
+
+    def _select_counts(self, poll: Poll) -> tuple[list[int], bool]:
+        if self._db is None:
+            raise RuntimeError("the poll board is closed")
+
+        counts = [0] * len(poll.options)
+
+        with self._lock:
+            rows: list[tuple[int, int]] = self._db.execute(
+                "SELECT option, COUNT(*) FROM votes WHERE message_id = ?"
+                " GROUP BY option",
+                (poll.message_id,),
+            ).fetchall()
+            closed = self._db.execute(
+                "SELECT closed FROM polls WHERE message_id = ?", (poll.message_id,)
+            ).fetchone()
+
+        for option, count in rows:
+            counts[option] = count
+
+        return counts, closed is None or bool(closed[0])
+
+    def _select_open(self) -> list[Poll]:
+        if self._db is None:
+            raise RuntimeError("the poll board is closed")
+
+        with self._lock:
+            rows: list[tuple[Any, ...]] = self._db.execute(
+                f"SELECT {_POLL_COLUMNS} FROM polls WHERE NOT closed"
+            ).fetchall()
+
+        return [_poll_from_row(row) for row in rows]
+
+    def _select_poll(self, message_id: int) -> Poll | None:
+        if self._db is None:
+            raise RuntimeError("the poll board is closed")
+
+        with self._lock:
+            row: tuple[Any, ...] | None = self._db.execute(
+                f"SELECT {_POLL_COLUMNS} FROM polls"
+                " WHERE message_id = ? AND NOT closed",
+                (message_id,),
+            ).fetchone()
+
+        return None if row is None else _poll_from_row(row)
@@ -0,0 +1,130 @@
+"""Buffers of upstream results fetched ahead of the commands using them"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("PrefetchBuffer",)
+
+import asyncio
+import collections
+import logging
+import time
+from typing import Awaitable, Callable, Generic, TypeVar
+
+from scripty.functions import metrics, upstream
+
+_LOGGER = logging.getLogger("scripty.prefetch")
+
+_T = TypeVar("_T")
+
+
+class PrefetchBuffer(Generic[_T]):
+    """A small queue of ready results from an upstream with random results
+
+    Taking a result below the low water mark starts refilling the queue in
+    the background, so that the next command is answered from memory. After
+    an upstream error nothing is refilled until the backoff has passed.
+
+    Parameters
+    ----------
+    name : str
+        The name the buffer is labelled with in metrics
+    fetch : Callable[[upstream.UpstreamClient], Awaitable[_T]]
+        Fetches a single result
+    size : int
+        Results to keep ready
+    low_water : int
+        Refill once fewer results than this are ready
+    max_age : float | None
+        Seconds after which a ready result is dropped, ``None`` to keep ready
+        results until taken. As every expired result is refilled on the next
+        call, a buffer called less often than this refills on every call.
+    backoff : float
+        Seconds to stop refilling for after an error
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[upstream.UpstreamClient], Awaitable[_T]],
+        *,
+        size: int = 5,
+        low_water: int = 2,
+        max_age: float | None = None,
+        backoff: float = 60.0,
+    ) -> None:
+        self.name = name
+        self.fetch = fetch
+        self.size = size
+        self.low_water = low_water
+        self.max_age = max_age
+        self.backoff = backoff
+        self._ready: collections.deque[tuple[float, _T]] = collections.deque()
+        self._refill: asyncio.Task[None] | None = None
+        self._paused_until = 0.0
+
+    def __len__(self) -> int:
+        return len(self._ready)
+
+    async def get(self, client: upstream.UpstreamClient) -> _T:
+        """Take a ready result, or fetch one if there is none
+
+        Parameters
+        ----------
+        client : upstream.UpstreamClient
+            The client to fetch and refill with
+
+        Returns
+        -------
+        _T
+            A result no other caller received
+        """
+        if self.max_age is not None:
+            now = time.monotonic()
+
+            while self._ready and now - self._ready[0][0] > self.max_age:
+                self._ready.popleft()
+
+        if not self._ready:
+            metrics.PREFETCH.inc(self.name, "miss")
+            self._start_refill(client)
+            return await self.fetch(client)
+
+        metrics.PREFETCH.inc(self.name, "hit")
+        _, result = self._ready.popleft()
+
+        if len(self._ready) < self.low_water:
+            self._start_refill(client)
+
+        return result
+
+    def _start_refill(self, client: upstream.UpstreamClient) -> None:
+        if self._refill is None and time.monotonic() >= self._paused_until:
+            self._refill = asyncio.create_task(
+                self._fill(client), name=f"prefetch {self.name}"
+            )
+
+    async def _fill(self, client: upstream.UpstreamClient) -> None:
+        try:
+            while len(self._ready) < self.size:
+                missing = self.size - len(self._ready)
+                results = await asyncio.gather(
+                    *(self.fetch(client) for _ in range(missing)),
+                    return_exceptions=True,
+                )
+                now = time.monotonic()
+
+                for result in results:
+                    if isinstance(result, BaseException):
+                        if not isinstance(result, Exception):
+                            raise result
+
+                        _LOGGER.warning(
+                            "pausing %s prefetch after an error: %r", self.name, result
+                        )
+                        self._paused_until = now + self.backoff
+                    else:
+                        self._ready.append((now, result))
+
+                if self._paused_until > now:
+                    return
+        finally:
+            self._refill = None
@@ -0,0 +1,234 @@
+"""Cache-first resolution of Discord entities"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("Resolver",)
+
+from typing import Mapping
+
+import hikari
+
+from scripty.functions import cache
+
+
+class Resolver:
+    """Resolve guilds, members, roles and channels from the gateway cache
+
+    Anything missing from the gateway cache is fetched over REST and kept in a
+    short-lived cache, so that repeated lookups of the same entity only cost
+    a single round trip per time to live.
+
+    Parameters
+    ----------
+    gateway_cache : hikari.api.Cache | None
+        The gateway cache to resolve from first, ``None`` when serving HTTP
+        interactions without a gateway
+    rest : hikari.api.RESTClient
+        The REST client to fall back to
+    ttl : float
+        Seconds to keep REST fallback results, defaults to 60 seconds
+    cache_len : int
+        Maximum number of REST fallback results kept per entity type
+    """
+
+    def __init__(
+        self,
+        gateway_cache: hikari.api.Cache | None,
+        rest: hikari.api.RESTClient,
+        *,
+        ttl: float = 60.0,
+        cache_len: int = 1000,
+    ) -> None:
+        self.gateway_cache = gateway_cache
+        self.rest = rest
+        self._guilds: cache.TTLCache[hikari.Snowflake, hikari.RESTGuild] = (
+            cache.TTLCache(ttl=ttl, cache_len=cache_len)
+        )
+        self._members: cache.TTLCache[
+            tuple[hikari.Snowflake, hikari.Snowflake], hikari.Member
+        ] = cache.TTLCache(ttl=ttl, cache_len=cache_len)
+        self._channels: cache.TTLCache[hikari.Snowflake, hikari.PartialChannel] = (
+            cache.TTLCache(ttl=ttl, cache_len=cache_len)
+        )
+        self._guild_channels: cache.TTLCache[
+            hikari.Snowflake, Mapping[hikari.Snowflake, hikari.GuildChannel]
+        ] = cache.TTLCache(ttl=ttl, cache_len=cache_len)
+        self._guild_count: cache.TTLCache[None, int] = cache.TTLCache(
+            ttl=ttl, cache_len=1
+        )
+        self._me: cache.TTLCache[None, hikari.OwnUser] = cache.TTLCache(
+            ttl=ttl, cache_len=1
+        )
+
+    async def me(self) -> hikari.OwnUser:
+        """Resolve the bot's own user"""
+        if self.gateway_cache and (cached := self.gateway_cache.get_me()):
+            return cached
+
+        if fetched := self._me.get(None):
+            return fetched
+
+        fetched = await self.rest.fetch_my_user()
+        self._me.set(None, fetched)
+        return fetched
+
+    async def guild(
+        self, guild: hikari.SnowflakeishOr[hikari.PartialGuild]
+    ) -> hikari.Guild:
+        """Resolve a guild
+
+        Parameters
+        ----------
+        guild : hikari.SnowflakeishOr[hikari.PartialGuild]
+            The guild to resolve
+
+        Returns
+        -------
+        hikari.Guild
+            The cached gateway guild, otherwise the guild fetched over REST
+        """
+        guild_id = hikari.Snowflake(guild)
+
+        if self.gateway_cache and (cached := self.gateway_cache.get_guild(guild_id)):
+            return cached
+
+        if fetched := self._guilds.get(guild_id):
+            return fetched
+
+        fetched = await self.rest.fetch_guild(guild_id)
+        self._guilds.set(guild_id, fetched)
+        return fetched
+
+    async def member(
+        self,
+        guild: hikari.SnowflakeishOr[hikari.PartialGuild],
+        user: hikari.SnowflakeishOr[hikari.PartialUser],
+    ) -> hikari.Member | None:
+        """Resolve a member of a guild
+
+        Parameters
+        ----------
+        guild : hikari.SnowflakeishOr[hikari.PartialGuild]
+            The guild the member is in
+        user : hikari.SnowflakeishOr[hikari.PartialUser]
+            The user to resolve the member of
+
+        Returns
+        -------
+        hikari.Member
+            The resolved member
+        None
+            If the user is not a member of the guild
+        """
+        key = (hikari.Snowflake(guild), hikari.Snowflake(user))
+
+        if self.gateway_cache and (cached := self.gateway_cache.get_member(*key)):
+            return cached
+
+        if fetched := self._members.get(key):
+            return fetched
+
+        try:
+            fetched = await self.rest.fetch_member(*key)
+        except hikari.NotFoundError:
+            return None
+
+        self._members.set(key, fetched)
+        return fetched
+
+    async def owner(self, guild: hikari.Guild) -> hikari.Member | None:
+        """Resolve the owner of a guild"""
+        return await self.member(guild.id, guild.owner_id)
+
+    def roles(self, guild: hikari.Guild) -> Mapping[hikari.Snowflake, hikari.Role]:
+        """Get the roles of a resolved guild without any further requests"""
+        if isinstance(guild, hikari.RESTGuild):
+            return guild.roles
+
+        return guild.get_roles()
+
+    def emojis(
+        self, guild: hikari.Guild
+    ) -> Mapping[hikari.Snowflake, hikari.KnownCustomEmoji]:
+        """Get the emojis of a resolved guild without any further requests"""
+        if isinstance(guild, hikari.RESTGuild):
+            return guild.emojis
+
+        return guild.get_emojis()
+
+    async def channels(
+        self, guild: hikari.Guild
+    ) -> Mapping[hikari.Snowflake, hikari.GuildChannel]:
+        """Resolve the channels of a resolved guild"""
+        if channels := guild.get_channels():
+            return channels
+
+        if fetched := self._guild_channels.get(guild.id):
+            return fetched
+
+        fetched = {
+            channel.id: channel
+            for channel in await self.rest.fetch_guild_channels(guild.id)
+        }
+        self._guild_channels.set(guild.id, fetched)
+        return fetched
+
+    async def member_counts(self, guild: hikari.Guild) -> tuple[int | None, int | None]:
+        """Resolve the approximate active and total member counts of a guild
+
+        Gateway guilds already know their total member count, so the
+        approximate counts are only fetched when that is missing.
+
+        Returns
+        -------
+        tuple[int | None, int | None]
+            The approximate active member count, if known, and the member count
+        """
+        if isinstance(guild, hikari.GatewayGuild) and guild.member_count is not None:
+            return None, guild.member_count
+
+        if not isinstance(guild, hikari.RESTGuild):
+            guild = self._guilds.get(guild.id) or await self.rest.fetch_guild(guild.id)
+            self._guilds.set(guild.id, guild)
+
+        return guild.approximate_active_member_count, guild.approximate_member_count
+
+    async def channel(
+        self, channel: hikari.SnowflakeishOr[hikari.PartialChannel]
+    ) -> hikari.PartialChannel:
+        """Resolve a channel
+
+        Parameters
+        ----------
+        channel : hikari.SnowflakeishOr[hikari.PartialChannel]
+            The channel to resolve
+
+        Returns
+        -------
+        hikari.PartialChannel
+            The cached guild channel, otherwise the channel fetched over REST
+        """
+        channel_id = hikari.Snowflake(channel)
+
+        if self.gateway_cache and (
+            cached := self.gateway_cache.get_guild_channel(channel_id)
+        ):
+            return cached
+
+        if fetched := self._channels.get(channel_id):
+            return fetched
+
+        fetched = await self.rest.fetch_channel(channel_id)
+        self._channels.set(channel_id, fetched)
+        return fetched
+
+    async def guild_count(self) -> int:
+        """Resolve the number of guilds the bot is in"""
+        if self.gateway_cache and (count := len(self.gateway_cache.get_guilds_view())):
+            return count
+
+        if (count := self._guild_count.get(None)) is not None:
+            return count
+
+        count = await self.rest.fetch_my_guilds().count()
+        self._guild_count.set(None, count)
+        return count
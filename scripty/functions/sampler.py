@@ -0,0 +1,179 @@
+"""Background sampling of process and host system metrics"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("Sample", "Summary", "SystemSampler")
+
+import asyncio
+import collections
+import gc
+import logging
+import os
+import time
+from typing import Literal, NamedTuple
+
+import psutil
+
+_LOGGER = logging.getLogger("scripty.sampler")
+
+SampleField = Literal[
+    "cpu_percent", "rss", "open_fds", "tasks", "gc_collections", "memory_used"
+]
+
+
+class Sample(NamedTuple):
+    """A single point in time reading of system metrics"""
+
+    timestamp: float
+    cpu_percent: float
+    rss: int
+    open_fds: int
+    tasks: int
+    gc_counts: tuple[int, int, int]
+    gc_collections: int
+    memory_used: int
+    memory_total: int
+
+
+class Summary(NamedTuple):
+    """The minimum, average and maximum of a field over a window"""
+
+    minimum: float
+    average: float
+    maximum: float
+
+
+class SystemSampler:
+    """Samples system metrics on an interval into a fixed-size ring buffer
+
+    All blocking ``psutil`` calls are run in the default executor so that
+    readers, such as commands, only ever look at already recorded samples.
+
+    Parameters
+    ----------
+    interval : float
+        Seconds between each sample, defaults to 5 seconds
+    history : float
+        Seconds of samples to retain, defaults to 1 hour
+    """
+
+    def __init__(self, *, interval: float = 5.0, history: float = 3600.0) -> None:
+        self.interval = interval
+        self.boot_time = psutil.boot_time()
+        self._process = psutil.Process()
+        self._samples: collections.deque[Sample] = collections.deque(
+            maxlen=max(1, int(history // interval))
+        )
+        self._task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    @property
+    def latest(self) -> Sample | None:
+        """The most recently recorded sample, if any"""
+        return self._samples[-1] if self._samples else None
+
+    def start(self) -> None:
+        """Start sampling in the background on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="system sampler")
+
+    async def close(self) -> None:
+        """Stop sampling"""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
+
+    def record(self, sample: Sample) -> None:
+        """Append a sample to the ring buffer, evicting the oldest if full"""
+        self._samples.append(sample)
+
+    def summarize(self, field: SampleField, window: float) -> Summary | None:
+        """Summarize a sample field over the trailing window
+
+        Parameters
+        ----------
+        field : SampleField
+            The name of the sample field to summarize
+        window : float
+            The number of seconds to look back from the latest sample
+
+        Returns
+        -------
+        Summary
+            The minimum, average and maximum of the field
+        None
+            If there are no samples recorded
+        """
+        if not self._samples:
+            return None
+
+        cutoff = self._samples[-1].timestamp - window
+        values: list[float] = []
+
+        for sample in reversed(self._samples):
+            if sample.timestamp < cutoff:
+                break
+            values.append(getattr(sample, field))
+
+        return Summary(min(values), sum(values) / len(values), max(values))
+
+    def _collect(self) -> tuple[float, int, int, int, int]:
+        with self._process.oneshot():
+            cpu_percent = self._process.cpu_percent(interval=None)
+            rss = self._process.memory_info().rss
+            open_fds = (
+                self._process.num_handles()
+                if os.name == "nt"
+                else self._process.num_fds()
+            )
+
+        memory = psutil.virtual_memory()
+
+        return cpu_percent, rss, open_fds, memory.used, memory.total
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        # The first cpu_percent call always returns a meaningless 0.0
+        # so prime it before the first recorded sample
+        try:
+            await loop.run_in_executor(None, self._collect)
+        except Exception:
+            _LOGGER.exception("failed to collect a system sample")
+
+        while True:
+            await asyncio.sleep(self.interval)
+
+            try:
+                cpu_percent, rss, open_fds, memory_used, memory_total = (
+                    await loop.run_in_executor(None, self._collect)
+                )
+            except Exception:
+                # A failed sample leaves a gap rather than ending sampling
+                _LOGGER.exception("failed to collect a system sample")
+                continue
+
+            gc_counts = gc.get_count()
+
+            self.record(
+                Sample(
+                    timestamp=time.monotonic(),
+                    cpu_percent=cpu_percent,
+                    rss=rss,
+                    open_fds=open_fds,
+                    tasks=len(asyncio.all_tasks(loop)),
+                    gc_counts=gc_counts,
+                    gc_collections=sum(s["collections"] for s in gc.get_stats()),
+                    memory_used=memory_used,
+                    memory_total=memory_total,
+                )
+            )
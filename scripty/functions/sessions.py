@@ -0,0 +1,375 @@
+"""Gateway sessions which are resumed across process restarts
+
+hikari closes shards with a close code that invalidates their session, so a
+restarted process has to identify every shard again. Shards here instead
+close with the resumable close code and store their session, which the next
+process resumes if it starts again soon enough.
+
+A resumed session is not sent the guild create events which fill the cache,
+so the guilds, channels, roles and emojis of the shard are fetched over REST
+after resuming instead. That costs two requests per guild, so resuming only
+pays off for small bots, such as restarts during development. A shard which
+had more than ``max_guilds`` guilds identifies again instead, which for the
+thousand or more guilds of a shard of a large bot is always the case.
+
+This relies on private attributes of ``hikari.impl.GatewayShardImpl`` and
+``hikari.GatewayBot``, so sessions are only resumed on the hikari version
+they were checked against, which is also the one pinned.
+"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = (
+    "ResumableGatewayBot",
+    "ResumableShard",
+    "Session",
+    "SessionStore",
+    "rebuild_cache",
+)
+
+import asyncio
+import datetime
+import json
+import logging
+import pathlib
+import time
+from typing import Any, Iterable, NamedTuple
+
+import attr
+import hikari
+from hikari.impl import shard as shard_impl
+
+from scripty.functions import metrics
+
+_LOGGER = logging.getLogger("scripty.sessions")
+
+# The resumable close code hikari uses for temporary disconnects
+_RESUME_CLOSE_CODE = 3000
+# The version the private attributes used here were checked against
+_HIKARI_VERSION = "2.0.0.dev112"
+
+
+class Session(NamedTuple):
+    """A gateway session a shard can resume"""
+
+    session_id: str
+    seq: int
+    resume_url: str
+    shard_count: int
+    closed_at: float
+    guild_ids: list[int]
+
+
+class SessionStore:
+    """Store the sessions of closed shards as one file per shard
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The directory to store the sessions in
+    max_age : float
+        Seconds after closing a session is still resumed
+    max_guilds : int
+        The most guilds a session may have for its cache to be rebuilt over
+        REST, sessions with more are not resumed
+    """
+
+    def __init__(
+        self, path: pathlib.Path, *, max_age: float = 180.0, max_guilds: int = 100
+    ) -> None:
+        self.path = path
+        self.max_age = max_age
+        self.max_guilds = max_guilds
+
+    def save(self, shard_id: int, session: Session) -> None:
+        """Store the session of a closed shard"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.path.joinpath(f"{shard_id}.json").write_text(json.dumps(session._asdict()))
+
+    def load(self, shard_id: int, shard_count: int) -> Session | None:
+        """Take the stored session of a shard, so that it is only resumed once
+
+        Parameters
+        ----------
+        shard_id : int
+            The ID of the shard
+        shard_count : int
+            The shard count the shard is started with
+
+        Returns
+        -------
+        Session
+            The session to resume
+        None
+            If there is no session, it is too old or for another shard count, or
+            it has too many guilds to rebuild the cache of
+        """
+        file = self.path.joinpath(f"{shard_id}.json")
+
+        try:
+            session = Session(**json.loads(file.read_text()))
+        except (FileNotFoundError, TypeError, ValueError):
+            return None
+        finally:
+            file.unlink(missing_ok=True)
+
+        if session.shard_count != shard_count:
+            return None
+
+        if time.time() - session.closed_at > self.max_age:
+            return None
+
+        if len(session.guild_ids) > self.max_guilds:
+            _LOGGER.info(
+                "shard %s had %s guilds, identifying instead of resuming",
+                shard_id,
+                len(session.guild_ids),
+            )
+            return None
+
+        return session
+
+
+def _gateway_guild(guild: hikari.RESTGuild) -> hikari.GatewayGuild:
+    fields = {
+        field.name: getattr(guild, field.name) for field in attr.fields(hikari.Guild)
+    }
+    return hikari.GatewayGuild(
+        **fields,
+        is_large=None,
+        joined_at=None,
+        member_count=guild.approximate_member_count,
+    )
+
+
+async def rebuild_cache(
+    cache: hikari.api.MutableCache,
+    rest: hikari.api.RESTClient,
+    guild_ids: Iterable[int],
+) -> None:
+    """Fill the cache with what guild create events would have, over REST
+
+    Members are left out, as they are chunked on demand.
+
+    Parameters
+    ----------
+    cache : hikari.api.MutableCache
+        The cache of the bot
+    rest : hikari.api.RESTClient
+        The client to fetch the guilds with
+    guild_ids : Iterable[int]
+        The guilds of a resumed shard
+    """
+    # The ready event which caches the own user is not sent on resume either
+    cache.set_me(await rest.fetch_my_user())
+
+    for guild_id in guild_ids:
+        try:
+            guild = await rest.fetch_guild(guild_id)
+            guild_channels = await rest.fetch_guild_channels(guild_id)
+        except (hikari.ForbiddenError, hikari.NotFoundError):
+            # Left while the process was restarting
+            continue
+        except hikari.HTTPError as exc:
+            _LOGGER.warning(
+                "failed to rebuild the cache of guild %s: %r", guild_id, exc
+            )
+            continue
+
+        cache.set_guild(_gateway_guild(guild))
+
+        for role in guild.roles.values():
+            cache.set_role(role)
+
+        for emoji in guild.emojis.values():
+            cache.set_emoji(emoji)
+
+        for channel in guild_channels:
+            if isinstance(channel, hikari.PermissibleGuildChannel):
+                cache.set_guild_channel(channel)
+
+
+class ResumableShard(shard_impl.GatewayShardImpl):
+    """A shard which resumes a stored session and stores it again on close
+
+    Parameters
+    ----------
+    store : SessionStore
+        The store to resume sessions from and save them to
+    cache : hikari.api.Cache
+        The cache to find the guilds of the shard in when it closes
+    **kwargs : Any
+        Passed on to ``hikari.impl.GatewayShardImpl``
+    """
+
+    __slots__ = ("_cache", "_store", "resumed")
+
+    def __init__(
+        self, *, store: SessionStore, cache: hikari.api.Cache, **kwargs: Any
+    ) -> None:
+        super().__init__(**kwargs)
+        self._store = store
+        self._cache = cache
+        # The session resumed by start, whose guilds are not cached yet
+        self.resumed: Session | None = None
+
+    async def start(self) -> None:
+        session = self._store.load(self.id, self.shard_count)
+
+        if session is None:
+            metrics.GATEWAY_SESSIONS.inc("identified")
+            await super().start()
+            return
+
+        self._session_id = session.session_id
+        self._seq = session.seq
+        self._resume_gateway_url = session.resume_url
+        await super().start()
+
+        # An invalidated session is replaced by a new identify
+        if self._session_id == session.session_id:
+            self.resumed = session
+            metrics.GATEWAY_SESSIONS.inc("resumed")
+        else:
+            _LOGGER.info("shard %s could not resume, identified instead", self.id)
+            metrics.GATEWAY_SESSIONS.inc("invalidated")
+
+    async def close(self) -> None:
+        # Hidden from the keep alive task so it does not close the connection
+        # with a code which invalidates the session
+        ws, self._ws = self._ws, None
+        await super().close()
+
+        if ws is not None:
+            await ws.send_close(code=_RESUME_CLOSE_CODE, message=b"shard restarting")
+
+        if self._session_id and self._seq is not None and self._resume_gateway_url:
+            guild_ids = [
+                int(guild_id)
+                for guild_id in self._cache.get_guilds_view()
+                if hikari.snowflakes.calculate_shard_id(self.shard_count, guild_id)
+                == self.id
+            ]
+            self._store.save(
+                self.id,
+                Session(
+                    self._session_id,
+                    self._seq,
+                    self._resume_gateway_url,
+                    self.shard_count,
+                    time.time(),
+                    guild_ids,
+                ),
+            )
+
+
+class ResumableGatewayBot(hikari.GatewayBot):
+    """A gateway bot whose shards resume their sessions after a restart
+
+    Parameters
+    ----------
+    *args : Any
+        Passed on to ``hikari.GatewayBot``
+    store : SessionStore | None
+        The store shard sessions are kept in, ``None`` to behave like a plain
+        gateway bot. It is ignored on any hikari version but the checked one.
+    **kwargs : Any
+        Passed on to ``hikari.GatewayBot``
+    """
+
+    __slots__ = ("_rebuilds", "_session_store")
+
+    def __init__(self, *args: Any, store: SessionStore | None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+
+        if store is not None and hikari.__version__ != _HIKARI_VERSION:
+            _LOGGER.warning(
+                "not resuming sessions on hikari %s, only on %s",
+                hikari.__version__,
+                _HIKARI_VERSION,
+            )
+            store = None
+
+        self._session_store = store
+        self._rebuilds: set[asyncio.Task[None]] = set()
+
+    async def close(self) -> None:
+        for task in self._rebuilds:
+            task.cancel()
+
+        await super().close()
+
+    def _rebuild_done(self, task: asyncio.Task[None]) -> None:
+        self._rebuilds.discard(task)
+
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            _LOGGER.error("failed to rebuild the cache after resuming", exc_info=exc)
+
+    async def _start_one_shard(
+        self,
+        activity: hikari.Activity | None,
+        afk: bool,
+        idle_since: datetime.datetime | None,
+        status: hikari.Status,
+        large_threshold: int,
+        shard_id: int,
+        shard_count: int,
+        url: str,
+    ) -> None:
+        if self._session_store is None:
+            return await super()._start_one_shard(
+                activity=activity,
+                afk=afk,
+                idle_since=idle_since,
+                status=status,
+                large_threshold=large_threshold,
+                shard_id=shard_id,
+                shard_count=shard_count,
+                url=url,
+            )
+
+        # Mirrors hikari.GatewayBot._start_one_shard with a resumable shard
+        new_shard = ResumableShard(
+            store=self._session_store,
+            cache=self._cache,
+            http_settings=self._http_settings,
+            proxy_settings=self._proxy_settings,
+            event_manager=self._event_manager,
+            event_factory=self._event_factory,
+            intents=self._intents,
+            initial_activity=activity,
+            initial_is_afk=afk,
+            initial_idle_since=idle_since,
+            initial_status=status,
+            large_threshold=large_threshold,
+            shard_id=shard_id,
+            shard_count=shard_count,
+            token=self._token,
+            url=url,
+        )
+
+        try:
+            await new_shard.start()
+
+            if new_shard.is_alive:
+                self._shards[shard_id] = new_shard
+
+                if new_shard.resumed is not None:
+                    # In the background, as shards start one after another
+                    task = asyncio.create_task(
+                        rebuild_cache(
+                            self._cache, self._rest, new_shard.resumed.guild_ids
+                        ),
+                        name=f"shard {shard_id} cache rebuild",
+                    )
+                    self._rebuilds.add(task)
+                    task.add_done_callback(self._rebuild_done)
+
+                return
+
+            raise RuntimeError(f"shard {shard_id} shut down immediately when starting")
+
+        except Exception:
+            if new_shard.is_alive:
+                await new_shard.close()
+
+            raise
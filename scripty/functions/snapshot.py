@@ -0,0 +1,219 @@
+"""Registered caches which survive module reloads and restarts"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("REGISTRY", "SnapshotRegistry", "VERSION")
+
+import asyncio
+import json
+import logging
+import os
+import pathlib
+import time
+from typing import Any, Callable, Final, TypeVar
+
+from scripty.functions import cache
+
+_LOGGER = logging.getLogger("scripty.snapshot")
+
+_CacheT = TypeVar("_CacheT", bound="cache.TTLCache[Any, Any]")
+
+VERSION: Final[int] = 1
+"""Snapshots of any other format version are discarded on restore"""
+
+
+def _thaw(value: Any) -> Any:
+    # JSON has no tuples, which registered caches hold instead of lists
+    if isinstance(value, list):
+        return tuple(_thaw(item) for item in value)
+
+    return value
+
+
+class SnapshotRegistry:
+    """Caches whose entries are saved to and restored from a local file
+
+    The registry lives for the whole process, so modules which get their
+    caches from it with `get_or_create` keep them when they are reloaded.
+
+    Each entry is stored with its remaining time to live, and the time spent
+    between saving and restoring is deducted from it, so entries which
+    expired while the bot was down are discarded. Entries are stored as JSON,
+    so only caches of plain data, such as tuples of IDs and names, should be
+    registered. Keys and values come back with their lists as tuples.
+    """
+
+    def __init__(self) -> None:
+        self._caches: dict[str, cache.TTLCache[Any, Any]] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._path: pathlib.Path | None = None
+
+    def register(self, name: str, ttl_cache: cache.TTLCache[Any, Any]) -> None:
+        """Register a cache, replacing any cache of the same name
+
+        Parameters
+        ----------
+        name : str
+            The unique name of the cache within a snapshot
+        ttl_cache : cache.TTLCache[Any, Any]
+            The cache to snapshot
+        """
+        self._caches[name] = ttl_cache
+
+    def get_or_create(self, name: str, factory: Callable[[], _CacheT]) -> _CacheT:
+        """Get a registered cache, creating and registering it if missing
+
+        Parameters
+        ----------
+        name : str
+            The unique name of the cache, prefixed with the owning module
+        factory : Callable[[], _CacheT]
+            Creates the cache when it is not registered yet
+
+        Returns
+        -------
+        _CacheT
+            The cache registered under the name
+        """
+        if (existing := self._caches.get(name)) is None:
+            existing = self._caches[name] = factory()
+
+        return existing  # type: ignore[return-value]
+
+    def sizes(self, prefix: str = "") -> dict[str, int]:
+        """Get the number of entries of each registered cache
+
+        Parameters
+        ----------
+        prefix : str
+            Only include caches whose name starts with this
+
+        Returns
+        -------
+        dict[str, int]
+            The entry count per cache name
+        """
+        return {
+            name: len(ttl_cache)
+            for name, ttl_cache in self._caches.items()
+            if name.startswith(prefix)
+        }
+
+    def dumps(self) -> bytes:
+        """Serialize the unexpired entries of every registered cache"""
+        return json.dumps(
+            {
+                "version": VERSION,
+                "saved_at": time.time(),
+                "caches": {
+                    name: list(ttl_cache.items())
+                    for name, ttl_cache in self._caches.items()
+                },
+            },
+            separators=(",", ":"),
+        ).encode()
+
+    def loads(self, data: bytes) -> int:
+        """Restore entries into the registered caches
+
+        Parameters
+        ----------
+        data : bytes
+            A snapshot made by `dumps`
+
+        Returns
+        -------
+        int
+            The number of entries restored
+        """
+        snapshot = json.loads(data)
+
+        if snapshot.get("version") != VERSION:
+            return 0
+
+        elapsed = max(0.0, time.time() - snapshot["saved_at"])
+        restored = 0
+
+        for name, entries in snapshot["caches"].items():
+            if (ttl_cache := self._caches.get(name)) is None:
+                continue
+
+            for key, value, remaining in entries:
+                if remaining > elapsed:
+                    ttl_cache.set(_thaw(key), _thaw(value), ttl=remaining - elapsed)
+                    restored += 1
+
+        return restored
+
+    def save(self, path: pathlib.Path) -> None:
+        """Atomically write a snapshot to a file"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(".tmp")
+        temporary.write_bytes(self.dumps())
+        os.replace(temporary, path)
+
+    def restore(self, path: pathlib.Path) -> int:
+        """Restore a snapshot from a file, if there is a readable one
+
+        Returns
+        -------
+        int
+            The number of entries restored
+        """
+        try:
+            restored = self.loads(path.read_bytes())
+        except FileNotFoundError:
+            return 0
+        except Exception as exc:
+            # A snapshot which cannot be read for any reason is as good as none
+            _LOGGER.warning("discarding unreadable snapshot %s: %r", path, exc)
+            return 0
+
+        _LOGGER.info("restored %s cache entries from %s", restored, path)
+        return restored
+
+    def start(self, path: pathlib.Path, *, interval: float = 300.0) -> None:
+        """Restore a snapshot and then checkpoint to it periodically
+
+        Parameters
+        ----------
+        path : pathlib.Path
+            The file to restore from and save to
+        interval : float
+            Seconds between checkpoints
+        """
+        if self._task is not None:
+            return
+
+        self.restore(path)
+        self._path = path
+        self._task = asyncio.create_task(
+            self._checkpoint(path, interval), name="snapshot checkpoint"
+        )
+
+    async def close(self) -> None:
+        """Stop checkpointing and save a final snapshot"""
+        if self._task is None or self._path is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self.save(self._path)
+        self._task = None
+        self._path = None
+
+    async def _checkpoint(self, path: pathlib.Path, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+
+            try:
+                self.save(path)
+            except OSError as exc:
+                _LOGGER.warning("failed to checkpoint caches to %s: %r", path, exc)
+
+
+REGISTRY = SnapshotRegistry()
@@ -0,0 +1,152 @@
+"""A hashed timer wheel for many coarse timeouts"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("Timer", "TimerWheel")
+
+import asyncio
+import inspect
+import logging
+import math
+from typing import Any, Callable
+
+_LOGGER = logging.getLogger("scripty.timers")
+
+
+class Timer:
+    """A scheduled callback, which can be cancelled or rescheduled"""
+
+    __slots__ = ("callback", "_rounds", "_slot", "_wheel")
+
+    def __init__(self, wheel: TimerWheel, callback: Callable[[], Any]) -> None:
+        self.callback = callback
+        self._rounds = 0
+        self._slot: int | None = None
+        self._wheel = wheel
+
+    @property
+    def active(self) -> bool:
+        """Whether the timer is still waiting to fire"""
+        return self._slot is not None
+
+    def cancel(self) -> None:
+        """Stop the timer from firing"""
+        if self._slot is not None:
+            del self._wheel._slots[self._slot][self]
+            self._slot = None
+            self._wheel._count -= 1
+
+    def reschedule(self, delay: float) -> None:
+        """Fire the timer after ``delay`` seconds from now instead
+
+        Parameters
+        ----------
+        delay : float
+            Seconds from now after which the callback is called
+        """
+        self.cancel()
+        self._wheel._insert(self, delay)
+
+
+class TimerWheel:
+    """Timeouts kept in a ring of slots advanced by a single task
+
+    A timer is placed in the slot its deadline falls in, with the number of
+    full turns of the ring left before it is due, so scheduling and
+    cancelling are a dict insert and delete. Each tick only visits one slot.
+    Deadlines are rounded up to whole ticks, so a timer fires up to one tick
+    late. The ticking task only runs while timers are scheduled.
+
+    Parameters
+    ----------
+    tick : float
+        Seconds between each advance of the wheel
+    slots : int
+        Number of slots in the ring
+    """
+
+    def __init__(self, *, tick: float = 1.0, slots: int = 64) -> None:
+        self.tick = tick
+        self._slots: list[dict[Timer, None]] = [{} for _ in range(slots)]
+        self._cursor = 0
+        self._count = 0
+        self._task: asyncio.Task[None] | None = None
+        self._callbacks: set[asyncio.Task[Any]] = set()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def schedule(self, delay: float, callback: Callable[[], Any]) -> Timer:
+        """Call ``callback`` after ``delay`` seconds
+
+        Parameters
+        ----------
+        delay : float
+            Seconds from now after which the callback is called
+        callback : Callable[[], Any]
+            A function or coroutine function taking no arguments
+
+        Returns
+        -------
+        Timer
+            The handle to cancel or reschedule the timer with
+        """
+        timer = Timer(self, callback)
+        self._insert(timer, delay)
+        return timer
+
+    def _insert(self, timer: Timer, delay: float) -> None:
+        # The current tick is partly over, so one more is waited to not fire early
+        ticks = max(0, math.ceil(delay / self.tick)) + 1
+        timer._slot = (self._cursor + ticks) % len(self._slots)
+        # The slot is first visited within one turn, then once per turn
+        timer._rounds = (ticks - 1) // len(self._slots)
+        self._slots[timer._slot][timer] = None
+        self._count += 1
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="timer wheel")
+
+    def advance(self) -> None:
+        """Move to the next slot and fire the timers due in it"""
+        self._cursor = (self._cursor + 1) % len(self._slots)
+        slot = self._slots[self._cursor]
+        due: list[Timer] = []
+
+        for timer in slot:
+            if timer._rounds:
+                timer._rounds -= 1
+            else:
+                due.append(timer)
+
+        for timer in due:
+            timer.cancel()
+
+            try:
+                result = timer.callback()
+            except Exception:
+                _LOGGER.exception("timer callback %r failed", timer.callback)
+                continue
+
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                self._callbacks.add(task)
+                task.add_done_callback(self._callback_done)
+
+    def _callback_done(self, task: asyncio.Task[Any]) -> None:
+        self._callbacks.discard(task)
+
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            _LOGGER.error("timer callback failed", exc_info=exc)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+
+        try:
+            while self._count:
+                # Sleeping until a deadline keeps the ticks from drifting
+                deadline += self.tick
+                await asyncio.sleep(deadline - loop.time())
+                self.advance()
+        finally:
+            self._task = None
@@ -0,0 +1,602 @@
+"""Translation through a shared gpytranslate client"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = (
+    "LANGUAGES",
+    "TRANSLATE_SERVICE",
+    "Translation",
+    "TranslationCache",
+    "Translator",
+    "cache_key",
+    "parse",
+    "split",
+)
+
+import asyncio
+import bisect
+import hashlib
+import pathlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import TYPE_CHECKING, Any, AsyncIterator, Final, NamedTuple, Sequence, cast
+
+from scripty import errors
+from scripty.functions import cache, langid, metrics
+
+if TYPE_CHECKING:
+    import gpytranslate
+
+MAX_BATCH_CHARS: Final[int] = 4500
+"""The most characters of text packed into one translation request"""
+_BATCH_SEPARATOR: Final[str] = "\n\n"
+_BLANK_LINES: Final[re.Pattern[str]] = re.compile(r"\n\s*\n")
+
+TRANSLATE_SERVICE: Final[str] = "translate"
+"""The service translation latency is recorded under"""
+_TRANSLATE_HOST: Final[str] = "translate.google.com"
+
+LANGUAGES: Final[dict[str, str]] = {
+    "Afrikaans": "af",
+    "Albanian": "sq",
+    "Amharic": "am",
+    "Arabic": "ar",
+    "Armenian": "hy",
+    "Azerbaijani": "az",
+    "Basque": "eu",
+    "Belarusian": "be",
+    "Bengali": "bn",
+    "Bosnian": "bs",
+    "Bulgarian": "bg",
+    "Catalan": "ca",
+    "Cebuano": "ceb",
+    "Chinese (Simplified)": "zh-CN",
+    "Chinese (Traditional)": "zh-TW",
+    "Corsican": "co",
+    "Croatian": "hr",
+    "Czech": "cs",
+    "Danish": "da",
+    "Dutch": "nl",
+    "English": "en",
+    "Esperanto": "eo",
+    "Estonian": "et",
+    "Filipino": "tl",
+    "Finnish": "fi",
+    "French": "fr",
+    "Frisian": "fy",
+    "Galician": "gl",
+    "Georgian": "ka",
+    "German": "de",
+    "Greek": "el",
+    "Gujarati": "gu",
+    "Haitian Creole": "ht",
+    "Hausa": "ha",
+    "Hawaiian": "haw",
+    "Hebrew": "iw",
+    "Hindi": "hi",
+    "Hmong": "hmn",
+    "Hungarian": "hu",
+    "Icelandic": "is",
+    "Igbo": "ig",
+    "Indonesian": "id",
+    "Irish": "ga",
+    "Italian": "it",
+    "Japanese": "ja",
+    "Javanese": "jw",
+    "Kannada": "kn",
+    "Kazakh": "kk",
+    "Khmer": "km",
+    "Korean": "ko",
+    "Kurdish": "ku",
+    "Kyrgyz": "ky",
+    "Lao": "lo",
+    "Latin": "la",
+    "Latvian": "lv",
+    "Lithuanian": "lt",
+    "Luxembourgish": "lb",
+    "Macedonian": "mk",
+    "Malagasy": "mg",
+    "Malay": "ms",
+    "Malayalam": "ml",
+    "Maltese": "mt",
+    "Maori": "mi",
+    "Marathi": "mr",
+    "Mongolian": "mn",
+    "Myanmar (Burmese)": "my",
+    "Nepali": "ne",
+    "Norwegian": "no",
+    "Pashto": "ps",
+    "Persian": "fa",
+    "Polish": "pl",
+    "Portuguese": "pt",
+    "Punjabi": "pa",
+    "Romanian": "ro",
+    "Russian": "ru",
+    "Samoan": "sm",
+    "Scots Gaelic": "gd",
+    "Serbian": "sr",
+    "Sesotho": "st",
+    "Shona": "sn",
+    "Sindhi": "sd",
+    "Sinhala": "si",
+    "Slovak": "sk",
+    "Slovenian": "sl",
+    "Somali": "so",
+    "Spanish": "es",
+    "Sundanese": "su",
+    "Swahili": "sw",
+    "Swedish": "sv",
+    "Tajik": "tg",
+    "Tamil": "ta",
+    "Telugu": "te",
+    "Thai": "th",
+    "Turkish": "tr",
+    "Ukrainian": "uk",
+    "Urdu": "ur",
+    "Uzbek": "uz",
+    "Vietnamese": "vi",
+    "Welsh": "cy",
+    "Xhosa": "xh",
+    "Yiddish": "yi",
+    "Yoruba": "yo",
+    "Zulu": "zu",
+}
+"""The names of the languages the service translates between, mapped to codes"""
+
+
+class Translation(NamedTuple):
+    """A translated text and the language it was detected as"""
+
+    original: str
+    text: str
+    source: str
+    target: str
+
+
+def cache_key(text: str, source: str, target: str) -> bytes:
+    """Hash a text and its languages into a translation cache key
+
+    The text is normalized to NFC with runs of whitespace collapsed, so that
+    copies of a message which only differ in spacing share a key.
+
+    Parameters
+    ----------
+    text : str
+        The text to translate
+    source : str
+        The language to translate from
+    target : str
+        The language to translate to
+
+    Returns
+    -------
+    bytes
+        A 16 byte digest
+    """
+    normalized = " ".join(unicodedata.normalize("NFC", text).split())
+    return hashlib.blake2b(
+        f"{source}\0{target}\0{normalized}".encode(), digest_size=16
+    ).digest()
+
+
+class TranslationCache:
+    """Translations by content hash, in memory and optionally on disk
+
+    Recently used translations are kept in memory. The disk tier is a SQLite
+    database which survives restarts and can be shared by every worker, and
+    is only read on a memory miss from a worker thread.
+
+    Parameters
+    ----------
+    size : int
+        Maximum translations kept in memory
+    ttl : float
+        Seconds a translation is kept in memory
+    path : pathlib.Path | None
+        The database file of the disk tier, ``None`` to only cache in memory
+    max_rows : int
+        Maximum translations kept on disk, the oldest are deleted past this
+    """
+
+    def __init__(
+        self,
+        *,
+        size: int = 4096,
+        ttl: float = 86400.0,
+        path: pathlib.Path | None = None,
+        max_rows: int = 100_000,
+    ) -> None:
+        self.memory: cache.TTLCache[bytes, Translation] = cache.TTLCache(
+            ttl=ttl, cache_len=size
+        )
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._db: sqlite3.Connection | None = None
+
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key BLOB PRIMARY KEY, original TEXT, text TEXT, source TEXT,"
+                " target TEXT, created_at REAL)"
+            )
+
+        metrics.CACHE_SIZE.set_function(lambda: len(self.memory), "translate.memory")
+
+    async def get(self, key: bytes) -> Translation | None:
+        """Get a cached translation, promoting disk hits into memory"""
+        if (translation := self.memory.get(key)) is not None:
+            metrics.TRANSLATION_CACHE.inc("memory")
+            return translation
+
+        if self._db is not None:
+            translation = await asyncio.to_thread(self._select, key)
+
+            if translation is not None:
+                metrics.TRANSLATION_CACHE.inc("disk")
+                self.memory.set(key, translation)
+                return translation
+
+        metrics.TRANSLATION_CACHE.inc("miss")
+        return None
+
+    async def put(self, key: bytes, translation: Translation) -> None:
+        """Cache a translation in every tier"""
+        self.memory.set(key, translation)
+
+        if self._db is not None:
+            await asyncio.to_thread(self._insert, key, translation)
+
+    def close(self) -> None:
+        """Close the disk tier and stop reporting the size of the memory tier"""
+        metrics.CACHE_SIZE.remove_function("translate.memory")
+
+        if self._db is not None:
+            with self._lock:
+                self._db.close()
+            self._db = None
+
+    def _select(self, key: bytes) -> Translation | None:
+        assert self._db is not None
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT original, text, source, target FROM translations"
+                " WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+        return None if row is None else Translation(*row)
+
+    def _insert(self, key: bytes, translation: Translation) -> None:
+        assert self._db is not None
+
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+                (key, *translation, time.time()),
+            )
+            self._writes += 1
+
+            # Pruning is batched since it has to sort the table
+            if self._writes % 1000 == 0:
+                self._db.execute(
+                    "DELETE FROM translations WHERE key IN (SELECT key FROM"
+                    " translations ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,),
+                )
+
+
+class Translator:
+    """A long-lived gpytranslate client shared by the translate commands
+
+    The response to a translation includes the detected source language, so
+    detecting it takes no separate request. Each request is bounded by
+    ``timeout``, and its latency and outcome are recorded as upstream metrics
+    of the ``translate`` service. Text identified offline as being in the
+    target language already is not sent at all.
+
+    Parameters
+    ----------
+    backend : gpytranslate.Translator | None
+        The client to translate with, ``None`` to create one on first use
+    cache : TranslationCache | None
+        Where translations are looked up before making a request, ``None`` to
+        always make one
+    timeout : float
+        Seconds a single translation request may take
+    """
+
+    def __init__(
+        self,
+        backend: gpytranslate.Translator | None = None,
+        *,
+        cache: TranslationCache | None = None,
+        timeout: float = 5.0,
+    ) -> None:
+        self.cache = cache
+        self.timeout = timeout
+        self._backend = backend
+
+    @property
+    def backend(self) -> gpytranslate.Translator:
+        """The gpytranslate client, imported and created on first use"""
+        if self._backend is None:
+            # Importing gpytranslate pulls in httpx, which slows down startup
+            from gpytranslate import Translator as GoogleTranslator
+
+            self._backend = GoogleTranslator(timeout=self.timeout)
+
+        return self._backend
+
+    async def translate(
+        self, text: str, *, source: str = "auto", target: str = "en"
+    ) -> Translation:
+        """Translate text
+
+        Parameters
+        ----------
+        text : str
+            The text to translate
+        source : str
+            The language to translate from, ``auto`` to detect it
+        target : str
+            The language to translate to
+
+        Returns
+        -------
+        Translation
+            The translation and the detected source language
+
+        Raises
+        ------
+        errors.HTTPError
+            If the translation failed or its response could not be read
+        """
+        if (translation := await self._lookup(text, source, target)) is None:
+            translation = parse(await self._fetch(text, source, target), target)
+            await self._store(text, source, translation)
+
+        return translation
+
+    async def translate_many(
+        self,
+        texts: Sequence[str],
+        *,
+        source: str = "auto",
+        target: str = "en",
+        max_chars: int = MAX_BATCH_CHARS,
+    ) -> AsyncIterator[list[Translation]]:
+        """Translate many texts with as few requests as possible
+
+        Texts which are not skipped or cached are packed together into
+        requests of up to ``max_chars``, and the sentences of each response
+        are split back per text by where they were found in the request. As a
+        response has a single detected source, only texts identified offline
+        as the same language share a request when detecting it.
+
+        Parameters
+        ----------
+        texts : Sequence[str]
+            The texts to translate
+        source : str
+            The language to translate from, ``auto`` to detect it per text
+        target : str
+            The language to translate to
+        max_chars : int
+            The most characters of text sent in one request
+
+        Yields
+        ------
+        list[Translation]
+            The translations of the next consecutive texts, in order, as soon
+            as each request has finished
+
+        Raises
+        ------
+        errors.HTTPError
+            If a translation failed or its response could not be read
+        """
+        translations = [await self._lookup(text, source, target) for text in texts]
+        start = size = 0
+
+        for index, text in enumerate(texts):
+            if translations[index] is not None:
+                continue
+
+            if size and size + len(text) > max_chars:
+                await self._translate_batch(
+                    texts, translations, start, index, source, target
+                )
+                yield cast("list[Translation]", translations[start:index])
+                start, size = index, 0
+
+            size += len(text) + len(_BATCH_SEPARATOR)
+
+        await self._translate_batch(
+            texts, translations, start, len(texts), source, target
+        )
+
+        if start < len(texts):
+            yield cast("list[Translation]", translations[start:])
+
+    async def _translate_batch(
+        self,
+        texts: Sequence[str],
+        translations: list[Translation | None],
+        start: int,
+        stop: int,
+        source: str,
+        target: str,
+    ) -> None:
+        pending = [index for index in range(start, stop) if translations[index] is None]
+
+        if not pending:
+            return
+
+        groups: dict[str | None, list[int]] = {}
+
+        for index in pending:
+            language = langid.detect(texts[index]) if source == "auto" else source
+            groups.setdefault(language, []).append(index)
+
+        for language, indices in groups.items():
+            parts = [_pack(texts[index]) for index in indices]
+            results = None
+
+            # Texts of unknown language each get their own detected source
+            if language is not None and len(parts) > 1:
+                raw = await self._fetch(_BATCH_SEPARATOR.join(parts), source, target)
+                results = split(raw, parts, target)
+
+            # The translation of a text in a batch may differ from the
+            # translation of the text alone, so it is not cached
+            if results is not None:
+                for index, translation in zip(indices, results):
+                    translations[index] = translation._replace(original=texts[index])
+
+                continue
+
+            # A single text, or a response whose sentences cross texts, is
+            # translated one text at a time instead
+            for index in indices:
+                translation = parse(
+                    await self._fetch(texts[index], source, target), target
+                )._replace(original=texts[index])
+                translations[index] = translation
+                await self._store(texts[index], source, translation)
+
+    async def _lookup(self, text: str, source: str, target: str) -> Translation | None:
+        detected = langid.detect(text) if source == "auto" else source
+
+        # Text already in the target language is returned as is
+        if detected is not None and langid.is_same_language(detected, target):
+            metrics.TRANSLATIONS_SKIPPED.inc()
+            return Translation(text, text, detected, target)
+
+        if self.cache is None:
+            return None
+
+        return await self.cache.get(cache_key(text, source, target))
+
+    async def _store(self, text: str, source: str, translation: Translation) -> None:
+        if self.cache is not None:
+            await self.cache.put(
+                cache_key(text, source, translation.target), translation
+            )
+
+    async def _fetch(self, text: str, source: str, target: str) -> Any:
+        backend = self.backend
+        start = time.perf_counter()
+
+        try:
+            result = await asyncio.wait_for(
+                backend.translate(text, sourcelang=source, targetlang=target),
+                self.timeout,
+            )
+        except asyncio.TimeoutError as exc:
+            metrics.UPSTREAM_REQUESTS.inc(_TRANSLATE_HOST, "timeout")
+            raise errors.HTTPError("translate timed out") from exc
+        except Exception as exc:
+            # gpytranslate wraps every failure in its TranslationError
+            metrics.UPSTREAM_REQUESTS.inc(_TRANSLATE_HOST, "error")
+            raise errors.HTTPError(f"translate failed: {exc}") from exc
+        finally:
+            metrics.UPSTREAM_LATENCY.observe(
+                time.perf_counter() - start, TRANSLATE_SERVICE
+            )
+
+        metrics.UPSTREAM_REQUESTS.inc(_TRANSLATE_HOST, "ok")
+        raw = getattr(result, "raw", None)
+
+        if not isinstance(raw, dict) or "sentences" not in raw or "src" not in raw:
+            raise errors.HTTPError("translate responded with an invalid body")
+
+        return raw
+
+
+def _pack(text: str) -> str:
+    # Blank lines are reserved for separating the texts of a batch
+    return _BLANK_LINES.sub("\n", text.strip())
+
+
+def split(raw: Any, parts: Sequence[str], target: str) -> list[Translation] | None:
+    """Split the response to texts joined by blank lines back per text
+
+    Parameters
+    ----------
+    raw : Any
+        The decoded response
+    parts : Sequence[str]
+        The texts which were joined, none of which contain blank lines
+    target : str
+        The language the texts were translated to
+
+    Returns
+    -------
+    list[Translation] | None
+        The translation of each text, or ``None`` if a sentence could not be
+        found within a single text
+    """
+    starts: list[int] = []
+    position = 0
+
+    for part in parts:
+        starts.append(position)
+        position += len(part) + len(_BATCH_SEPARATOR)
+
+    joined = _BATCH_SEPARATOR.join(parts)
+    translated: list[list[str]] = [[] for _ in parts]
+    position = 0
+
+    for sentence in raw["sentences"]:
+        if "orig" not in sentence:
+            continue
+
+        orig = sentence["orig"].strip()
+
+        if (found := joined.find(orig, position)) < 0:
+            return None
+
+        index = bisect.bisect_right(starts, found) - 1
+
+        if found + len(orig) > starts[index] + len(parts[index]):
+            return None
+
+        translated[index].append(sentence.get("trans", ""))
+        position = found + len(orig)
+
+    return [
+        Translation(part, "".join(pieces).strip(), raw["src"], target)
+        for part, pieces in zip(parts, translated)
+    ]
+
+
+def parse(raw: Any, target: str) -> Translation:
+    """Parse a translation response made with ``client=gtx`` and ``dj=1``
+
+    Parameters
+    ----------
+    raw : Any
+        The decoded response
+    target : str
+        The language the text was translated to
+
+    Returns
+    -------
+    Translation
+        The translation
+    """
+    sentences = raw["sentences"]
+    return Translation(
+        "".join(sentence["orig"] for sentence in sentences if "orig" in sentence),
+        "".join(sentence["trans"] for sentence in sentences if "trans" in sentence),
+        raw["src"],
+        target,
+    )
@@ -0,0 +1,227 @@
+"""Shared HTTP client for the external APIs used by commands"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("Response", "Service", "UpstreamClient")
+
+import asyncio
+import json
+import random
+from typing import Any, Mapping, NamedTuple
+
+import aiohttp
+
+from scripty import errors
+from scripty.functions import metrics
+
+RETRY_STATUSES: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+BACKOFF_BASE = 0.1
+BACKOFF_CAP = 1.0
+
+
+class Service(NamedTuple):
+    """An upstream API and the budget requests to it are given
+
+    Parameters
+    ----------
+    name : str
+        The name requests are labelled with in metrics
+    timeout : float
+        Seconds all attempts of a request may take together
+    retries : int
+        Attempts made after the first one fails or gets a retryable status
+    hedge_after : float | None
+        Seconds after which a GET request without a response is sent again,
+        taking whichever finishes first, ``None`` to never hedge
+    """
+
+    name: str
+    timeout: float = 5.0
+    retries: int = 1
+    hedge_after: float | None = None
+
+
+class Response(NamedTuple):
+    """A fully read upstream response"""
+
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+
+    @property
+    def ok(self) -> bool:
+        """Whether the status is not an error"""
+        return self.status < 400
+
+    def json(self) -> Any:
+        """Decode the body as JSON, whatever the content type"""
+        return json.loads(self.body)
+
+
+class UpstreamClient:
+    """A pooled HTTP client with timeouts, retries and hedging per service
+
+    Connections are kept alive and DNS lookups cached so that repeated calls
+    to the same API skip the handshakes, while per-host limits stop a single
+    slow API from taking every connection.
+
+    Parameters
+    ----------
+    limit : int
+        Maximum open connections
+    limit_per_host : int
+        Maximum open connections to a single host
+    keepalive_timeout : float
+        Seconds an idle connection is kept open
+    dns_cache_ttl : int
+        Seconds DNS lookups are cached
+    """
+
+    def __init__(
+        self,
+        *,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: int = 300,
+    ) -> None:
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=limit,
+                limit_per_host=limit_per_host,
+                keepalive_timeout=keepalive_timeout,
+                ttl_dns_cache=dns_cache_ttl,
+            ),
+            trace_configs=[metrics.upstream_trace_config()],
+        )
+
+    async def close(self) -> None:
+        """Close the session and its connections"""
+        await self.session.close()
+
+    async def request(
+        self, service: Service, method: str, url: str, **kwargs: Any
+    ) -> Response:
+        """Make a request within the service's budget
+
+        Connection errors, timeouts and retryable statuses are retried with
+        jittered exponential backoff while attempts and time remain.
+
+        Parameters
+        ----------
+        service : Service
+            The upstream the request is made to
+        method : str
+            The HTTP method
+        url : str
+            The URL to request
+        **kwargs : Any
+            Passed on to ``aiohttp.ClientSession.request``
+
+        Returns
+        -------
+        Response
+            The last response, which may still have a retryable status
+
+        Raises
+        ------
+        errors.HTTPError
+            If no response was received within the budget
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + service.timeout
+        response: Response | None = None
+        error: BaseException | None = None
+
+        for attempt in range(service.retries + 1):
+            if attempt:
+                metrics.UPSTREAM_RETRIES.inc(service.name)
+
+            remaining = deadline - loop.time()
+
+            if remaining <= 0:
+                break
+
+            try:
+                if method == "GET" and service.hedge_after is not None:
+                    response = await self._hedged(service, url, remaining, **kwargs)
+                else:
+                    response = await self._attempt(method, url, remaining, **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                error = exc
+            else:
+                if response.status not in RETRY_STATUSES:
+                    break
+
+            if attempt == service.retries:
+                break
+
+            backoff = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
+            await asyncio.sleep(min(backoff, max(0.0, deadline - loop.time())))
+
+        metrics.UPSTREAM_LATENCY.observe(loop.time() - start, service.name)
+
+        if response is None:
+            raise errors.HTTPError(f"{service.name} did not respond in time") from error
+
+        return response
+
+    async def get_json(self, service: Service, url: str, **kwargs: Any) -> Any:
+        """Get and decode a JSON resource
+
+        Raises
+        ------
+        errors.HTTPError
+            If there was no response or it had an error status
+        """
+        response = await self.request(service, "GET", url, **kwargs)
+
+        if not response.ok:
+            raise errors.HTTPError(f"{service.name} responded with {response.status}")
+
+        return response.json()
+
+    async def _attempt(
+        self, method: str, url: str, timeout: float, **kwargs: Any
+    ) -> Response:
+        async with self.session.request(
+            method, url, timeout=aiohttp.ClientTimeout(total=timeout), **kwargs
+        ) as response:
+            return Response(response.status, response.headers, await response.read())
+
+    async def _hedged(
+        self, service: Service, url: str, timeout: float, **kwargs: Any
+    ) -> Response:
+        assert service.hedge_after is not None
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        pending = {asyncio.create_task(self._attempt("GET", url, timeout, **kwargs))}
+
+        try:
+            done, pending = await asyncio.wait(pending, timeout=service.hedge_after)
+
+            if not done:
+                metrics.UPSTREAM_HEDGES.inc(service.name)
+                pending.add(
+                    asyncio.create_task(
+                        self._attempt("GET", url, deadline - loop.time(), **kwargs)
+                    )
+                )
+
+            error: BaseException | None = None
+
+            while True:
+                for task in done:
+                    if (error := task.exception()) is None:
+                        return task.result()
+
+                if not pending:
+                    assert error is not None
+                    raise error
+
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            for task in pending:
+                task.cancel()
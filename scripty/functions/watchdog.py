@@ -0,0 +1,163 @@
+"""Event loop lag monitoring and slow callback detection"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("LoopMonitor", "Stall")
+
+import asyncio
+import collections
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import NamedTuple
+
+from scripty.functions import metrics
+
+_LOGGER = logging.getLogger("scripty.watchdog")
+
+
+class Stall(NamedTuple):
+    """A captured stall of the event loop"""
+
+    timestamp: float
+    duration: float
+    stack: str
+
+
+class LoopMonitor:
+    """Continuously measure event loop scheduling lag
+
+    A probe task sleeps for ``interval`` and records how late it was woken.
+    Alongside it a daemon thread watches the probe, and when the loop has not
+    ticked for longer than ``threshold`` it captures the stack of the loop
+    thread, which is the stack of the callback currently blocking it.
+
+    Parameters
+    ----------
+    interval : float
+        Seconds between each probe, defaults to 0.25 seconds
+    threshold : float
+        Seconds of lag after which the loop is considered stalled
+    history : int
+        Number of lag samples retained for percentiles
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float = 0.25,
+        threshold: float = 0.1,
+        history: int = 1200,
+    ) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.stalls: collections.deque[Stall] = collections.deque(maxlen=10)
+        self._lags: collections.deque[float] = collections.deque(maxlen=history)
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop"""
+        if self._task is not None:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._probe(), name="loop monitor")
+        self._thread = threading.Thread(
+            target=self._watch, name="loop watchdog", daemon=True
+        )
+        self._thread.start()
+
+    async def close(self) -> None:
+        """Stop monitoring"""
+        self._stopped.set()
+
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
+        self._thread = None
+
+    def record(self, lag: float) -> None:
+        """Record a lag sample"""
+        self._lags.append(lag)
+        metrics.LOOP_LAG.observe(lag)
+
+    def percentiles(self, *quantiles: float) -> tuple[float, ...] | None:
+        """Get the nearest-rank percentiles of the retained lag samples
+
+        Parameters
+        ----------
+        *quantiles : float
+            The quantiles to compute, between 0 and 1
+
+        Returns
+        -------
+        tuple[float, ...]
+            The lag in seconds for each quantile in order
+        None
+            If there are no samples recorded
+        """
+        if not self._lags:
+            return None
+
+        lags = sorted(self._lags)
+        last = len(lags) - 1
+
+        return tuple(
+            lags[min(last, int(quantile * len(lags)))] for quantile in quantiles
+        )
+
+    async def _probe(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - start - self.interval))
+            self._heartbeat = time.monotonic()
+
+    def _watch(self) -> None:
+        captured = False
+        heartbeat = self._heartbeat
+
+        while not self._stopped.wait(self.threshold / 2):
+            if heartbeat != self._heartbeat:
+                heartbeat = self._heartbeat
+                captured = False
+
+            stalled = time.monotonic() - heartbeat - self.interval
+
+            if captured or stalled < self.threshold or self._loop_thread_id is None:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+
+            if frame is None:
+                continue
+
+            # Only capture once per stall as the stack will not change while
+            # the same callback is blocking the loop
+            captured = True
+            stall = Stall(time.time(), stalled, "".join(traceback.format_stack(frame)))
+            self.stalls.append(stall)
+            metrics.LOOP_STALLS.inc()
+
+            _LOGGER.warning(
+                "event loop blocked for at least %.3fs in:\n%s",
+                stall.duration,
+                stall.stack,
+            )
@@ -0,0 +1,223 @@
+"""Run the bot as a cluster of worker processes, one shard range each
+
+Usage: ``python -m scripty.launcher``
+"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("Supervisor", "main")
+
+import asyncio
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import time
+from multiprocessing.context import SpawnProcess
+from multiprocessing.synchronize import Event
+from typing import TYPE_CHECKING, Any
+
+import hikari
+
+from scripty import config
+from scripty.functions import cluster, gateway
+
+if TYPE_CHECKING:
+    from multiprocessing.sharedctypes import SynchronizedArray
+
+_LOGGER = logging.getLogger("scripty.launcher")
+
+READY_TIMEOUT = 600.0
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+# A worker which stayed up this long is considered healthy again
+BACKOFF_RESET = 300.0
+
+
+def run_worker(
+    worker: int,
+    workers: int,
+    shard_ids: list[int],
+    shard_count: int,
+    guild_counts: SynchronizedArray[int],
+    ready: Event,
+) -> None:
+    """Entry point of a worker process"""
+    if os.name != "nt":
+        import uvloop
+
+        uvloop.install()
+
+    from scripty import bot as bot_
+
+    state = cluster.ClusterState(worker, workers, guild_counts)
+    bot, _ = bot_.build_bot(cluster_state=state)
+
+    async def on_started(_: hikari.StartedEvent) -> None:
+        ready.set()
+
+    bot.subscribe(hikari.StartedEvent, on_started)
+    bot.run(
+        shard_ids=shard_ids,
+        shard_count=shard_count,
+        large_threshold=gateway.LARGE_THRESHOLD,
+    )
+
+
+class _Worker:
+    def __init__(self, index: int, shard_ids: list[int]) -> None:
+        self.index = index
+        self.shard_ids = shard_ids
+        self.process: SpawnProcess | None = None
+        self.started_at = 0.0
+        self.backoff = BACKOFF_BASE
+
+
+class Supervisor:
+    """Start, watch and restart the worker processes of a cluster
+
+    Workers are started one at a time, each waiting until the previous one has
+    identified all its shards, so that processes do not race each other for
+    the identify rate limit. A worker which exits is restarted with an
+    exponential backoff until the supervisor is asked to stop.
+
+    Parameters
+    ----------
+    shard_count : int
+        The total number of shards
+    workers : int
+        The number of worker processes, capped at the shard count
+    """
+
+    def __init__(self, shard_count: int, workers: int) -> None:
+        self.shard_count = shard_count
+        self._context = multiprocessing.get_context("spawn")
+        self._workers = [
+            _Worker(index, shard_ids)
+            for index, shard_ids in enumerate(
+                cluster.shard_ranges(shard_count, workers)
+            )
+        ]
+        self._guild_counts = self._context.Array("q", len(self._workers))
+        self._stopping = False
+
+    def _spawn(self, worker: _Worker) -> Event:
+        ready = self._context.Event()
+        worker.process = self._context.Process(
+            target=run_worker,
+            args=(
+                worker.index,
+                len(self._workers),
+                worker.shard_ids,
+                self.shard_count,
+                self._guild_counts,
+                ready,
+            ),
+            name=f"scripty-worker-{worker.index}",
+        )
+        worker.process.start()
+        worker.started_at = time.monotonic()
+
+        _LOGGER.info(
+            "started worker %s (pid %s) with shards %s-%s",
+            worker.index,
+            worker.process.pid,
+            worker.shard_ids[0],
+            worker.shard_ids[-1],
+        )
+        return ready
+
+    def _stop(self, *_: Any) -> None:
+        self._stopping = True
+
+    def _terminate(self) -> None:
+        for worker in self._workers:
+            if worker.process is not None and worker.process.is_alive():
+                # Workers close gracefully on SIGTERM
+                worker.process.terminate()
+
+        for worker in self._workers:
+            if worker.process is None:
+                continue
+
+            worker.process.join(timeout=30)
+
+            if worker.process.is_alive():
+                worker.process.kill()
+
+    def run(self) -> None:
+        """Run the cluster until interrupted"""
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+
+        for worker in self._workers:
+            ready = self._spawn(worker)
+            deadline = time.monotonic() + READY_TIMEOUT
+
+            while not self._stopping and not ready.wait(timeout=1.0):
+                assert worker.process is not None
+
+                if not worker.process.is_alive() or time.monotonic() > deadline:
+                    break
+
+        restart_at: dict[int, float] = {}
+
+        while not self._stopping:
+            sentinels = [
+                worker.process.sentinel
+                for worker in self._workers
+                if worker.process is not None and worker.index not in restart_at
+            ]
+            multiprocessing.connection.wait(sentinels, timeout=1.0)
+
+            now = time.monotonic()
+
+            for worker in self._workers:
+                if worker.index in restart_at:
+                    if now >= restart_at[worker.index]:
+                        del restart_at[worker.index]
+                        self._spawn(worker)
+                    continue
+
+                if worker.process is None or worker.process.is_alive():
+                    continue
+
+                if now - worker.started_at > BACKOFF_RESET:
+                    worker.backoff = BACKOFF_BASE
+
+                _LOGGER.warning(
+                    "worker %s exited with code %s, restarting in %.0fs",
+                    worker.index,
+                    worker.process.exitcode,
+                    worker.backoff,
+                )
+                restart_at[worker.index] = now + worker.backoff
+                worker.backoff = min(worker.backoff * 2, BACKOFF_CAP)
+
+        self._terminate()
+
+
+async def fetch_shard_count() -> int:
+    """Fetch the shard count recommended by Discord"""
+    rest_app = hikari.RESTApp()
+    await rest_app.start()
+
+    try:
+        async with rest_app.acquire(config.DISCORD_TOKEN, "Bot") as rest:
+            return (await rest.fetch_gateway_bot_info()).shard_count
+    finally:
+        await rest_app.close()
+
+
+def main() -> None:
+    """Start the cluster from the configured or recommended shard count"""
+    logging.basicConfig(level=logging.INFO)
+
+    shard_count = config.SHARD_COUNT or asyncio.run(fetch_shard_count())
+    workers = config.CLUSTER_WORKERS or os.cpu_count() or 1
+
+    Supervisor(shard_count, workers).run()
+
+
+if __name__ == "__main__":
+    main()
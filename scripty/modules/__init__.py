@@ -1,9 +1 @@
 """Scripty component modules"""
-
-from scripty.modules.automod import *
-from scripty.modules.dev import *
-from scripty.modules.fun import *
-from scripty.modules.help import *
-from scripty.modules.misc import *
-from scripty.modules.mod import *
-from scripty.modules.util import *
@@ -7,7 +7,7 @@ import plane
 # import tanchi
 import tanjun
 
-from scripty.functions import embeds, helpers
+from scripty.functions import embeds, helpers, instrument, metrics
 
 component = tanjun.Component(name="automod")
 
@@ -34,6 +34,7 @@ automod = tanjun.slash_command_group("automod", "Activate automatic content mode
 
 
 @component.with_listener(hikari.GuildMessageCreateEvent)
+@instrument.listener
 async def on_guild_message_create(
     event: hikari.GuildMessageCreateEvent,
     bot: alluka.Injected[hikari.GatewayBot],
@@ -47,7 +48,12 @@ async def on_guild_message_create(
     if url is None:
         return
 
-    data = await pc.urls.get_website(url["encoded"])
+    metrics.AUTOMOD_INFLIGHT.inc()
+
+    try:
+        data = await pc.urls.get_website(url["encoded"])
+    finally:
+        metrics.AUTOMOD_INFLIGHT.dec()
 
     if not data.is_fraudulent:
         return
@@ -63,12 +69,18 @@ async def on_guild_message_create(
 
 
 @component.with_listener(hikari.MemberCreateEvent)
+@instrument.listener
 async def on_member_create(
     event: hikari.MemberCreateEvent,
     bot: alluka.Injected[hikari.GatewayBot],
     pc: alluka.Injected[plane.Client],
 ) -> None:
-    data = await pc.users.get_bans(event.user.id)
+    metrics.AUTOMOD_INFLIGHT.inc()
+
+    try:
+        data = await pc.users.get_bans(event.user.id)
+    finally:
+        metrics.AUTOMOD_INFLIGHT.dec()
 
     if not data.bans:
         return
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 __all__: tuple[str, ...] = ("loader_dev",)
 
-import pathlib
+import datetime
+import time
 
 import alluka
 import tanjun
 
-from scripty.functions import embeds
+from scripty import config
+from scripty.functions import declare, embeds, helpers, instrument, snapshot, watchdog
 
 
 @tanjun.with_owner_check(error_message=None)
@@ -25,7 +27,8 @@ async def load(
     module : str
         Module to load
     """
-    await client.reload_modules_async(pathlib.Path(f"scripty/modules/{module}.py"))
+    # Modules are loaded by dotted name, which a path would not match
+    await client.load_modules_async(f"scripty.modules.{module}")
     await ctx.respond(
         embeds.Embed(
             title="Load",
@@ -49,27 +52,113 @@ async def reload(
     module : str
         Module to reload
     """
-    await client.reload_modules_async(pathlib.Path(f"scripty/modules/{module}.py"))
+    start = time.perf_counter()
+    await client.reload_modules_async(f"scripty.modules.{module}")
+    duration = time.perf_counter() - start
+    retained = snapshot.REGISTRY.sizes(f"{module}.")
+
     await ctx.respond(
         embeds.Embed(
-            title="Load",
-            description=f"`{module}` module reloaded",
+            title="Reload",
+            description=(
+                f"`{module}` module reloaded in {duration * 1000:.0f} ms\n"
+                f"Retained {sum(retained.values())} entries "
+                f"in {len(retained)} caches"
+            ),
         )
     )
 
 
 @tanjun.with_owner_check(error_message=None)
+@tanjun.with_option(
+    "force", "--force", "-f", converters=tanjun.to_bool, default=False, empty_value=True
+)
 @tanjun.as_message_command("sync")
 async def sync(
     ctx: tanjun.abc.MessageContext,
     client: alluka.Injected[tanjun.Client],
+    force: bool,
 ) -> None:
-    """Sync global application commands"""
-    await client.declare_global_commands()
+    """Sync application commands
+
+    Parameters
+    ----------
+    force : bool
+        Whether to sync even if the commands are unchanged
+    """
+    if config.SERVE_INTERACTIONS:
+        # Declaring this process's commands would replace the served ones
+        description = "Application commands are declared by `scripty.serve`"
+    elif await declare.sync_commands(client, force=force):
+        description = "Successfully synced application commands"
+    else:
+        description = "Application commands are already up to date"
+
     await ctx.respond(
         embeds.Embed(
             title="Sync",
-            description="Successfully synced global application commands",
+            description=description,
+        )
+    )
+
+
+@tanjun.with_owner_check(error_message=None)
+@tanjun.with_argument("limit", converters=int, default=10)
+@tanjun.as_message_command("slowest")
+async def slowest(
+    ctx: tanjun.abc.MessageContext,
+    limit: int,
+) -> None:
+    """Show the slowest commands and listeners by mean latency
+
+    Parameters
+    ----------
+    limit : int
+        Number of commands and listeners to show
+    """
+    embed = embeds.Embed(title="Slowest")
+
+    for kind in ("command", "listener"):
+        timings = instrument.slowest(kind, limit)
+        lines = [
+            f"`{timing.name}` {round(timing.mean * 1000, 1)}ms mean, "
+            f"<{timing.p95 * 1000:g}ms p95, {timing.count} calls, "
+            f"{timing.errors} errors"
+            for timing in timings
+        ]
+        embed.add_field(f"{kind.title()}s", "\n".join(lines) or "No calls recorded")
+
+    await ctx.respond(embed)
+
+
+@tanjun.with_owner_check(error_message=None)
+@tanjun.as_message_command("stalls")
+async def stalls(
+    ctx: tanjun.abc.MessageContext,
+    loop_monitor: alluka.Injected[watchdog.LoopMonitor],
+) -> None:
+    """Show the stack of the most recent event loop stall"""
+    if not loop_monitor.stalls:
+        await ctx.respond(
+            embeds.Embed(
+                title="Stalls",
+                description="No event loop stalls recorded",
+            )
+        )
+        return
+
+    stall = loop_monitor.stalls[-1]
+    stalled_at = helpers.discord_timestamp(
+        datetime.datetime.fromtimestamp(stall.timestamp), "R"
+    )
+
+    await ctx.respond(
+        embeds.Embed(
+            title="Stalls",
+            description=(
+                f"Blocked for `{round(stall.duration * 1000)}ms` {stalled_at}\n"
+                f"```py\n{stall.stack[-3900:]}```"
+            ),
         )
     )
 
@@ -98,7 +187,7 @@ async def unload(
         )
         return
 
-    client.unload_modules(pathlib.Path(f"scripty/modules/{module}.py"))
+    client.unload_modules(f"scripty.modules.{module}")
     await ctx.respond(
         embeds.Embed(
             title="Unload",
@@ -1,20 +1,63 @@
 from __future__ import annotations
 
-from scripty import config
+from scripty import config, errors
 
 __all__: tuple[str, ...] = ("loader_fun",)
 
 import random
-from typing import Any
+from typing import Sequence
 
-import aiohttp
 import alluka
 import hikari
-import miru
 import tanchi
 import tanjun
 
-from scripty.functions import embeds
+from scripty.functions import (
+    autocomplete,
+    components,
+    embeds,
+    listing,
+    prefetch,
+    upstream,
+)
+
+CAT_API = upstream.Service("thecatapi", timeout=4.0, hedge_after=1.0)
+DOG_API = upstream.Service("dog.ceo", timeout=4.0, hedge_after=1.0)
+QUOTE_API = upstream.Service("forismatic", timeout=4.0, hedge_after=1.0)
+REDDIT_API = upstream.Service("reddit", timeout=8.0)
+
+MEMES = listing.Listing(
+    REDDIT_API,
+    "https://reddit.com/r/memes/hot.json",
+    headers={"User-Agent": "Scripty"},
+)
+
+
+async def _fetch_cat(client: upstream.UpstreamClient) -> str:
+    data = await client.get_json(
+        CAT_API,
+        "https://api.thecatapi.com/v1/images/search",
+        headers={"x-api-key": config.THE_CAT_API_KEY},
+    )
+    return data[0]["url"]
+
+
+async def _fetch_dog(client: upstream.UpstreamClient) -> str:
+    data = await client.get_json(DOG_API, "https://dog.ceo/api/breeds/image/random")
+    return data["message"]
+
+
+async def _fetch_quote(client: upstream.UpstreamClient) -> tuple[str, str]:
+    data = await client.get_json(
+        QUOTE_API,
+        "https://api.forismatic.com/api/1.0/?method=getQuote&format=json&lang=en",
+    )
+    return data["quoteText"], data["quoteAuthor"]
+
+
+CATS = prefetch.PrefetchBuffer("cat", _fetch_cat)
+DOGS = prefetch.PrefetchBuffer("dog", _fetch_dog)
+QUOTES = prefetch.PrefetchBuffer("quote", _fetch_quote)
 
 animal = tanjun.slash_command_group("animal", "Fun things related to animals")
 
@@ -57,17 +100,16 @@ ACTIVITIES = {
     "Putt Party": "945737671223947305",
     # "Sketchy Artist": "879864070101172255",
 }
+_ACTIVITY_COMPLETER = autocomplete.Completer(ACTIVITIES)
 
 
-class ActivityView(miru.View):
-    def __init__(self, invite: str, activity: str) -> None:
-        super().__init__()
-        self.add_item(
-            miru.Button(
-                label=f"Launch {activity}",
-                url=invite,
-            )
-        )
+def _activity_button(invite: str, activity: str) -> hikari.api.ActionRowBuilder:
+    return (
+        hikari.impl.ActionRowBuilder()
+        .add_button(hikari.ButtonStyle.LINK, invite)
+        .set_label(f"Launch {activity}")
+        .add_to_container()
+    )
 
 
 async def activity_autocomplete(
@@ -75,22 +117,16 @@ async def activity_autocomplete(
     activity: str,
 ) -> None:
     """Autocomplete for Discord Activities"""
-    activity_map: dict[str, str] = {}
-
-    for k, v in ACTIVITIES.items():
-        if len(activity_map) == 10:
-            break
-        if activity.lower() in k.lower() or activity.lower() in v.lower():
-            activity_map[k] = v
-
-    await ctx.set_choices(activity_map)
+    await ctx.set_choices(
+        _ACTIVITY_COMPLETER.complete(activity, session=autocomplete.session_of(ctx))
+    )
 
 
 @tanjun.with_own_permission_check(hikari.Permissions.CREATE_INSTANT_INVITE)
 @tanchi.as_slash_command("activity")
 async def activity_(
     ctx: tanjun.abc.SlashContext,
-    bot: alluka.Injected[hikari.GatewayBot],
+    rest: alluka.Injected[hikari.api.RESTClient],
     activity: tanchi.Autocompleted[activity_autocomplete],
     channel: hikari.GuildVoiceChannel,
 ) -> None:
@@ -112,7 +148,7 @@ async def activity_(
         )
         return
 
-    invite = await bot.rest.create_invite(
+    invite = await rest.create_invite(
         channel,
         target_type=hikari.TargetType.EMBEDDED_APPLICATION,
         target_application=int(activity),
@@ -122,25 +158,17 @@ async def activity_(
         if v == activity:
             activity = k
 
-    view = ActivityView(str(invite), activity)
-
-    await ctx.respond(components=view.build())
+    await ctx.respond(component=_activity_button(str(invite), activity))
 
 
 @animal.with_command
 @tanchi.as_slash_command()
 async def cat(
     ctx: tanjun.abc.SlashContext,
-    session: alluka.Injected[aiohttp.ClientSession],
+    client: alluka.Injected[upstream.UpstreamClient],
 ) -> None:
     """Get a random cat image"""
-    async with session.get(
-        "https://api.thecatapi.com/v1/images/search",
-        headers={"x-api-key": config.THE_CAT_API_KEY},
-    ) as response:
-        data = await response.json()
-
-    embed = embeds.Embed(title="Cat").set_image(data[0]["url"])
+    embed = embeds.Embed(title="Cat").set_image(await CATS.get(client))
 
     await ctx.respond(embed)
 
@@ -167,13 +195,10 @@ async def httpcat(
 @tanchi.as_slash_command()
 async def dog(
     ctx: tanjun.abc.SlashContext,
-    session: alluka.Injected[aiohttp.ClientSession],
+    client: alluka.Injected[upstream.UpstreamClient],
 ) -> None:
     """Get a random dog image"""
-    async with session.get("https://dog.ceo/api/breeds/image/random") as response:
-        data = await response.json()
-
-    embed = embeds.Embed(title="Dog").set_image(data["message"])
+    embed = embeds.Embed(title="Dog").set_image(await DOGS.get(client))
 
     await ctx.respond(embed)
 
@@ -209,104 +234,97 @@ async def dice(
     )
 
 
-class MemeView(miru.View):
-    def __init__(
-        self, tanjun_ctx: tanjun.abc.Context, submissions: Any, index: int
-    ) -> None:
-        super().__init__(timeout=30.0)
-        self.tanjun_ctx = tanjun_ctx
-        self.submissions = submissions
-        self.index = index
-
-    @miru.button(label="Next", style=hikari.ButtonStyle.SECONDARY)
-    async def next(self, _: miru.Button[Any], ctx: miru.Context) -> None:
-        self.index += 1
-        if self.index == len(self.submissions):
-            self.index = 0
-
-        embed = embeds.Embed(
-            title=self.submissions[self.index]["title"],
-            url=f"https://reddit.com{self.submissions[self.index]['permalink']}",
-        ).set_image(self.submissions[self.index]["url"])
-
-        await ctx.edit_response(embed)
-
-    @miru.button(label="Stop", style=hikari.ButtonStyle.DANGER)
-    async def stop_(self, _: miru.Button[Any], ctx: miru.Context) -> None:
-        for item in self.children:
-            item.disabled = True
-
-        await ctx.edit_response(components=self.build())
-
-        self.stop()
-
-    async def view_check(self, ctx: miru.Context) -> bool:
-        if self.message is None:
-            raise AssertionError
+def _meme_embed(
+    submissions: tuple[listing.Submission, ...], seed: int, index: int
+) -> embeds.Embed:
+    order = list(range(len(submissions)))
+    random.Random(seed).shuffle(order)
+    submission = submissions[order[index % len(order)]]
+    return embeds.Embed(title=submission.title, url=submission.permalink).set_image(
+        submission.url
+    )
 
-        if ctx.user == self.tanjun_ctx.author:
-            return True
 
-        embed = embeds.Embed(
-            title="Error",
-            description="This command was not invoked by you!",
+def _meme_buttons(
+    author: hikari.Snowflake, seed: int, index: int, *, disabled: bool = False
+) -> hikari.api.ActionRowBuilder:
+    return (
+        hikari.impl.ActionRowBuilder()
+        .add_button(
+            hikari.ButtonStyle.SECONDARY,
+            components.ROUTER.custom_id("meme", author, seed, index),
         )
-        await ctx.respond(embed, flags=hikari.MessageFlag.EPHEMERAL)
-        return False
-
-    async def on_timeout(self) -> None:
-        if self.message is None:
-            return
-
-        for item in self.children:
-            item.disabled = True
-
-        self.add_item(
-            miru.Button(
-                style=hikari.ButtonStyle.SECONDARY,
-                label="Timed out",
-                disabled=True,
-            )
+        .set_label("Next")
+        .set_is_disabled(disabled)
+        .add_to_container()
+        .add_button(
+            hikari.ButtonStyle.DANGER,
+            components.ROUTER.custom_id("meme-stop", author, seed, index),
         )
-
-        await self.message.edit(components=self.build())
+        .set_label("Stop")
+        .set_is_disabled(disabled)
+        .add_to_container()
+    )
 
 
 @tanchi.as_slash_command()
 async def meme(
     ctx: tanjun.abc.SlashContext,
-    session: alluka.Injected[aiohttp.ClientSession],
+    client: alluka.Injected[upstream.UpstreamClient],
 ) -> None:
     """The hottest Reddit r/memes"""
-    reddit_url = "https://reddit.com/r/memes/hot.json"
+    submissions = await MEMES.get(client)
 
-    async with session.get(reddit_url, headers={"User-Agent": "Scripty"}) as response:
-        reddit = await response.json()
+    if not submissions:
+        raise errors.HTTPError("r/memes has no submissions to show")
 
-    submissions: Any = [
-        reddit["data"]["children"][submission]["data"]
-        for submission in range(len(reddit["data"]["children"]))
-        if not reddit["data"]["children"][submission]["data"]["over_18"]
-        and not reddit["data"]["children"][submission]["data"]["is_video"]
-    ]
+    # The seed of the shuffled order and the position in it are all the state
+    seed = random.getrandbits(32)
 
-    random.shuffle(submissions)
-
-    index = 0
-
-    view = MemeView(ctx, submissions, index)
+    message = await ctx.respond(
+        _meme_embed(submissions, seed, 0),
+        component=_meme_buttons(ctx.author.id, seed, 0),
+        ensure_result=True,
+    )
+    components.ROUTER.schedule_timeout(ctx.rest, "meme", message)
+
+
+@components.ROUTER.handler("meme", max_age=30.0, owned=True)
+async def meme_next(
+    interaction: hikari.ComponentInteraction,
+    fields: Sequence[str],
+    client: alluka.Injected[upstream.UpstreamClient],
+) -> hikari.api.InteractionMessageBuilder:
+    """Show the next submission of the shuffled order"""
+    seed, index = components.unpack(fields[0]), components.unpack(fields[1]) + 1
+
+    # The listing may have been revalidated since, which only changes the order,
+    # or not fetched yet by this process
+    try:
+        submissions = await MEMES.get(client)
+    except errors.HTTPError:
+        submissions = ()
+
+    if not submissions:
+        return components.ephemeral(
+            embeds.Embed(title="Error", description="r/memes is unavailable")
+        )
 
-    embed = embeds.Embed(
-        title=submissions[index]["title"][:255] + "\U00002026"
-        if len(submissions[index]["title"]) > 256
-        else submissions[index]["title"],
-        url=f"https://reddit.com{submissions[index]['permalink']}",
-    ).set_image(submissions[index]["url"])
+    return components.update(
+        _meme_embed(submissions, seed, index),
+        [_meme_buttons(interaction.user.id, seed, index % len(submissions))],
+    )
 
-    response = await ctx.respond(embed, ensure_result=True, components=view.build())
 
-    view.start(response)
-    await view.wait()
+@components.ROUTER.handler("meme-stop", owned=True)
+async def meme_stop(
+    interaction: hikari.ComponentInteraction, fields: Sequence[str]
+) -> hikari.api.InteractionMessageBuilder:
+    """Disable the buttons of a meme"""
+    seed, index = components.unpack(fields[0]), components.unpack(fields[1])
+    return components.update(
+        components=[_meme_buttons(interaction.user.id, seed, index, disabled=True)]
+    )
 
 
 @tanchi.as_slash_command()
@@ -315,125 +333,85 @@ async def rickroll(ctx: tanjun.abc.SlashContext) -> None:
     await ctx.respond("https://youtu.be/dQw4w9WgXcQ")
 
 
-class RPSView(miru.View):
-    rps: dict[str, int] = {"Rock": 0, "Paper": 1, "Scissors": 2}
-
-    def __init__(self, tanjun_ctx: tanjun.abc.Context) -> None:
-        super().__init__(timeout=30.0)
-        self._rps = random.choice((0, 1, 2))
-        self.tanjun_ctx = tanjun_ctx
-
-    def get_value(self, key: str) -> int:
-        return self.rps[key]
+RPS_CHOICES: tuple[tuple[str, hikari.ButtonStyle], ...] = (
+    ("Rock", hikari.ButtonStyle.DANGER),
+    ("Paper", hikari.ButtonStyle.SUCCESS),
+    ("Scissors", hikari.ButtonStyle.PRIMARY),
+)
 
-    def get_key(self, value: int) -> str:
-        if not 0 <= value <= 2:
-            raise ValueError("invalid value")
-
-        return tuple(k for k, v in self.rps.items() if v == value)[0]
-
-    @staticmethod
-    def generate_embed(message: str) -> embeds.Embed:
-        return embeds.Embed(
-            title="RPS",
-            description=message,
-        )
-
-    def determine_outcome(self, player_choice: str) -> embeds.Embed:
-        player_value = self.get_value(player_choice)
-        computer_choice = self.get_key(self._rps)
-
-        if (player_value + 1) % 3 == self._rps:
-            return self.generate_embed(
-                f"You lost! `{computer_choice}` beats `{player_choice}`"
-            )
-
-        if player_value == self._rps:
-            return self.generate_embed(f"You tied! Both chose `{player_choice}`")
-
-        return self.generate_embed(
-            f"You won! `{player_choice}` beats `{computer_choice}`"
-        )
 
-    @miru.button(label="Rock", style=hikari.ButtonStyle.DANGER)
-    async def rock(self, _: miru.Button[Any], ctx: miru.Context) -> None:
-        await ctx.edit_response(self.determine_outcome("Rock"), components=[])
-        self.stop()
+def rps_outcome(player: int, computer: int) -> embeds.Embed:
+    """Describe a game of rock paper scissors
 
-    @miru.button(label="Paper", style=hikari.ButtonStyle.SUCCESS)
-    async def paper(self, _: miru.Button[Any], ctx: miru.Context) -> None:
-        await ctx.edit_response(self.determine_outcome("Paper"), components=[])
-        self.stop()
-
-    @miru.button(label="Scissors", style=hikari.ButtonStyle.PRIMARY)
-    async def scissors(self, _: miru.Button[Any], ctx: miru.Context) -> None:
-        await ctx.edit_response(self.determine_outcome("Scissors"), components=[])
-        self.stop()
-
-    async def view_check(self, ctx: miru.Context) -> bool:
-        if self.message is None:
-            raise AssertionError
-
-        if ctx.user == self.tanjun_ctx.author:
-            return True
-
-        embed = embeds.Embed(
-            title="Error",
-            description="This command was not invoked by you!",
-        )
-        await ctx.respond(embed, flags=hikari.MessageFlag.EPHEMERAL)
-        return False
-
-    async def on_timeout(self) -> None:
-        if self.message is None:
-            return
-
-        for item in self.children:
-            item.disabled = True
+    Parameters
+    ----------
+    player : int
+        The index of the player's choice in `RPS_CHOICES`
+    computer : int
+        The index of the computer's choice in `RPS_CHOICES`
+
+    Returns
+    -------
+    embeds.Embed
+        The embed announcing the outcome
+    """
+    player_choice = RPS_CHOICES[player][0]
+    computer_choice = RPS_CHOICES[computer][0]
 
-        self.add_item(
-            miru.Button(
-                style=hikari.ButtonStyle.SECONDARY,
-                label="Timed out",
-                disabled=True,
-            )
-        )
+    if (player + 1) % 3 == computer:
+        description = f"You lost! `{computer_choice}` beats `{player_choice}`"
+    elif player == computer:
+        description = f"You tied! Both chose `{player_choice}`"
+    else:
+        description = f"You won! `{player_choice}` beats `{computer_choice}`"
 
-        await self.message.edit(components=self.build())
+    return embeds.Embed(title="RPS", description=description)
 
 
 @tanchi.as_slash_command()
 async def rps(ctx: tanjun.abc.SlashContext) -> None:
     """Play rock paper scissors"""
-    view = RPSView(ctx)
+    row = hikari.impl.ActionRowBuilder()
+
+    for choice, (label, style) in enumerate(RPS_CHOICES):
+        row.add_button(
+            style, components.ROUTER.custom_id("rps", ctx.author.id, choice)
+        ).set_label(label).add_to_container()
 
     embed = embeds.Embed(
         title="RPS",
         description="Click on the button options to continue the game!",
     )
 
-    response = await ctx.respond(embed, ensure_result=True, components=view.build())
+    message = await ctx.respond(embed, component=row, ensure_result=True)
+    components.ROUTER.schedule_timeout(ctx.rest, "rps", message)
 
-    view.start(response)
-    await view.wait()
+
+@components.ROUTER.handler("rps", max_age=30.0, owned=True)
+async def rps_choice(
+    _: hikari.ComponentInteraction, fields: Sequence[str]
+) -> hikari.api.InteractionMessageBuilder:
+    """Play the computer's choice against the player's"""
+    # Chosen on the click rather than kept in the custom ID, where it could
+    # be read before choosing
+    return components.update(
+        rps_outcome(components.unpack(fields[0]), random.randrange(3)), []
+    )
 
 
 @tanchi.as_slash_command()
 async def quote(
-    ctx: tanjun.abc.SlashContext, session: alluka.Injected[aiohttp.ClientSession]
+    ctx: tanjun.abc.SlashContext, client: alluka.Injected[upstream.UpstreamClient]
 ) -> None:
     """Responds with a random quote"""
-    async with session.get(
-        "https://api.forismatic.com/api/1.0/?method=getQuote&format=json&lang=en"
-    ) as response:
-        data = await response.json()
+    text, author = await QUOTES.get(client)
 
-        embed = embeds.Embed(
-            title="Quote",
-            description=data["quoteText"],
-        ).set_author(name=data["quoteAuthor"])
+    embed = embeds.Embed(
+        title="Quote",
+        description=text,
+    ).set_author(name=author)
 
-        await ctx.respond(embed)
+    await ctx.respond(embed)
 
 
 loader_fun = tanjun.Component(name="fun").load_from_scope().make_loader()
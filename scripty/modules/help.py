@@ -2,47 +2,33 @@ from __future__ import annotations
 
 __all__: tuple[str, ...] = ("loader_help",)
 
-import miru
+import hikari
 import tanchi
 import tanjun
 
 from scripty import const
 
+HELP_LINKS: tuple[tuple[str, str], ...] = (
+    ("Website", "https://scriptybot.web.app/"),
+    ("Docs", "https://scriptydev.github.io/prescripty/"),
+    ("Commands", "https://scriptydev.github.io/prescripty/reference/"),
+    ("Invite", const.INVITE_URL),
+)
 
-class HelpView(miru.View):
-    def __init__(self) -> None:
-        super().__init__()
-        self.add_item(
-            miru.Button(
-                label="Website",
-                url="https://scriptybot.web.app/",
-            )
-        )
-        self.add_item(
-            miru.Button(
-                label="Docs",
-                url="https://scriptydev.github.io/prescripty/",
-            )
-        )
-        self.add_item(
-            miru.Button(
-                label="Commands",
-                url="https://scriptydev.github.io/prescripty/reference/",
-            )
-        )
-        self.add_item(
-            miru.Button(
-                label="Invite",
-                url=const.INVITE_URL,
-            )
-        )
+
+def _help_buttons() -> hikari.api.ActionRowBuilder:
+    row = hikari.impl.ActionRowBuilder()
+
+    for label, url in HELP_LINKS:
+        row.add_button(hikari.ButtonStyle.LINK, url).set_label(label).add_to_container()
+
+    return row
 
 
 @tanchi.as_slash_command("help")
 async def help_(ctx: tanjun.abc.SlashContext) -> None:
     """Display the help interface"""
-    view = HelpView()
-    await ctx.respond(components=view.build())
+    await ctx.respond(component=_help_buttons())
 
 
 loader_help = tanjun.Component(name="help").load_from_scope().make_loader()
@@ -2,12 +2,25 @@ from __future__ import annotations
 
 __all__: tuple[str, ...] = ("loader_misc",)
 
+import time
+from typing import Sequence
+
+import alluka
 import hikari
 import tanchi
 import tanjun
-from gpytranslate import Translator
 
-from scripty.functions import embeds
+from scripty.functions import autocomplete, components, embeds, polls, translate
+
+_TARGET_LANGUAGES = autocomplete.Completer(
+    (f"{name} ({code})", code) for name, code in translate.LANGUAGES.items()
+)
+_SOURCE_LANGUAGES = autocomplete.Completer(
+    (
+        ("Detect language (auto)", "auto"),
+        *((f"{name} ({code})", code) for name, code in translate.LANGUAGES.items()),
+    )
+)
 
 
 @tanjun.as_user_menu("Avatar")
@@ -26,10 +39,9 @@ async def avatar(
 async def translate_menu(
     ctx: tanjun.abc.MenuContext,
     message: hikari.Message,
+    translator: alluka.Injected[translate.Translator],
 ) -> None:
     """Translate message to English"""
-    translator = Translator()
-
     if not message.content:
         await ctx.respond(
             embeds.Embed(
@@ -39,10 +51,7 @@ async def translate_menu(
         )
         return
 
-    translate = await translator.translate(  # type: ignore
-        message.content, targetlang="en"
-    )
-    translate_lang = await translator.detect(message.content)  # type: ignore
+    translation = await translator.translate(message.content, target="en")
 
     embed = (
         embeds.Embed(title="Translate")
@@ -51,21 +60,43 @@ async def translate_menu(
             icon=message.author.avatar_url or message.author.default_avatar_url,
         )
         .add_field(
-            f"Original <- {translate_lang.upper()}",  # type: ignore
-            f"```{translate.orig}```",  # type: ignore
+            f"Original <- {translation.source.upper()}",
+            f"```{translation.original}```",
         )
-        .add_field("Translated -> EN", f"```{translate.text}```")  # type: ignore
+        .add_field("Translated -> EN", f"```{translation.text}```")
     )
 
     await ctx.respond(embed)
 
 
+async def source_language_autocomplete(
+    ctx: tanjun.abc.AutocompleteContext,
+    source: str,
+) -> None:
+    """Autocomplete for languages to translate from"""
+    await ctx.set_choices(
+        _SOURCE_LANGUAGES.complete(source, session=autocomplete.session_of(ctx))
+    )
+
+
+async def target_language_autocomplete(
+    ctx: tanjun.abc.AutocompleteContext,
+    target: str,
+) -> None:
+    """Autocomplete for languages to translate to"""
+    await ctx.set_choices(
+        _TARGET_LANGUAGES.complete(target, session=autocomplete.session_of(ctx))
+    )
+
+
 @tanchi.as_slash_command("translate")
 async def translate_slash(
     ctx: tanjun.abc.SlashContext,
     text: str,
-    source: str = "auto",
-    target: str = "en",
+    source: tanchi.Autocompleted[source_language_autocomplete] = "auto",
+    target: tanchi.Autocompleted[target_language_autocomplete] = "en",
+    *,
+    translator: alluka.Injected[translate.Translator],
 ) -> None:
     """Translate message to specified language
 
@@ -78,11 +109,7 @@ async def translate_slash(
     target : str
         Language to translate to
     """
-    translator = Translator()
-    translate = await translator.translate(  # type: ignore
-        text, sourcelang=source, targetlang=target
-    )
-    translate_lang = await translator.detect(text)  # type: ignore
+    translation = await translator.translate(text, source=source, target=target)
 
     embed = (
         embeds.Embed(title="Translate")
@@ -91,17 +118,100 @@ async def translate_slash(
             icon=ctx.author.avatar_url or ctx.author.default_avatar_url,
         )
         .add_field(
-            f"Original <- {translate_lang.upper()}",  # type: ignore
-            f"```{translate.orig}```",  # type: ignore
-        )
-        .add_field(
-            f"Translated -> {target.upper()}", f"```{translate.text}```"  # type: ignore
+            f"Original <- {translation.source.upper()}",
+            f"```{translation.original}```",
         )
+        .add_field(f"Translated -> {target.upper()}", f"```{translation.text}```")
     )
 
     await ctx.respond(embed)
 
 
+# Embed limits, with room left for the title and footer
+_PAGE_FIELDS = 10
+_PAGE_CHARS = 5500
+_FIELD_CHARS = 1000
+
+
+@tanchi.as_slash_command("translate-channel")
+async def translate_channel(
+    ctx: tanjun.abc.SlashContext,
+    count: tanchi.Range[1, 100] = 20,
+    target: tanchi.Autocompleted[target_language_autocomplete] = "en",
+    *,
+    translator: alluka.Injected[translate.Translator],
+) -> None:
+    """Translate the most recent messages of this channel
+
+    Parameters
+    ----------
+    count : tanchi.Range[int, int]
+        Number of messages to translate
+    target : str
+        Language to translate to
+    """
+    await ctx.defer()
+
+    messages = [
+        message
+        async for message in ctx.rest.fetch_messages(ctx.channel_id).limit(count)
+        if message.content
+    ]
+    messages.reverse()
+
+    if not messages:
+        await ctx.respond(
+            embeds.Embed(
+                title="Translate Error",
+                description="No messages with text to translate",
+            )
+        )
+        return
+
+    fields: list[tuple[str, str]] = []
+    size = 0
+    page = 1
+    done = 0
+
+    async def send_page() -> None:
+        nonlocal fields, size, page
+
+        embed = embeds.Embed(title="Translate").set_footer(
+            f"Page {page} - translated to {target.upper()}"
+        )
+
+        for name, value in fields:
+            embed.add_field(name, value)
+
+        await ctx.respond(embed)
+        fields, size, page = [], 0, page + 1
+
+    async for translations in translator.translate_many(
+        [message.content or "" for message in messages], target=target
+    ):
+        for message, translation in zip(messages[done:], translations):
+            text = translation.text
+
+            if len(text) > _FIELD_CHARS:
+                text = text[: _FIELD_CHARS - 1] + "\U00002026"
+
+            name = f"{message.author} <- {translation.source.upper()}"
+            value = f"```{text}```"
+
+            if (
+                len(fields) == _PAGE_FIELDS
+                or size + len(name) + len(value) > _PAGE_CHARS
+            ):
+                await send_page()
+
+            fields.append((name, value))
+            size += len(name) + len(value)
+
+        done += len(translations)
+
+    await send_page()
+
+
 @tanjun.with_author_permission_check(hikari.Permissions.MANAGE_MESSAGES)
 @tanchi.as_slash_command()
 async def echo(ctx: tanjun.abc.SlashContext, text: str) -> None:
@@ -134,6 +244,10 @@ async def poll(
     option_8: str | None = None,
     option_9: str | None = None,
     option_10: str | None = None,
+    buttons: bool = False,
+    minutes: tanchi.Range[1, 10080] = 60,
+    *,
+    board: alluka.Injected[polls.PollBoard],
 ) -> None:
     """Create a simple poll
 
@@ -161,6 +275,10 @@ async def poll(
         Option I
     option_10 : str | None
         Option J
+    buttons : bool
+        Vote with buttons and show the tallies
+    minutes : tanchi.Range[int, int]
+        Minutes until a poll with buttons closes
     """
     options: dict[str, str | None] = {
         "1️⃣": option_1,
@@ -175,6 +293,22 @@ async def poll(
         "🔟": option_10,
     }
 
+    if buttons:
+        poll = polls.Poll(
+            0,
+            ctx.channel_id,
+            ctx.author.id,
+            topic,
+            [option for option in options.values() if option is not None],
+            time.time() + minutes * 60,
+        )
+        response = await ctx.respond(
+            poll.embed(), components=poll.buttons(), ensure_result=True
+        )
+        poll.message_id = response.id
+        await board.open(poll)
+        return
+
     embed = embeds.Embed(
         title=topic,
         description="\n\n".join(
@@ -195,4 +329,60 @@ async def poll(
                 pass
 
 
+def _poll_unavailable() -> hikari.api.InteractionMessageBuilder:
+    return components.ephemeral(
+        embeds.Embed(
+            title="Error",
+            description="This poll is closed",
+        )
+    )
+
+
+@components.ROUTER.handler("poll")
+async def poll_vote(
+    interaction: hikari.ComponentInteraction,
+    fields: Sequence[str],
+    board: alluka.Injected[polls.PollBoard],
+) -> hikari.api.InteractionMessageBuilder:
+    """Count a vote, which shows once the poll's message is next edited"""
+    poll = await board.get(interaction.message.id)
+
+    if poll is None:
+        # Closed, so its message shows or is about to show the final tallies
+        return _poll_unavailable()
+
+    try:
+        option = await board.vote(
+            poll, interaction.user.id, components.unpack(fields[0])
+        )
+    except KeyError:
+        return _poll_unavailable()
+
+    return components.ephemeral(
+        embeds.Embed(
+            title="Poll",
+            description=(
+                "Vote withdrawn"
+                if option is None
+                else f"Voted for {polls.NUMBERS[option]} {poll.options[option]}"
+            ),
+        )
+    )
+
+
+@components.ROUTER.handler("poll-close", owned=True)
+async def poll_close(
+    interaction: hikari.ComponentInteraction,
+    _: Sequence[str],
+    board: alluka.Injected[polls.PollBoard],
+) -> hikari.api.InteractionMessageBuilder:
+    """Close a poll early, showing its final tallies"""
+    poll = await board.close_poll(interaction.message.id, edit=False)
+
+    if poll is None:
+        return _poll_unavailable()
+
+    return components.update(poll.embed(closed=True), [])
+
+
 loader_misc = tanjun.Component(name="misc").load_from_scope().make_loader()
@@ -11,7 +11,16 @@ import hikari
 import tanchi
 import tanjun
 
-from scripty.functions import cache, embeds, helpers
+from scripty.functions import (
+    autocomplete,
+    cache,
+    embeds,
+    helpers,
+    instrument,
+    metrics,
+    resolve,
+    snapshot,
+)
 
 component = tanjun.Component(name="mod")
 
@@ -24,7 +33,7 @@ timeout = tanjun.slash_command_group("timeout", "Timeout member")
 @tanchi.as_slash_command()
 async def ban(
     ctx: tanjun.abc.SlashContext,
-    bot: alluka.Injected[hikari.GatewayBot],
+    rest: alluka.Injected[hikari.api.RESTClient],
     user: hikari.User,
     delete_message_days: hikari.UndefinedNoneOr[tanchi.Range[1, 7]] = None,
     reason: hikari.UndefinedNoneOr[str] = None,
@@ -53,9 +62,10 @@ async def ban(
         )
         return
 
-    await bot.rest.ban_user(
+    await rest.ban_user(
         guild, user, delete_message_days=delete_message_days, reason=reason
     )
+    _guild_ban_cache.pop(guild)
 
     await ctx.respond(
         embeds.Embed(
@@ -73,7 +83,7 @@ async def ban(
 @tanchi.as_slash_command(default_to_ephemeral=True)
 async def delete(
     ctx: tanjun.abc.SlashContext,
-    bot: alluka.Injected[hikari.GatewayBot],
+    rest: alluka.Injected[hikari.api.RESTClient],
     amount: tanchi.Range[1, ...],
 ) -> None:
     """Purge messages from channel
@@ -95,7 +105,7 @@ async def delete(
     bulk_delete_limit = helpers.datetime_utcnow_aware() - datetime.timedelta(days=14)
 
     iterator = (
-        bot.rest.fetch_messages(channel)
+        rest.fetch_messages(channel)
         .take_while(lambda message: message.created_at > bulk_delete_limit)
         .limit(amount)
     )
@@ -104,7 +114,7 @@ async def delete(
     tasks: Any | None = []
     async for messages in iterator.chunk(100):
         count += len(messages)
-        task = asyncio.create_task(bot.rest.delete_messages(channel, messages))
+        task = asyncio.create_task(rest.delete_messages(channel, messages))
         tasks.append(task)
 
     if not tasks:
@@ -140,7 +150,7 @@ async def delete(
 @tanchi.as_slash_command()
 async def kick(
     ctx: tanjun.abc.SlashContext,
-    bot: alluka.Injected[hikari.GatewayBot],
+    rest: alluka.Injected[hikari.api.RESTClient],
     member: hikari.Member,
     reason: hikari.UndefinedNoneOr[str] = None,
 ) -> None:
@@ -165,7 +175,7 @@ async def kick(
         )
         return
 
-    await bot.rest.kick_user(guild, member)
+    await rest.kick_user(guild, member)
     await ctx.respond(
         embeds.Embed(
             title="Kick",
@@ -183,7 +193,8 @@ async def kick(
 @tanchi.as_slash_command("enable")
 async def slowmode_enable(
     ctx: tanjun.abc.SlashContext,
-    bot: alluka.Injected[hikari.GatewayBot],
+    rest: alluka.Injected[hikari.api.RESTClient],
+    resolver: alluka.Injected[resolve.Resolver],
     duration: tanchi.Converted[datetime.timedelta, helpers.parse_to_timedelta_from_now],
     channel: hikari.TextableGuildChannel | None = None,
 ) -> None:
@@ -196,13 +207,16 @@ async def slowmode_enable(
     channel : hikari.TextableGuildChannel
         Channel to enable slowmode
     """
-    channel = channel or ctx.get_channel()
+    resolved_channel: hikari.PartialChannel | None = channel
+
+    if resolved_channel is None and ctx.guild_id is not None:
+        resolved_channel = await resolver.channel(ctx.channel_id)
     duration_limit = datetime.timedelta(hours=6)
     error = embeds.Embed(
         title="Slowmode Error",
     )
 
-    if channel is None:
+    if resolved_channel is None:
         error.description = (
             "This command must be invoked in a valid textable guild channel!"
         )
@@ -219,11 +233,13 @@ async def slowmode_enable(
         await ctx.respond(error)
         return
 
-    await bot.rest.edit_channel(channel, rate_limit_per_user=duration)
+    await rest.edit_channel(resolved_channel, rate_limit_per_user=duration)
     await ctx.respond(
         embeds.Embed(
             title="Slowmode",
-            description=f"Enabled slowmode for **{str(channel)}** to `{duration}s`",
+            description=(
+                f"Enabled slowmode for **{str(resolved_channel)}** to `{duration}s`"
+            ),
         )
     )
 
@@ -234,7 +250,8 @@ async def slowmode_enable(
 @tanchi.as_slash_command("disable")
 async def slowmode_disable(
     ctx: tanjun.abc.SlashContext,
-    bot: alluka.Injected[hikari.GatewayBot],
+    rest: alluka.Injected[hikari.api.RESTClient],
+    resolver: alluka.Injected[resolve.Resolver],
     channel: hikari.TextableGuildChannel | None = None,
 ) -> None:
     """Disable slowmode for channel
@@ -244,9 +261,12 @@ async def slowmode_disable(
     channel : hikari.TextableGuildChannel
         Channel to disable slowmode
     """
-    channel = channel or ctx.get_channel()
+    resolved_channel: hikari.PartialChannel | None = channel
+
+    if resolved_channel is None and ctx.guild_id is not None:
+        resolved_channel = await resolver.channel(ctx.channel_id)
 
-    if channel is None:
+    if resolved_channel is None:
         await ctx.respond(
             embeds.Embed(
                 title="Slowmode Error",
@@ -255,11 +275,11 @@ async def slowmode_disable(
         )
         return
 
-    await bot.rest.edit_channel(channel, rate_limit_per_user=0)
+    await rest.edit_channel(resolved_channel, rate_limit_per_user=0)
     await ctx.respond(
         embeds.Embed(
             title="Slowmode",
-            description=f"Removed slowmode from **{str(channel)}**",
+            description=f"Removed slowmode from **{str(resolved_channel)}**",
         )
     )
 
@@ -347,14 +367,23 @@ async def timeout_remove(ctx: tanjun.abc.SlashContext, member: hikari.Member) ->
         )
 
 
-# _guild_ban_cache_map: dict[hikari.Snowflake, Sequence[hikari.GuildBan]] = {}
-_guild_ban_cache_map = cache.LRUCachedDict(cache_len=100)
+# Banned users of each guild as compact (name, ID) pairs
+_guild_ban_cache: cache.TTLCache[
+    hikari.Snowflake, tuple[tuple[str, int], ...]
+] = snapshot.REGISTRY.get_or_create(
+    "mod.guild_bans", lambda: cache.TTLCache(ttl=3600, cache_len=100)
+)
+metrics.CACHE_SIZE.set_function(lambda: len(_guild_ban_cache), "mod.guild_bans")
+# Completers built from the cached bans, rebuilt when those are replaced
+_guild_ban_completers: cache.TTLCache[
+    hikari.Snowflake, tuple[tuple[tuple[str, int], ...], autocomplete.Completer]
+] = cache.TTLCache(ttl=3600, cache_len=100)
 
 
 async def unban_user_autocomplete(
     ctx: tanjun.abc.AutocompleteContext,
     user: str,
-    bot: alluka.Injected[hikari.GatewayBot],
+    rest: alluka.Injected[hikari.api.RESTClient],
 ) -> None:
     """Autocomplete for banned users"""
     guild = ctx.guild_id
@@ -362,21 +391,25 @@ async def unban_user_autocomplete(
     if guild is None:
         return
 
-    if guild not in _guild_ban_cache_map.keys():
-        _guild_ban_cache_map[guild] = await bot.rest.fetch_bans(guild)
+    bans = _guild_ban_cache.get(guild)
 
-    ban_map: dict[str, str] = {}
+    if bans is None:
+        bans = tuple(
+            (str(ban_entry.user), int(ban_entry.user.id))
+            for ban_entry in await rest.fetch_bans(guild)
+        )
+        _guild_ban_cache.set(guild, bans)
+
+    entry = _guild_ban_completers.get(guild)
 
-    for ban_entry in _guild_ban_cache_map[guild]:
-        if len(ban_map) == 10:
-            break
-        if (
-            user.lower() in str(ban_entry.user).lower()
-            or user.lower() in str(ban_entry.user.id).lower()
-        ):
-            ban_map[str(ban_entry.user)] = str(ban_entry.user.id)
+    if entry is None or entry[0] is not bans:
+        entry = (
+            bans,
+            autocomplete.Completer((name, str(user_id)) for name, user_id in bans),
+        )
+        _guild_ban_completers.set(guild, entry)
 
-    await ctx.set_choices(ban_map)
+    await ctx.set_choices(entry[1].complete(user, session=autocomplete.session_of(ctx)))
 
 
 @tanjun.with_own_permission_check(hikari.Permissions.BAN_MEMBERS)
@@ -384,7 +417,7 @@ async def unban_user_autocomplete(
 @tanchi.as_slash_command()
 async def unban(
     ctx: tanjun.abc.SlashContext,
-    bot: alluka.Injected[hikari.GatewayBot],
+    rest: alluka.Injected[hikari.api.RESTClient],
     user: tanchi.Autocompleted[unban_user_autocomplete, tanjun.to_user],
 ) -> None:
     """Unban user from server
@@ -406,7 +439,8 @@ async def unban(
         return
 
     try:
-        await bot.rest.unban_user(guild, user)
+        await rest.unban_user(guild, user)
+        _guild_ban_cache.pop(guild)
     except hikari.NotFoundError:
         await ctx.respond(
             embeds.Embed(
@@ -423,13 +457,11 @@ async def unban(
         )
 
 
-@component.with_listener(hikari.BanDeleteEvent)
-async def on_ban_delete(event: hikari.BanDeleteEvent) -> None:
-    """Remove ban cache entry when ban is deleted"""
-    try:
-        del _guild_ban_cache_map[event.guild_id]
-    except KeyError:
-        pass
+@component.with_listener(hikari.BanCreateEvent, hikari.BanDeleteEvent)
+@instrument.listener
+async def on_ban_change(event: hikari.BanEvent) -> None:
+    """Remove ban cache entry when a ban is created or deleted"""
+    _guild_ban_cache.pop(event.guild_id)
 
 
 loader_mod = component.load_from_scope().make_loader()
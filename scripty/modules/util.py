@@ -4,44 +4,61 @@ __all__: tuple[str, ...] = ("loader_util",)
 
 import datetime
 import platform
+import time
 from typing import Sequence
 
 import alluka
 import hikari
-import miru
-import psutil
 import tanchi
 import tanjun
 
 import scripty
 from scripty import const
-from scripty.functions import datastore, embeds, helpers
+from scripty.functions import (
+    chunking,
+    cluster,
+    datastore,
+    embeds,
+    helpers,
+    resolve,
+    sampler,
+    watchdog,
+)
 
 stats = tanjun.slash_command_group("stats", "Statistics related to Scripty")
 info = tanjun.slash_command_group("info", "Get information")
 
-
-class InviteView(miru.View):
-    def __init__(self) -> None:
-        super().__init__()
-        self.add_item(
-            miru.Button(
-                label="Add to Server",
-                url=const.INVITE_URL,
-            )
-        )
+GIB = 1024**3
+MIB = 1024**2
+HISTORY_WINDOWS: tuple[tuple[str, float], ...] = (
+    ("1m", 60.0),
+    ("15m", 900.0),
+    ("1h", 3600.0),
+)
+
+
+def _invite_button() -> hikari.api.ActionRowBuilder:
+    return (
+        hikari.impl.ActionRowBuilder()
+        .add_button(hikari.ButtonStyle.LINK, const.INVITE_URL)
+        .set_label("Add to Server")
+        .add_to_container()
+    )
 
 
 @stats.with_command
 @tanchi.as_slash_command("about")
 async def stats_about(
     ctx: tanjun.abc.SlashContext,
-    bot: alluka.Injected[hikari.GatewayBot],
+    resolver: alluka.Injected[resolve.Resolver],
+    cluster_state: alluka.Injected[cluster.ClusterState],
 ) -> None:
     """About the Scripty Discord bot"""
-    bot_user = bot.get_me() or await bot.rest.fetch_my_user()
+    bot_user = await resolver.me()
+    guild_count = cluster_state.guild_count()
 
-    view = InviteView()
+    if guild_count is None:
+        guild_count = await resolver.guild_count()
 
     embed = (
         embeds.Embed(title="About")
@@ -53,7 +70,7 @@ async def stats_about(
         .add_field("Language", f"Python {platform.python_version()}", inline=True)
         .add_field("Library", f"Hikari {hikari.__version__}", inline=True)
         .add_field("Repository", f"[GitHub]({scripty.__repository__})", inline=True)
-        .add_field("Guilds", str(await bot.rest.fetch_my_guilds().count()), inline=True)
+        .add_field("Guilds", str(guild_count), inline=True)
         .add_field("Developer", scripty.__discord__, inline=True)
         .add_field(
             "Created", helpers.discord_timestamp(bot_user.created_at, "F"), inline=True
@@ -61,37 +78,68 @@ async def stats_about(
         .set_footer("#StandWithUkraine")
     )
 
-    await ctx.respond(embed, components=view.build())
+    await ctx.respond(embed, component=_invite_button())
 
 
 @stats.with_command
 @tanchi.as_slash_command("ping")
 async def stats_ping(
     ctx: tanjun.abc.SlashContext,
-    bot: alluka.Injected[hikari.GatewayBot],
+    rest: alluka.Injected[hikari.api.RESTClient],
+    shards: alluka.Injected[hikari.ShardAware | None],
 ) -> None:
     """Replies with bot latency"""
-    await ctx.respond(
-        embeds.Embed(
-            title="Ping",
-            description=f"Pong! `{round(bot.heartbeat_latency * 1000)}ms`",
+    if shards is not None:
+        description = f"Pong! `{round(shards.heartbeat_latency * 1000)}ms`"
+
+    else:
+        # Served over HTTP interactions there is no gateway heartbeat to report
+        start = time.perf_counter()
+        await rest.fetch_my_user()
+        latency = time.perf_counter() - start
+        description = f"Pong! `{round(latency * 1000)}ms` REST round trip"
+
+    await ctx.respond(embeds.Embed(title="Ping", description=description))
+
+
+def _format_history(
+    system_sampler: sampler.SystemSampler,
+    field: sampler.SampleField,
+    scale: float = 1,
+    unit: str = "",
+) -> str:
+    """Format the min/avg/max of a sampled field over each history window"""
+    lines: list[str] = []
+
+    for label, window in HISTORY_WINDOWS:
+        summary = system_sampler.summarize(field, window)
+
+        if summary is None:
+            return "No samples yet"
+
+        lines.append(
+            f"`{label}` "
+            + "/".join(f"{round(value / scale, 1)}" for value in summary)
+            + unit
         )
-    )
+
+    return "\n".join(lines)
 
 
 @stats.with_command
 @tanchi.as_slash_command("system")
 async def stats_system(
     ctx: tanjun.abc.SlashContext,
-    bot: alluka.Injected[hikari.GatewayBot],
+    resolver: alluka.Injected[resolve.Resolver],
     ds: alluka.Injected[datastore.DataStore],
+    system_sampler: alluka.Injected[sampler.SystemSampler],
+    loop_monitor: alluka.Injected[watchdog.LoopMonitor],
 ) -> None:
     """Bot system information"""
-    app_user = bot.get_me() or await bot.rest.fetch_my_user()
+    app_user = await resolver.me()
 
-    boot_timestamp = psutil.boot_time()
     boot_resolved_relative = helpers.discord_timestamp(
-        datetime.datetime.fromtimestamp(boot_timestamp), "R"
+        datetime.datetime.fromtimestamp(system_sampler.boot_time), "R"
     )
 
     start_time_timestamp = ds.start_time
@@ -107,23 +155,63 @@ async def stats_system(
         .add_field("Platform", platform.platform(aliased=True, terse=True), inline=True)
         .add_field("Machine", platform.machine(), inline=True)
         .add_field("Processor", platform.processor(), inline=True)
-        .add_field("CPU", f"{psutil.cpu_percent(interval=None)}%", inline=True)
-        .add_field(
+    )
+
+    sample = system_sampler.latest
+
+    if sample is not None:
+        embed.add_field("Process CPU", f"{sample.cpu_percent}%", inline=True)
+        embed.add_field(
             "Memory",
-            f"{round(psutil.virtual_memory().used / 1.074e+9, 1)}/"
-            f"{round(psutil.virtual_memory().total / 1.074e+9, 1)}GiB",
-            inline=True,
-        )
-        .add_field(
-            "Host",
-            f"Booted {boot_resolved_relative}",
+            f"{round(sample.memory_used / GIB, 1)}/"
+            f"{round(sample.memory_total / GIB, 1)}GiB",
             inline=True,
         )
-        .add_field(
-            "Process",
-            f"Online {start_time_resolved_relative}",
+        embed.add_field("RSS", f"{round(sample.rss / MIB, 1)}MiB", inline=True)
+        embed.add_field("Open Files", str(sample.open_fds), inline=True)
+        embed.add_field("Tasks", str(sample.tasks), inline=True)
+        embed.add_field(
+            "GC",
+            f"{sample.gc_collections} collections\n"
+            f"`{'/'.join(str(count) for count in sample.gc_counts)}` pending",
             inline=True,
         )
+
+    embed.add_field(
+        "Host",
+        f"Booted {boot_resolved_relative}",
+        inline=True,
+    )
+    embed.add_field(
+        "Process",
+        f"Online {start_time_resolved_relative}",
+        inline=True,
+    )
+    lag = loop_monitor.percentiles(0.5, 0.95, 0.99, 1.0)
+    lag_resolved = (
+        "No samples yet"
+        if lag is None
+        else "/".join(f"{round(value * 1000, 1)}" for value in lag) + "ms"
+    )
+    embed.add_field(
+        "Loop Lag p50/p95/p99/max",
+        f"{lag_resolved}\n`{len(loop_monitor.stalls)}` recent stalls",
+        inline=True,
+    )
+    embed.add_field(
+        "Process CPU min/avg/max",
+        _format_history(system_sampler, "cpu_percent", unit="%"),
+        inline=True,
+    )
+    embed.add_field(
+        "RSS min/avg/max",
+        _format_history(system_sampler, "rss", scale=MIB, unit="MiB"),
+        inline=True,
+    )
+    embed.add_field(
+        "Tasks min/avg/max",
+        _format_history(system_sampler, "tasks"),
+        inline=True,
     )
 
     await ctx.respond(embed)
@@ -133,6 +221,7 @@ async def stats_system(
 @tanchi.as_slash_command("user")
 async def info_user(
     ctx: tanjun.abc.SlashContext,
+    resolver: alluka.Injected[resolve.Resolver],
     user: hikari.User | None = None,
 ) -> None:
     """Get information about user
@@ -145,8 +234,12 @@ async def info_user(
     if not user:
         user = ctx.member or ctx.author
 
-    member: bool = isinstance(user, hikari.InteractionMember)
-    roles: Sequence[hikari.Role] = user.get_roles() if member else []
+    member: hikari.Member | None = None
+
+    if isinstance(user, hikari.Member):
+        member = user
+    elif ctx.guild_id is not None:
+        member = await resolver.member(ctx.guild_id, user)
 
     embed = (
         embeds.Embed(title="Info")
@@ -163,16 +256,28 @@ async def info_user(
         .set_thumbnail(user.avatar_url or user.default_avatar_url)
     )
 
-    if member:
-        embed.add_field(
-            "Joined", helpers.discord_timestamp(user.joined_at, "R"), inline=True
-        )
-        embed.add_field("Nickname", str(user.nickname), inline=True)
-        embed.add_field("Roles", " ".join(role.mention for role in roles))
+    if member is not None:
+        roles: Sequence[hikari.Role] = member.get_roles()
+
+        if not roles and ctx.guild_id is not None:
+            guild_roles = resolver.roles(await resolver.guild(ctx.guild_id))
+            roles = [
+                guild_roles[role_id]
+                for role_id in member.role_ids
+                if role_id in guild_roles
+            ]
+
         embed.add_field(
-            "Permissions",
-            " ".join(f"`{permission}`" for permission in user.permissions),
+            "Joined", helpers.discord_timestamp(member.joined_at, "R"), inline=True
         )
+        embed.add_field("Nickname", str(member.nickname), inline=True)
+        embed.add_field("Roles", " ".join(role.mention for role in roles) or "None")
+
+        if isinstance(member, hikari.InteractionMember):
+            embed.add_field(
+                "Permissions",
+                " ".join(f"`{permission}`" for permission in member.permissions),
+            )
 
     await ctx.respond(embed)
 
@@ -181,7 +286,7 @@ async def info_user(
 @tanchi.as_slash_command("server")
 async def info_server(
     ctx: tanjun.abc.SlashContext,
-    bot: alluka.Injected[hikari.GatewayBot],
+    resolver: alluka.Injected[resolve.Resolver],
 ) -> None:
     """Get information about server"""
     guild = ctx.guild_id
@@ -195,25 +300,28 @@ async def info_server(
         )
         return
 
-    guild = await bot.rest.fetch_guild(guild)
+    guild = await resolver.guild(guild)
+    owner = await resolver.owner(guild)
+    active_member_count, member_count = await resolver.member_counts(guild)
 
     embed = (
         embeds.Embed(title="Info")
         .add_field("Name", guild.name, inline=True)
         .add_field("ID", str(guild.id), inline=True)
-        .add_field("Owner", str(await guild.fetch_owner()), inline=True)
+        .add_field("Owner", str(owner or guild.owner_id), inline=True)
         .add_field(
             "Created", helpers.discord_timestamp(guild.created_at, "R"), inline=True
         )
         .add_field(
             "Members",
-            f"{guild.approximate_active_member_count}/"
-            f"{guild.approximate_member_count}",
+            str(member_count)
+            if active_member_count is None
+            else f"{active_member_count}/{member_count}",
             inline=True,
         )
-        .add_field("Channels", str(len(guild.get_channels())), inline=True)
-        .add_field("Roles", str(len(guild.get_roles())), inline=True)
-        .add_field("Emoji", str(len(guild.emojis)), inline=True)
+        .add_field("Channels", str(len(await resolver.channels(guild))), inline=True)
+        .add_field("Roles", str(len(resolver.roles(guild))), inline=True)
+        .add_field("Emoji", str(len(resolver.emojis(guild))), inline=True)
         .add_field("Region", guild.preferred_locale, inline=True)
         .add_field("Premium Boosts", str(guild.premium_subscription_count), inline=True)
         .add_field("Premium Tier", str(guild.premium_tier), inline=True)
@@ -263,6 +371,7 @@ async def info_role(
 @tanchi.as_slash_command("channel")
 async def info_channel(
     ctx: tanjun.abc.SlashContext,
+    resolver: alluka.Injected[resolve.Resolver],
     channel: hikari.GuildChannel | None = None,
 ) -> None:
     """Get information about channel
@@ -272,9 +381,12 @@ async def info_channel(
     channel : hikari.Channel
         The channel to get information about
     """
-    channel = channel or ctx.get_channel()
+    resolved_channel: hikari.PartialChannel | None = channel
 
-    if channel is None:
+    if resolved_channel is None and ctx.guild_id is not None:
+        resolved_channel = await resolver.channel(ctx.channel_id)
+
+    if resolved_channel is None:
         await ctx.respond(
             embeds.Embed(
                 title="Info Error",
@@ -287,12 +399,14 @@ async def info_channel(
 
     embed = (
         embeds.Embed(title="Info")
-        .add_field("Name", str(channel.name), inline=True)
-        .add_field("ID", str(channel.id), inline=True)
+        .add_field("Name", str(resolved_channel.name), inline=True)
+        .add_field("ID", str(resolved_channel.id), inline=True)
         .add_field(
-            "Created", helpers.discord_timestamp(channel.created_at, "R"), inline=True
+            "Created",
+            helpers.discord_timestamp(resolved_channel.created_at, "R"),
+            inline=True,
         )
-        .add_field("Type", str(channel.type), inline=True)
+        .add_field("Type", str(resolved_channel.type), inline=True)
     )
 
     await ctx.respond(embed)
@@ -330,4 +444,9 @@ async def info_invite(
     await ctx.respond(embed)
 
 
-loader_util = tanjun.Component(name="util").load_from_scope().make_loader()
+loader_util = (
+    tanjun.Component(name="util")
+    .set_hooks(tanjun.AnyHooks().set_pre_execution(chunking.pre_execution))
+    .load_from_scope()
+    .make_loader()
+)
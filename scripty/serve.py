@@ -0,0 +1,160 @@
+"""Serve application commands over HTTP interactions instead of the gateway
+
+Every module with application commands is served, resolving what it would
+read from the gateway cache over REST, so any number of these processes can
+run behind a load balancer. Once the application's Interactions Endpoint URL
+points at them, Discord sends every interaction over HTTP, and the gateway
+process only keeps the automod listeners and the owner's message commands. Set
+``SERVE_INTERACTIONS`` for both, so that these processes declare the served
+commands and the gateway process does not replace them with its own.
+
+Usage: ``python -m scripty.serve``
+"""
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("MODULES", "build_rest_bot", "start_rest_app")
+
+import os
+import pathlib
+from typing import Final, Iterable
+
+import alluka
+import hikari
+import tanjun
+
+from scripty import bot as bot_
+from scripty import config
+from scripty.functions import (
+    cluster,
+    components,
+    datastore,
+    declare,
+    exporter,
+    helpers,
+    metrics,
+    polls,
+    resolve,
+    sampler,
+    watchdog,
+)
+
+MODULES: Final[tuple[str, ...]] = ("fun", "help", "misc", "mod", "util")
+"""The modules served over HTTP interactions"""
+
+
+def build_rest_bot(
+    modules: Iterable[str] = MODULES,
+    *,
+    public_key: str | bytes | None = None,
+) -> tuple[hikari.RESTBot, tanjun.Client]:
+    """Build the interaction server bot
+
+    Parameters
+    ----------
+    modules : Iterable[str]
+        The names of the modules to serve
+    public_key : str | bytes | None
+        The key interaction requests are verified with, defaults to the
+        configured key or else the application's key
+    """
+    bot = hikari.RESTBot(
+        config.DISCORD_TOKEN,
+        "Bot",
+        public_key=public_key or config.PUBLIC_KEY or None,
+    )
+    client = (
+        tanjun.Client.from_rest_bot(bot)
+        .load_modules(*(f"scripty.modules.{module}" for module in modules))
+        .add_client_callback(tanjun.ClientCallbackNames.STARTING, on_client_starting)
+        .add_client_callback(tanjun.ClientCallbackNames.STARTED, on_client_started)
+        .add_client_callback(tanjun.ClientCallbackNames.CLOSING, on_client_closing)
+        .add_client_callback(
+            tanjun.ClientCallbackNames.CLOSING, bot_.close_shared_dependencies
+        )
+        .set_type_dependency(datastore.DataStore, datastore.DataStore())
+        # Not part of a cluster, so guild counts are resolved over REST
+        .set_type_dependency(cluster.ClusterState, cluster.ClusterState())
+        .set_hooks(bot_.create_hooks())
+    )
+
+    async def on_startup(_: hikari.RESTBot) -> None:
+        await client.open()
+
+    async def on_shutdown(_: hikari.RESTBot) -> None:
+        await client.close()
+
+    components.ROUTER.set_injector(client.injector)
+    bot.set_listener(hikari.ComponentInteraction, components.ROUTER.on_rest_interaction)
+    bot.add_startup_callback(on_startup)
+    bot.add_shutdown_callback(on_shutdown)
+
+    return bot, client
+
+
+def start_rest_app() -> None:
+    """Start the interaction server"""
+    bot, _ = build_rest_bot()
+    bot.run(host=config.INTERACTION_HOST, port=config.INTERACTION_PORT)
+
+
+async def on_client_starting(
+    client: alluka.Injected[tanjun.Client],
+    ds: alluka.Injected[datastore.DataStore],
+) -> None:
+    """Setup to execute during client startup"""
+    ds.start_time = helpers.datetime_utcnow_aware()
+    bot_.set_shared_dependencies(client)
+    # Every process receiving votes counts them in the same file
+    poll_board = polls.PollBoard(
+        client.rest, path=pathlib.Path(config.STATE_DIR, "polls.sqlite3")
+    )
+    await poll_board.start()
+    client.set_type_dependency(polls.PollBoard, poll_board)
+    client.set_type_dependency(resolve.Resolver, resolve.Resolver(None, client.rest))
+
+    system_sampler = sampler.SystemSampler()
+    system_sampler.start()
+    client.set_type_dependency(sampler.SystemSampler, system_sampler)
+
+    loop_monitor = watchdog.LoopMonitor()
+    loop_monitor.start()
+    client.set_type_dependency(watchdog.LoopMonitor, loop_monitor)
+
+    metrics_server = exporter.MetricsServer(config.METRICS_HOST, config.METRICS_PORT)
+
+    if config.METRICS_PORT:
+        await metrics_server.start()
+
+    client.set_type_dependency(exporter.MetricsServer, metrics_server)
+    metrics.READY.set(1)
+
+
+async def on_client_started(client: alluka.Injected[tanjun.Client]) -> None:
+    """Declare the served application commands once the client has started"""
+    # Only the served commands are answered, so they are the whole command set
+    if config.SERVE_INTERACTIONS:
+        await declare.sync_commands(client)
+
+
+async def on_client_closing(
+    poll_board: alluka.Injected[polls.PollBoard],
+    system_sampler: alluka.Injected[sampler.SystemSampler],
+    loop_monitor: alluka.Injected[watchdog.LoopMonitor],
+    metrics_server: alluka.Injected[exporter.MetricsServer],
+) -> None:
+    """Actions to perform while client shutdown"""
+    metrics.READY.set(0)
+    await poll_board.close()
+    await system_sampler.close()
+    await loop_monitor.close()
+    await metrics_server.close()
+    components.ROUTER.close()
+
+
+if __name__ == "__main__":
+    if os.name != "nt":
+        import uvloop
+
+        uvloop.install()
+
+    start_rest_app()
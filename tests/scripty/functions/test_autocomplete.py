@@ -0,0 +1,50 @@
+import unittest
+
+from scripty.functions import autocomplete
+
+CHOICES = {
+    "Chess In The Park": "832012774040141894",
+    "Checkers In The Park": "832013003968348200",
+    "Poker Night": "755827207812677713",
+    "Café Games": "1",
+}
+
+
+class TestCompleter(unittest.TestCase):
+    def test_prefix_matches_rank_first(self) -> None:
+        completer = autocomplete.Completer(CHOICES)
+
+        self.assertEqual(
+            list(completer.complete("park")),
+            ["Chess In The Park", "Checkers In The Park"],
+        )
+        self.assertEqual(list(completer.complete("PO")), ["Poker Night"])
+        self.assertEqual(list(completer.complete("e")), list(CHOICES))
+        self.assertEqual(
+            list(completer.complete("in the")),
+            ["Chess In The Park", "Checkers In The Park"],
+        )
+
+    def test_matches_values_and_folds_accents(self) -> None:
+        completer = autocomplete.Completer(CHOICES)
+
+        self.assertEqual(
+            completer.complete("7558"), {"Poker Night": "755827207812677713"}
+        )
+        self.assertEqual(completer.complete("cafe"), {"Café Games": "1"})
+
+    def test_session_narrows_previous_matches(self) -> None:
+        completer = autocomplete.Completer(CHOICES)
+        completer.complete("ch", session=1)
+        # A rescan would now find "Poker Night" too
+        completer._keys = (*completer._keys[:2], "che", completer._keys[3])
+
+        self.assertEqual(completer._matches("che", 1).tolist(), [0, 1])
+        self.assertEqual(completer._matches("che", None).tolist(), [0, 1, 2])
+
+    def test_empty_query_lists_first_choices(self) -> None:
+        completer = autocomplete.Completer(CHOICES, limit=2)
+
+        self.assertEqual(
+            list(completer.complete("")), ["Chess In The Park", "Checkers In The Park"]
+        )
@@ -0,0 +1,40 @@
+import time
+import unittest
+
+from scripty.functions import cache
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_expiry(self) -> None:
+        ttl_cache: cache.TTLCache[str, int] = cache.TTLCache(ttl=60.0, cache_len=10)
+        ttl_cache.set("fresh", 1)
+        ttl_cache.set("stale", 2, ttl=0.0)
+
+        self.assertEqual(ttl_cache.get("fresh"), 1)
+        self.assertIsNone(ttl_cache.get("stale"))
+        self.assertNotIn("stale", ttl_cache)
+        self.assertEqual(len(ttl_cache), 1)
+
+    def test_lru_eviction(self) -> None:
+        ttl_cache: cache.TTLCache[int, int] = cache.TTLCache(ttl=60.0, cache_len=2)
+        ttl_cache.set(1, 1)
+        ttl_cache.set(2, 2)
+        ttl_cache.get(1)
+        ttl_cache.set(3, 3)
+
+        self.assertEqual(sorted(key for key, _, _ in ttl_cache.items()), [1, 3])
+
+    def test_items_remaining_ttl(self) -> None:
+        ttl_cache: cache.TTLCache[str, int] = cache.TTLCache(ttl=60.0, cache_len=10)
+        ttl_cache.set("key", 1)
+        time.sleep(0.01)
+
+        ((key, value, remaining),) = ttl_cache.items()
+        self.assertEqual((key, value), ("key", 1))
+        self.assertLess(remaining, 60.0)
+        self.assertEqual(ttl_cache.pop("key"), 1)
+        self.assertEqual(len(ttl_cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import hikari
+
+from scripty.functions import chunking
+
+
+def _build_bot() -> mock.Mock:
+    bot = mock.Mock(hikari.GatewayBot)
+    bot.intents = hikari.Intents.GUILDS | hikari.Intents.GUILD_MEMBERS
+    bot.cache = mock.Mock()
+    bot.cache.settings.components = hikari.api.CacheComponents.MEMBERS
+    bot.request_guild_members = mock.AsyncMock()
+    return bot
+
+
+def _chunk_event(guild_id: int) -> mock.Mock:
+    return mock.Mock(guild_id=hikari.Snowflake(guild_id), chunk_index=0, chunk_count=1)
+
+
+class TestChunkScheduler(unittest.IsolatedAsyncioTestCase):
+    def test_disabled_without_intent(self) -> None:
+        bot = _build_bot()
+        bot.intents = hikari.Intents.GUILDS
+        scheduler = chunking.ChunkScheduler(bot)
+        scheduler.request(1)
+
+        self.assertFalse(scheduler.enabled)
+        self.assertIsNone(scheduler._pop())
+
+    def test_priority(self) -> None:
+        scheduler = chunking.ChunkScheduler(_build_bot())
+        scheduler.request(1, chunking.BACKGROUND)
+        scheduler.request(2, chunking.BACKGROUND)
+        scheduler.request(2, chunking.INTERACTIVE)
+        scheduler.request(2, chunking.BACKGROUND)
+
+        self.assertEqual(scheduler._pop(), 2)
+        self.assertEqual(scheduler._pop(), 1)
+        self.assertIsNone(scheduler._pop())
+
+    async def test_send_and_evict(self) -> None:
+        bot = _build_bot()
+        scheduler = chunking.ChunkScheduler(bot, rate=1000, idle=0)
+        scheduler.start()
+        scheduler.request(1)
+        await asyncio.sleep(0.01)
+
+        bot.request_guild_members.assert_awaited_once_with(1)
+        await scheduler._on_member_chunk(_chunk_event(1))
+        self.assertIn(1, scheduler.chunked)
+
+        scheduler.request(1)
+        await asyncio.sleep(0.01)
+        bot.request_guild_members.assert_awaited_once()
+
+        own_member = bot.cache.get_member.return_value
+        self.assertEqual(scheduler.evict_idle(), [1])
+        bot.cache.clear_members_for_guild.assert_called_once_with(1)
+        bot.cache.set_member.assert_called_once_with(own_member)
+        self.assertNotIn(1, scheduler.chunked)
+
+        await scheduler.close()
+
+    async def test_guild_create(self) -> None:
+        bot = _build_bot()
+        scheduler = chunking.ChunkScheduler(bot, rate=1000)
+        scheduler.start()
+
+        small = mock.Mock(guild_id=hikari.Snowflake(1), guild=mock.Mock(is_large=False))
+        await scheduler._on_guild_available(small)
+        scheduler.request(1)
+        self.assertIn(1, scheduler.chunked)
+
+        large = mock.Mock(guild_id=hikari.Snowflake(2), guild=mock.Mock(is_large=True))
+        await scheduler._on_member_chunk(_chunk_event(2))
+        await scheduler._on_guild_available(large)
+        self.assertNotIn(2, scheduler.chunked)
+        await asyncio.sleep(0.01)
+
+        bot.request_guild_members.assert_awaited_once_with(2)
+        await scheduler.close()
+
+    async def test_send_survives_failed_request(self) -> None:
+        bot = _build_bot()
+        bot.request_guild_members.side_effect = [
+            hikari.MissingIntentError(hikari.Intents.GUILD_MEMBERS),
+            None,
+        ]
+        scheduler = chunking.ChunkScheduler(bot, rate=1000)
+        scheduler.start()
+
+        with self.assertLogs("scripty.chunking", "ERROR"):
+            scheduler.request(1)
+            await asyncio.sleep(0.01)
+
+        scheduler.request(2)
+        await asyncio.sleep(0.01)
+
+        bot.request_guild_members.assert_has_awaits([mock.call(1), mock.call(2)])
+        await scheduler.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
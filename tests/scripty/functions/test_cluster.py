@@ -0,0 +1,20 @@
+import unittest
+
+from scripty.functions import cluster
+
+
+class TestCluster(unittest.TestCase):
+    def test_shard_ranges(self) -> None:
+        self.assertEqual(
+            cluster.shard_ranges(10, 4), [[0, 1, 2], [3, 4, 5], [6, 7], [8, 9]]
+        )
+        self.assertEqual(cluster.shard_ranges(2, 8), [[0], [1]])
+        self.assertEqual(cluster.shard_ranges(3, 0), [[0, 1, 2]])
+
+    def test_standalone_guild_count(self) -> None:
+        self.assertFalse(cluster.ClusterState().is_clustered)
+        self.assertIsNone(cluster.ClusterState().guild_count())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import datetime
+import unittest
+from typing import Sequence
+from unittest import mock
+
+import alluka
+import hikari
+
+from scripty.functions import components, helpers
+
+
+def _message(age: float, *, disabled: bool = False) -> hikari.Message:
+    message = mock.Mock(hikari.Message, channel_id=1, id=2, edited_timestamp=None)
+    message.created_at = helpers.datetime_utcnow_aware() - datetime.timedelta(
+        seconds=age
+    )
+    button = mock.Mock(hikari.ButtonComponent, is_disabled=disabled)
+    message.components = [mock.Mock(components=[button])]
+    return message
+
+
+def _interaction(custom_id: str, user: int, age: float) -> hikari.ComponentInteraction:
+    interaction = mock.Mock(hikari.ComponentInteraction)
+    interaction.custom_id = custom_id
+    interaction.user.id = hikari.Snowflake(user)
+    interaction.message.edited_timestamp = None
+    interaction.message.created_at = (
+        helpers.datetime_utcnow_aware() - datetime.timedelta(seconds=age)
+    )
+    return interaction
+
+
+class TestRouter(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.router = components.Router()
+        self.calls: list[Sequence[str]] = []
+
+        @self.router.handler("game", max_age=30.0, owned=True)
+        async def game(
+            _: hikari.ComponentInteraction, fields: Sequence[str]
+        ) -> hikari.api.InteractionMessageBuilder:
+            self.calls.append(fields)
+            return components.update(components=[])
+
+    def test_pack_round_trips(self) -> None:
+        for number in (0, 35, 36, 883496337616822302):
+            self.assertEqual(components.unpack(components.pack(number)), number)
+
+        self.assertEqual(components.pack(883496337616822302), "6pn9bad5lt7i")
+
+    def test_custom_id_is_bounded(self) -> None:
+        self.assertEqual(self.router.custom_id("game", 1234, "x"), "game:ya:x")
+
+        with self.assertRaises(ValueError):
+            self.router.custom_id("game", "x" * 100)
+
+    async def test_routes_fields_to_the_owner(self) -> None:
+        custom_id = self.router.custom_id("game", 1234, 2)
+        response = await self.router.dispatch(_interaction(custom_id, 1234, 1.0))
+
+        assert response is not None
+        self.assertEqual(response.type, hikari.ResponseType.MESSAGE_UPDATE)
+        self.assertEqual(self.calls, [["2"]])
+
+    async def test_rejects_other_users_and_old_messages(self) -> None:
+        custom_id = self.router.custom_id("game", 1234, 2)
+
+        response = await self.router.dispatch(_interaction(custom_id, 5678, 1.0))
+        assert response is not None
+        self.assertEqual(response.flags, hikari.MessageFlag.EPHEMERAL)
+
+        response = await self.router.dispatch(_interaction(custom_id, 1234, 60.0))
+        assert response is not None
+        self.assertEqual(response.type, hikari.ResponseType.MESSAGE_UPDATE)
+        self.assertEqual(self.calls, [])
+
+    async def test_leaves_unrouted_custom_ids(self) -> None:
+        self.assertIsNone(await self.router.dispatch(_interaction("gone", 1, 0.0)))
+        response = await self.router.on_rest_interaction(_interaction("gone", 1, 0.0))
+        self.assertEqual(response.flags, hikari.MessageFlag.EPHEMERAL)
+
+    async def test_injects_dependencies(self) -> None:
+        injector = alluka.Client().set_type_dependency(str, "injected")
+        self.router.set_injector(injector)
+
+        @self.router.handler("echo")
+        async def echo(
+            _: hikari.ComponentInteraction,
+            fields: Sequence[str],
+            value: alluka.Injected[str],
+        ) -> hikari.api.InteractionMessageBuilder:
+            self.calls.append([*fields, value])
+            return components.update()
+
+        await self.router.dispatch(_interaction("echo:x", 1, 0.0))
+        self.assertEqual(self.calls, [["x", "injected"]])
+
+    async def test_times_out_unedited_messages(self) -> None:
+        rest = mock.Mock(hikari.api.RESTClient)
+        rest.fetch_message = mock.AsyncMock(return_value=_message(31.0))
+        rest.edit_message = mock.AsyncMock()
+        self.router.schedule_timeout(rest, "game", _message(0.0))
+
+        self.assertEqual(list(self.router._timeouts), [(1, 2)])
+        # The wheel cancels a timer before calling it
+        self.router._timeouts[(1, 2)].cancel()
+        await self.router._time_out(rest, (1, 2), 30.0)
+
+        rest.fetch_message.assert_awaited_once_with(1, 2)
+        rest.edit_message.assert_awaited_once()
+        self.assertEqual(self.router._timeouts, {})
+
+    async def test_reschedules_edited_messages(self) -> None:
+        rest = mock.Mock(hikari.api.RESTClient)
+        rest.fetch_message = mock.AsyncMock(return_value=_message(10.0))
+        rest.edit_message = mock.AsyncMock()
+        self.router.schedule_timeout(rest, "game", _message(0.0))
+        timer = self.router._timeouts[(1, 2)]
+        timer.cancel()
+
+        await self.router._time_out(rest, (1, 2), 30.0)
+
+        rest.edit_message.assert_not_awaited()
+        self.assertIs(self.router._timeouts[(1, 2)], timer)
+        self.assertTrue(timer.active)
+        self.router.close()
+        self.assertFalse(timer.active)
+
+    async def test_leaves_finished_messages(self) -> None:
+        rest = mock.Mock(hikari.api.RESTClient)
+        rest.fetch_message = mock.AsyncMock(return_value=_message(31.0, disabled=True))
+        rest.edit_message = mock.AsyncMock()
+        self.router.schedule_timeout(rest, "game", _message(0.0))
+        self.router._timeouts[(1, 2)].cancel()
+
+        await self.router._time_out(rest, (1, 2), 30.0)
+
+        rest.edit_message.assert_not_awaited()
+        self.assertEqual(self.router._timeouts, {})
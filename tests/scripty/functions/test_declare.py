@@ -0,0 +1,59 @@
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+import hikari
+import tanjun
+from hikari.impl import entity_factory
+
+from scripty.functions import declare
+
+
+def _build_client(*names: str) -> tanjun.Client:
+    rest = mock.Mock(hikari.api.RESTClient)
+    rest.entity_factory = entity_factory.EntityFactoryImpl(mock.Mock())
+    client = tanjun.Client(rest, declare_global_commands=False)
+    component = tanjun.Component()
+
+    for name in names:
+        component.add_slash_command(tanjun.SlashCommand(mock.AsyncMock(), name, "d"))
+
+    client.add_component(component)
+    return client
+
+
+class TestDeclare(unittest.IsolatedAsyncioTestCase):
+    def test_command_hash_order(self) -> None:
+        first = _build_client("a", "b")
+        second = _build_client("b", "a")
+        changed = _build_client("a", "c")
+
+        digest = declare.command_hash(first, first.rest.entity_factory)
+        self.assertEqual(
+            digest, declare.command_hash(second, second.rest.entity_factory)
+        )
+        self.assertNotEqual(
+            digest, declare.command_hash(changed, changed.rest.entity_factory)
+        )
+
+    @mock.patch.object(tanjun.Client, "declare_global_commands")
+    async def test_declare_commands(
+        self, declare_global_commands: mock.AsyncMock
+    ) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory, "commands.json")
+            client = _build_client("a")
+
+            self.assertTrue(await declare.declare_commands(client, path))
+            self.assertFalse(await declare.declare_commands(client, path))
+            self.assertTrue(await declare.declare_commands(client, path, guild=1))
+            self.assertTrue(await declare.declare_commands(client, path, force=True))
+            self.assertEqual(declare_global_commands.await_count, 3)
+
+            changed = _build_client("b")
+            self.assertTrue(await declare.declare_commands(changed, path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+import hikari
+
+from scripty.functions import gateway, helpers
+
+
+class TestGateway(unittest.TestCase):
+    def test_modules_known(self) -> None:
+        modules = {path.stem for path in helpers.get_modules("scripty/modules")}
+        self.assertEqual(set(gateway.MODULES), modules)
+
+    def test_enabled_modules(self) -> None:
+        modules = gateway.enabled_modules(["util", "missing"])
+        self.assertNotIn("util", modules)
+        self.assertIn("fun", modules)
+
+    def test_intents_for(self) -> None:
+        intents = gateway.intents_for(["fun", "help"])
+        self.assertEqual(intents, hikari.Intents.GUILDS)
+
+        intents = gateway.intents_for(["dev"])
+        self.assertIn(hikari.Intents.DM_MESSAGES, intents)
+        self.assertNotIn(hikari.Intents.GUILD_MEMBERS, intents)
+
+    def test_cache_settings_for(self) -> None:
+        components = gateway.cache_settings_for(gateway.enabled_modules()).components
+        self.assertIn(hikari.api.CacheComponents.MEMBERS, components)
+        self.assertNotIn(hikari.api.CacheComponents.MESSAGES, components)
+        self.assertNotIn(hikari.api.CacheComponents.PRESENCES, components)
+
+        modules = gateway.enabled_modules(["util"])
+        components = gateway.cache_settings_for(modules).components
+        self.assertNotIn(hikari.api.CacheComponents.MEMBERS, components)
+
+        settings = gateway.cache_settings_for(["fun"], max_messages=100)
+        self.assertIn(hikari.api.CacheComponents.MESSAGES, settings.components)
+        self.assertNotIn(hikari.api.CacheComponents.MEMBERS, settings.components)
+        self.assertEqual(settings.max_messages, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from unittest import mock
+
+from scripty.functions import langid, translate
+
+
+class TestLangid(unittest.IsolatedAsyncioTestCase):
+    def test_detect_by_script(self) -> None:
+        self.assertEqual(langid.detect("안녕하세요 여러분"), "ko")
+        self.assertEqual(langid.detect("今日はいい天気ですね"), "ja")
+        self.assertEqual(langid.detect("Καλημέρα σε όλους"), "el")
+
+    def test_shared_script_is_unknown(self) -> None:
+        self.assertIsNone(langid.detect("今天天气很好"))
+        self.assertIsNone(langid.detect("今天天氣很好"))
+        self.assertIsNone(langid.detect("मी आता झोपायला जातो, उद्या भेटू"))
+        self.assertIsNone(langid.detect("مرحبا بالجميع"))
+
+    def test_detect_by_ngrams(self) -> None:
+        self.assertEqual(langid.detect("I'm going to bed now, see you tomorrow"), "en")
+        self.assertEqual(langid.detect("Je vais me coucher, à demain"), "fr")
+        self.assertEqual(langid.detect("Я пойду спать, увидимся завтра"), "ru")
+
+    def test_lookalike_is_unknown(self) -> None:
+        self.assertIsNone(langid.detect("Jeg går i seng nu, vi ses i morgen"))
+        self.assertIsNone(langid.detect("algú vol jugar més tard aquesta nit"))
+        self.assertIsNone(langid.detect("Ada sesiapa tahu cara menyediakan bot?"))
+        self.assertIsNone(langid.detect("Отивам да спя, ще се видим утре"))
+
+    def test_too_short_is_unknown(self) -> None:
+        self.assertIsNone(langid.detect("ok"))
+        self.assertIsNone(langid.detect("123 :)"))
+        self.assertIsNone(langid.detect("lol ok"))
+
+    def test_is_same_language(self) -> None:
+        self.assertTrue(langid.is_same_language("en", "en"))
+        self.assertTrue(langid.is_same_language("pt", "pt-PT"))
+        self.assertFalse(langid.is_same_language("zh-CN", "zh-TW"))
+
+    async def test_translator_skips_target_language(self) -> None:
+        backend = mock.Mock(translate=mock.AsyncMock())
+        text = "Thank you for your help, see you all tomorrow"
+        translation = await translate.Translator(backend).translate(text)
+
+        backend.translate.assert_not_awaited()
+        self.assertEqual(translation, translate.Translation(text, text, "en", "en"))
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+from scripty import errors
+from scripty.functions import listing, upstream
+
+LISTING = {
+    "data": {
+        "children": [
+            {
+                "data": {
+                    "title": "meme",
+                    "permalink": "/r/memes/1",
+                    "url": "https://i.redd.it/1.png",
+                    "over_18": False,
+                    "is_video": False,
+                }
+            },
+            {
+                "data": {
+                    "title": "video",
+                    "permalink": "/r/memes/2",
+                    "url": "https://v.redd.it/2",
+                    "over_18": False,
+                    "is_video": True,
+                }
+            },
+        ]
+    }
+}
+SERVICE = upstream.Service("test-reddit")
+
+
+class TestListing(unittest.IsolatedAsyncioTestCase):
+    def test_parse_keeps_compact_records(self) -> None:
+        self.assertEqual(
+            listing.parse_submissions(LISTING),
+            (
+                listing.Submission(
+                    "meme", "https://reddit.com/r/memes/1", "https://i.redd.it/1.png"
+                ),
+            ),
+        )
+
+    async def test_revalidates_in_background(self) -> None:
+        client = mock.Mock(upstream.UpstreamClient)
+        client.request = mock.AsyncMock(
+            side_effect=[
+                upstream.Response(200, {"ETag": '"abc"'}, json.dumps(LISTING).encode()),
+                upstream.Response(304, {}, b""),
+            ]
+        )
+        shared = listing.Listing(SERVICE, "https://reddit.com/r/memes/hot.json")
+
+        first = await shared.get(client)
+        self.assertEqual(len(first), 1)
+        self.assertIs(await shared.get(client), first)
+        self.assertEqual(client.request.await_count, 1)
+
+        shared.max_age = 0
+        self.assertIs(await shared.get(client), first)
+        await asyncio.sleep(0)
+
+        self.assertEqual(client.request.await_count, 2)
+        self.assertEqual(
+            client.request.await_args.kwargs["headers"]["If-None-Match"], '"abc"'
+        )
+        self.assertIs(shared.submissions, first)
+
+    async def test_fetches_before_max_age_of_uptime(self) -> None:
+        client = mock.Mock(upstream.UpstreamClient)
+        client.request = mock.AsyncMock(
+            return_value=upstream.Response(200, {}, json.dumps(LISTING).encode())
+        )
+        # Longer than the monotonic clock has run for
+        shared = listing.Listing(
+            SERVICE, "https://reddit.com/r/memes/hot.json", max_age=1e12
+        )
+
+        self.assertEqual(len(await shared.get(client)), 1)
+        client.request.assert_awaited_once()
+
+    async def test_failure_without_submissions_raises(self) -> None:
+        client = mock.Mock(upstream.UpstreamClient)
+        client.request = mock.AsyncMock(return_value=upstream.Response(503, {}, b""))
+        shared = listing.Listing(SERVICE, "https://reddit.com/r/memes/hot.json")
+
+        with self.assertRaises(errors.HTTPError):
+            await shared.get(client)
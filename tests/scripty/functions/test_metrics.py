@@ -0,0 +1,75 @@
+import unittest
+
+from scripty.functions import metrics
+
+
+class TestMetrics(unittest.TestCase):
+    def test_counter(self) -> None:
+        registry = metrics.Registry()
+        counter = registry.register(
+            metrics.Counter("requests_total", "Requests", ("host",))
+        )
+        counter.inc("example.com")
+        counter.inc("example.com", amount=2)
+
+        self.assertEqual(counter.get("example.com"), 3.0)
+        self.assertIn('requests_total{host="example.com"} 3.0', registry.expose())
+
+        with self.assertRaises(ValueError):
+            counter.inc()
+
+    def test_gauge_function(self) -> None:
+        registry = metrics.Registry()
+        gauge = registry.register(metrics.Gauge("entries", "Entries", ("cache",)))
+        gauge.set_function(lambda: 7, "bans")
+
+        self.assertEqual(gauge.get("bans"), 7)
+        self.assertIn('entries{cache="bans"} 7.0', registry.expose())
+
+        gauge.remove_function("bans")
+
+        self.assertEqual(gauge.get("bans"), 0.0)
+        self.assertNotIn('entries{cache="bans"}', registry.expose())
+
+    def test_histogram(self) -> None:
+        registry = metrics.Registry()
+        histogram = registry.register(
+            metrics.Histogram("latency", "Latency", buckets=(0.1, 1.0))
+        )
+
+        for value in (0.05, 0.1, 0.5, 5.0):
+            histogram.observe(value)
+
+        exposition = registry.expose()
+        self.assertIn('latency_bucket{le="0.1"} 2', exposition)
+        self.assertIn('latency_bucket{le="1.0"} 3', exposition)
+        self.assertIn('latency_bucket{le="+Inf"} 4', exposition)
+        self.assertIn("latency_count 4", exposition)
+        self.assertIn("latency_sum 5.65", exposition)
+
+    def test_histogram_summary(self) -> None:
+        histogram = metrics.Histogram(
+            "latency", "Latency", ("command",), buckets=(0.1, 1.0)
+        )
+
+        for value in (0.05, 0.05, 0.5, 5.0):
+            histogram.observe(value, "ping")
+
+        self.assertEqual(list(histogram.labels()), [("ping",)])
+        self.assertEqual(histogram.count("ping"), 4)
+        self.assertAlmostEqual(histogram.mean("ping"), 1.4)
+        self.assertEqual(histogram.quantile(0.5, "ping"), 0.1)
+        self.assertEqual(histogram.quantile(0.75, "ping"), 1.0)
+        self.assertEqual(histogram.quantile(0.95, "ping"), float("inf"))
+        self.assertEqual(histogram.quantile(0.5, "missing"), 0.0)
+
+    def test_register_duplicate(self) -> None:
+        registry = metrics.Registry()
+        registry.register(metrics.Counter("total", "Total"))
+
+        with self.assertRaises(ValueError):
+            registry.register(metrics.Counter("total", "Total"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import pathlib
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import hikari
+
+from scripty.functions import polls
+
+
+def _poll(message_id: int = 1) -> polls.Poll:
+    return polls.Poll(message_id, 2, 3, "Lunch?", ["Pizza", "Sushi"], time.time() + 60)
+
+
+class TestPoll(unittest.TestCase):
+    def test_embed_shows_tallies(self) -> None:
+        poll = _poll()
+        poll.counts = [0, 1]
+
+        description = poll.embed(closed=True).description or ""
+        self.assertIn("Sushi\n`████████████` 1 (100%)", description)
+        self.assertTrue(description.endswith("1 votes, closed"))
+        self.assertEqual(len(poll.buttons()), 2)
+
+
+def _rest() -> mock.Mock:
+    rest = mock.Mock(hikari.api.RESTClient)
+    rest.edit_message = mock.AsyncMock()
+    return rest
+
+
+async def _edited(board: polls.PollBoard) -> None:
+    board._timers.advance()
+
+    while board._timers._callbacks:
+        await board._timers._callbacks.pop()
+
+
+class TestPollBoard(unittest.IsolatedAsyncioTestCase):
+    async def test_vote_moves_and_withdraws(self) -> None:
+        board = polls.PollBoard(_rest(), debounce=0.0)
+        poll = _poll()
+        await board.open(poll)
+
+        self.assertEqual(await board.vote(poll, 10, 0), 0)
+        self.assertEqual(await board.vote(poll, 11, 0), 0)
+        self.assertEqual(await board.vote(poll, 10, 1), 1)
+        self.assertIsNone(await board.vote(poll, 11, 0))
+        self.assertEqual(board._select_counts(poll), ([0, 1], False))
+        await board.close()
+
+    async def test_votes_are_edited_in_once(self) -> None:
+        rest = _rest()
+        board = polls.PollBoard(rest, debounce=0.0)
+        poll = _poll()
+        await board.open(poll)
+
+        for voter in range(1000):
+            await board.vote(poll, voter, voter % 2)
+
+        await _edited(board)
+
+        rest.edit_message.assert_awaited_once()
+        self.assertIn(
+            "500 (50%)", rest.edit_message.await_args.kwargs["embed"].description
+        )
+        await board.close()
+
+    async def test_close_shows_pending_votes(self) -> None:
+        rest = _rest()
+        board = polls.PollBoard(rest, debounce=60.0)
+        poll = _poll()
+        await board.open(poll)
+        await board.vote(poll, 10, 0)
+
+        await board.close()
+
+        rest.edit_message.assert_awaited_once()
+        self.assertIn(
+            "1 (100%)", rest.edit_message.await_args.kwargs["embed"].description
+        )
+        self.assertEqual(len(board._timers), 0)
+
+    async def test_closed_poll_is_not_edited(self) -> None:
+        rest = _rest()
+        board = polls.PollBoard(rest, debounce=0.0)
+        poll = _poll()
+        await board.open(poll)
+        await board.vote(poll, 10, 0)
+
+        self.assertIs(await board.close_poll(1, edit=False), poll)
+        await _edited(board)
+
+        rest.edit_message.assert_not_awaited()
+
+        with self.assertRaises(KeyError):
+            await board.vote(poll, 11, 0)
+
+        await board.close()
+
+    async def test_close_during_edit_shows_final_tallies(self) -> None:
+        rest = _rest()
+        board = polls.PollBoard(rest, debounce=0.0)
+        poll = _poll()
+        await board.open(poll)
+        await board.vote(poll, 10, 0)
+
+        async def close_meanwhile(*_: object, **kwargs: object) -> None:
+            if rest.edit_message.await_count == 1:
+                await board.close_poll(1, edit=False)
+
+        rest.edit_message.side_effect = close_meanwhile
+        await _edited(board)
+
+        self.assertEqual(rest.edit_message.await_count, 2)
+        self.assertEqual(rest.edit_message.await_args.kwargs["components"], [])
+        self.assertTrue(
+            rest.edit_message.await_args.kwargs["embed"].description.endswith(
+                "1 votes, closed"
+            )
+        )
+        await board.close()
+
+    async def test_processes_share_votes(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory, "polls.sqlite3")
+            first = polls.PollBoard(_rest(), path=path)
+            rest = _rest()
+            second = polls.PollBoard(rest, path=path)
+            await first.open(_poll())
+
+            poll = await second.get(1)
+            assert poll is not None
+            await second.vote(poll, 10, 1)
+            closed = await first.close_poll(1)
+
+            assert closed is not None
+            self.assertEqual(closed.counts, [0, 1])
+            self.assertIsNone(await second.close_poll(1))
+            self.assertIsNone(await second.get(1))
+            await first.close()
+            await second.close()
+
+    async def test_open_polls_are_restored_and_closed_ones_kept(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory, "polls.sqlite3")
+            board = polls.PollBoard(_rest(), path=path)
+            await board.open(_poll(1))
+            await board.open(_poll(2))
+            await board.vote(_poll(1), 10, 1)
+            await board.close_poll(2)
+            await board.close()
+
+            restored = polls.PollBoard(_rest(), path=path)
+            await restored.start()
+            poll = await restored.get(1)
+
+            assert poll is not None
+            self.assertEqual(restored._select_counts(poll), ([0, 1], False))
+            self.assertNotIn(2, restored._open)
+            self.assertEqual(restored._select_counts(_poll(2)), ([0, 0], True))
+            await restored.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import itertools
+import unittest
+from unittest import mock
+
+from scripty import errors
+from scripty.functions import prefetch, upstream
+
+
+async def _refilled(buffer: prefetch.PrefetchBuffer[object]) -> None:
+    if buffer._refill is not None:
+        await buffer._refill
+
+
+class TestPrefetchBuffer(unittest.IsolatedAsyncioTestCase):
+    async def test_refills_below_low_water(self) -> None:
+        counter = itertools.count()
+
+        async def fetch(_: upstream.UpstreamClient) -> int:
+            return next(counter)
+
+        buffer = prefetch.PrefetchBuffer("test", fetch, size=3, low_water=2)
+        client = mock.Mock(upstream.UpstreamClient)
+
+        self.assertEqual(await buffer.get(client), 0)
+        await _refilled(buffer)
+        self.assertEqual(len(buffer), 3)
+
+        self.assertEqual(await buffer.get(client), 1)
+        self.assertEqual(len(buffer), 2)
+        await buffer.get(client)
+        await _refilled(buffer)
+        self.assertEqual(len(buffer), 3)
+
+    async def test_drops_expired_results(self) -> None:
+        async def fetch(_: upstream.UpstreamClient) -> str:
+            return "fresh"
+
+        buffer = prefetch.PrefetchBuffer("test", fetch, size=2, max_age=60)
+        buffer._ready.append((0.0, "stale"))
+
+        self.assertEqual(await buffer.get(mock.Mock(upstream.UpstreamClient)), "fresh")
+
+    async def test_keeps_results_without_max_age(self) -> None:
+        fetch = mock.AsyncMock(return_value="fresh")
+        buffer = prefetch.PrefetchBuffer("test", fetch, size=2, low_water=0)
+        buffer._ready.append((0.0, "old"))
+
+        self.assertEqual(await buffer.get(mock.Mock(upstream.UpstreamClient)), "old")
+        fetch.assert_not_awaited()
+
+    async def test_pauses_after_error(self) -> None:
+        fetch = mock.AsyncMock(side_effect=errors.HTTPError("down"))
+        buffer = prefetch.PrefetchBuffer("test", fetch, size=2)
+        client = mock.Mock(upstream.UpstreamClient)
+
+        with self.assertRaises(errors.HTTPError):
+            await buffer.get(client)
+
+        await _refilled(buffer)
+        calls = fetch.await_count
+
+        with self.assertRaises(errors.HTTPError):
+            await buffer.get(client)
+
+        await _refilled(buffer)
+        self.assertEqual(fetch.await_count, calls + 1)
@@ -0,0 +1,31 @@
+import unittest
+from unittest import mock
+
+import hikari
+
+from scripty.functions import resolve
+
+
+class TestResolver(unittest.IsolatedAsyncioTestCase):
+    async def test_without_gateway_cache(self) -> None:
+        rest = mock.Mock(hikari.api.RESTClient)
+        rest.fetch_my_user = mock.AsyncMock(return_value=mock.Mock(hikari.OwnUser))
+        rest.fetch_guild = mock.AsyncMock(return_value=mock.Mock(hikari.RESTGuild))
+        channel = mock.Mock(hikari.GuildTextChannel, id=hikari.Snowflake(2))
+        rest.fetch_guild_channels = mock.AsyncMock(return_value=[channel])
+        resolver = resolve.Resolver(None, rest)
+
+        self.assertIs(await resolver.me(), await resolver.me())
+        rest.fetch_my_user.assert_awaited_once()
+
+        guild = await resolver.guild(1)
+        guild.id = hikari.Snowflake(1)
+        guild.get_channels.return_value = {}
+
+        self.assertEqual(await resolver.channels(guild), {2: channel})
+        self.assertEqual(await resolver.channels(guild), {2: channel})
+        rest.fetch_guild_channels.assert_awaited_once_with(1)
+
+
+if __name__ == "__main__":
+    unittest.main()
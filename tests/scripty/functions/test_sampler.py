@@ -0,0 +1,75 @@
+import asyncio
+import unittest
+
+from scripty.functions import sampler
+
+
+def make_sample(timestamp: float, cpu_percent: float) -> sampler.Sample:
+    return sampler.Sample(
+        timestamp=timestamp,
+        cpu_percent=cpu_percent,
+        rss=0,
+        open_fds=0,
+        tasks=0,
+        gc_counts=(0, 0, 0),
+        gc_collections=0,
+        memory_used=0,
+        memory_total=0,
+    )
+
+
+class TestSystemSampler(unittest.TestCase):
+    def test_ring_buffer(self) -> None:
+        system_sampler = sampler.SystemSampler(interval=5.0, history=15.0)
+
+        for i in range(10):
+            system_sampler.record(make_sample(i * 5.0, float(i)))
+
+        self.assertEqual(len(system_sampler), 3)
+        self.assertEqual(system_sampler.latest, make_sample(45.0, 9.0))
+
+    def test_summarize(self) -> None:
+        system_sampler = sampler.SystemSampler(interval=5.0, history=3600.0)
+        self.assertIsNone(system_sampler.summarize("cpu_percent", 60.0))
+
+        for i in range(20):
+            system_sampler.record(make_sample(i * 5.0, float(i)))
+
+        self.assertEqual(
+            system_sampler.summarize("cpu_percent", 10.0),
+            sampler.Summary(17.0, 18.0, 19.0),
+        )
+        self.assertEqual(
+            system_sampler.summarize("cpu_percent", 3600.0),
+            sampler.Summary(0.0, 9.5, 19.0),
+        )
+
+
+class TestSystemSamplerRun(unittest.IsolatedAsyncioTestCase):
+    async def test_failed_sample_keeps_sampling(self) -> None:
+        system_sampler = sampler.SystemSampler(interval=0.001, history=60.0)
+        results = iter(
+            [(0.0, 0, 0, 0, 0), OSError("gone"), (5.0, 1, 2, 3, 4), (6.0, 1, 2, 3, 4)]
+        )
+
+        def collect() -> tuple[float, int, int, int, int]:
+            result = next(results)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        system_sampler._collect = collect  # type: ignore[method-assign]
+
+        with self.assertLogs("scripty.sampler"):
+            system_sampler.start()
+            for _ in range(20):
+                await asyncio.sleep(0.01)
+                if len(system_sampler) == 2:
+                    break
+
+        await system_sampler.close()
+        self.assertEqual(system_sampler.latest.cpu_percent, 6.0)  # type: ignore[union-attr]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import asyncio
+import inspect
+import pathlib
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import hikari
+
+from hikari.impl import shard as shard_impl
+
+from scripty.functions import sessions
+
+
+def _build_shard(
+    store: sessions.SessionStore, cache: hikari.api.Cache | None = None
+) -> sessions.ResumableShard:
+    return sessions.ResumableShard(
+        store=store,
+        cache=cache or mock.Mock(get_guilds_view=mock.Mock(return_value={})),
+        http_settings=hikari.impl.HTTPSettings(),
+        proxy_settings=hikari.impl.ProxySettings(),
+        event_manager=mock.Mock(),
+        event_factory=mock.Mock(),
+        intents=hikari.Intents.GUILDS,
+        shard_id=1,
+        shard_count=2,
+        token="token",
+        url="wss://gateway.discord.gg",
+    )
+
+
+class TestSessions(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = sessions.SessionStore(
+            pathlib.Path(self.directory.name), max_age=60
+        )
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_load_once(self) -> None:
+        session = sessions.Session("id", 42, "wss://resume", 2, time.time(), [1])
+        self.store.save(1, session)
+
+        self.assertEqual(self.store.load(1, 2), session)
+        self.assertIsNone(self.store.load(1, 2))
+
+    def test_load_stale(self) -> None:
+        now = time.time()
+        self.store.save(1, sessions.Session("id", 42, "wss://r", 2, now - 61, []))
+        self.store.save(2, sessions.Session("id", 42, "wss://r", 4, now, []))
+
+        self.assertIsNone(self.store.load(1, 2))
+        self.assertIsNone(self.store.load(2, 2))
+
+    def test_load_too_many_guilds(self) -> None:
+        store = sessions.SessionStore(pathlib.Path(self.directory.name), max_guilds=2)
+        store.save(1, sessions.Session("id", 42, "wss://r", 2, time.time(), [1, 3, 5]))
+
+        self.assertIsNone(store.load(1, 2))
+
+    async def test_close_keeps_session(self) -> None:
+        # Guild 1 << 22 is on shard 1 of 2, guild 2 << 22 on shard 0
+        cache = mock.Mock()
+        cache.get_guilds_view.return_value = {
+            hikari.Snowflake(1 << 22): None,
+            hikari.Snowflake(2 << 22): None,
+        }
+        shard = _build_shard(self.store, cache)
+        ws = mock.Mock(send_close=mock.AsyncMock())
+        shard._ws = ws
+        shard._keep_alive_task = asyncio.create_task(asyncio.sleep(60))
+        shard._session_id = "id"
+        shard._seq = 42
+        shard._resume_gateway_url = "wss://resume"
+
+        await shard.close()
+
+        ws.send_close.assert_awaited_once_with(code=3000, message=mock.ANY)
+        session = self.store.load(1, 2)
+        assert session is not None
+        self.assertEqual(session[:4], ("id", 42, "wss://resume", 2))
+        self.assertEqual(session.guild_ids, [1 << 22])
+
+    async def test_rebuild_cache(self) -> None:
+        guild = mock.Mock(
+            hikari.RESTGuild,
+            id=hikari.Snowflake(1),
+            roles={2: mock.sentinel.role},
+            emojis={3: mock.sentinel.emoji},
+            approximate_member_count=10,
+        )
+        channel = mock.Mock(hikari.GuildTextChannel)
+        rest = mock.Mock()
+        rest.fetch_my_user = mock.AsyncMock(return_value=mock.sentinel.me)
+        rest.fetch_guild = mock.AsyncMock(
+            side_effect=[guild, hikari.ForbiddenError("", {}, b"")]
+        )
+        rest.fetch_guild_channels = mock.AsyncMock(return_value=[channel])
+        cache = mock.Mock()
+
+        await sessions.rebuild_cache(cache, rest, [1, 4])
+
+        cache.set_me.assert_called_once_with(mock.sentinel.me)
+        cache.set_guild.assert_called_once()
+        cached = cache.set_guild.call_args.args[0]
+        self.assertIsInstance(cached, hikari.GatewayGuild)
+        self.assertEqual((cached.id, cached.member_count), (1, 10))
+        cache.set_role.assert_called_once_with(mock.sentinel.role)
+        cache.set_emoji.assert_called_once_with(mock.sentinel.emoji)
+        cache.set_guild_channel.assert_called_once_with(channel)
+
+
+class TestHikariInternals(unittest.TestCase):
+    def test_version(self) -> None:
+        # Check the attributes below and that ResumableGatewayBot still mirrors
+        # hikari.GatewayBot._start_one_shard before changing the pinned version
+        self.assertEqual(hikari.__version__, sessions._HIKARI_VERSION)
+
+    def test_other_version_not_resumed(self) -> None:
+        store = sessions.SessionStore(pathlib.Path("sessions"))
+
+        with mock.patch.object(sessions, "_HIKARI_VERSION", "0.0.0"):
+            with self.assertLogs("scripty.sessions", "WARNING"):
+                bot = sessions.ResumableGatewayBot("token", store=store)
+
+        self.assertIsNone(bot._session_store)
+        self.assertIs(
+            sessions.ResumableGatewayBot("token", store=store)._session_store, store
+        )
+
+    def test_private_attributes(self) -> None:
+        for name in ("_session_id", "_seq", "_resume_gateway_url", "_ws"):
+            self.assertIn(name, shard_impl.GatewayShardImpl.__slots__)
+
+        for name in (
+            "_cache",
+            "_event_factory",
+            "_event_manager",
+            "_http_settings",
+            "_intents",
+            "_proxy_settings",
+            "_rest",
+            "_shards",
+            "_token",
+        ):
+            self.assertTrue(hasattr(hikari.GatewayBot, name), name)
+
+    def test_start_one_shard_signature(self) -> None:
+        self.assertEqual(
+            inspect.signature(
+                sessions.ResumableGatewayBot._start_one_shard
+            ).parameters.keys(),
+            inspect.signature(hikari.GatewayBot._start_one_shard).parameters.keys(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from scripty.functions import cache, snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        registry = snapshot.SnapshotRegistry()
+        bans: cache.TTLCache[int, tuple[tuple[str, int], ...]] = cache.TTLCache(
+            ttl=60, cache_len=10
+        )
+        registry.register("bans", bans)
+        bans.set(1, (("user", 2),))
+        bans.set(3, (), ttl=5)
+        data = registry.dumps()
+
+        restored: cache.TTLCache[int, tuple[tuple[str, int], ...]] = cache.TTLCache(
+            ttl=60, cache_len=10
+        )
+        registry.register("bans", restored)
+
+        with mock.patch("time.time", return_value=json.loads(data)["saved_at"] + 10):
+            self.assertEqual(registry.loads(data), 1)
+
+        self.assertEqual(restored.get(1), (("user", 2),))
+        self.assertIsNone(restored.get(3))
+        _, _, remaining = next(restored.items())
+        self.assertLessEqual(remaining, 50)
+
+    def test_get_or_create(self) -> None:
+        registry = snapshot.SnapshotRegistry()
+        first: cache.TTLCache[str, int] = registry.get_or_create(
+            "mod.bans", lambda: cache.TTLCache(ttl=60, cache_len=10)
+        )
+        first.set("a", 1)
+        second: cache.TTLCache[str, int] = registry.get_or_create(
+            "mod.bans", lambda: cache.TTLCache(ttl=60, cache_len=10)
+        )
+
+        self.assertIs(first, second)
+        self.assertEqual(registry.sizes("mod."), {"mod.bans": 1})
+        self.assertEqual(registry.sizes("util."), {})
+
+    def test_version_mismatch(self) -> None:
+        registry = snapshot.SnapshotRegistry()
+        registry.register("bans", cache.TTLCache(ttl=60, cache_len=10))
+        data = json.dumps({"version": snapshot.VERSION + 1}).encode()
+
+        self.assertEqual(registry.loads(data), 0)
+
+    def test_save_restore(self) -> None:
+        registry = snapshot.SnapshotRegistry()
+        counts: cache.TTLCache[str, int] = cache.TTLCache(ttl=60, cache_len=10)
+        registry.register("counts", counts)
+        counts.set("a", 1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory, "caches.snapshot")
+            self.assertEqual(registry.restore(path), 0)
+
+            registry.save(path)
+            counts.clear()
+            self.assertEqual(registry.restore(path), 1)
+            self.assertEqual(counts.get("a"), 1)
+
+            for data in (b"corrupt", b"[]", b'{"version": 1, "caches": {"counts": 1}}'):
+                path.write_bytes(data)
+
+                with self.assertLogs("scripty.snapshot", "WARNING"):
+                    self.assertEqual(registry.restore(path), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import asyncio
+import unittest
+
+from scripty.functions import timers
+
+
+class TestTimerWheel(unittest.IsolatedAsyncioTestCase):
+    async def test_fires_after_whole_ticks(self) -> None:
+        # A long tick keeps the wheel's own task from advancing it
+        wheel = timers.TimerWheel(tick=60.0, slots=4)
+        fired: list[str] = []
+        wheel.schedule(120.0, lambda: fired.append("short"))
+        wheel.schedule(600.0, lambda: fired.append("long"))
+
+        for _ in range(2):
+            wheel.advance()
+        self.assertEqual(fired, [])
+
+        wheel.advance()
+        self.assertEqual(fired, ["short"])
+
+        # Wrapping around the ring several times before firing
+        for _ in range(7):
+            wheel.advance()
+        self.assertEqual(fired, ["short"])
+
+        wheel.advance()
+        self.assertEqual(fired, ["short", "long"])
+        self.assertEqual(len(wheel), 0)
+
+    async def test_cancel_and_reschedule(self) -> None:
+        wheel = timers.TimerWheel(tick=60.0, slots=4)
+        fired: list[int] = []
+        cancelled = wheel.schedule(60.0, lambda: fired.append(1))
+        moved = wheel.schedule(60.0, lambda: fired.append(2))
+
+        cancelled.cancel()
+        wheel.advance()
+        moved.reschedule(60.0)
+        wheel.advance()
+        self.assertEqual(fired, [])
+        self.assertFalse(cancelled.active)
+
+        wheel.advance()
+        self.assertEqual(fired, [2])
+        self.assertFalse(moved.active)
+
+    async def test_runs_coroutine_callbacks(self) -> None:
+        wheel = timers.TimerWheel(tick=0.01, slots=4)
+        done = asyncio.Event()
+
+        async def callback() -> None:
+            done.set()
+
+        wheel.schedule(0.01, callback)
+        await asyncio.wait_for(done.wait(), 1.0)
+        await asyncio.sleep(0.05)
+
+        self.assertIsNone(wheel._task)
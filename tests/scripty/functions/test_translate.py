@@ -0,0 +1,226 @@
+import asyncio
+import pathlib
+import tempfile
+import unittest
+from typing import Any
+from unittest import mock
+
+from scripty import errors
+from scripty.functions import translate
+
+RESPONSE = {
+    "sentences": [
+        {"trans": "Hello. ", "orig": "Hallo. "},
+        {"trans": "How are you?", "orig": "Wie geht es dir?"},
+    ],
+    "src": "de",
+}
+
+
+def _backend(raw: Any = RESPONSE) -> mock.Mock:
+    # gpytranslate keeps the decoded response as the raw attribute of its result
+    return mock.Mock(translate=mock.AsyncMock(return_value=mock.Mock(raw=raw)))
+
+
+class TestTranslate(unittest.IsolatedAsyncioTestCase):
+    def test_parse(self) -> None:
+        self.assertEqual(
+            translate.parse(RESPONSE, "en"),
+            translate.Translation(
+                "Hallo. Wie geht es dir?", "Hello. How are you?", "de", "en"
+            ),
+        )
+
+    async def test_translate_detects_in_one_request(self) -> None:
+        backend = _backend()
+        translation = await translate.Translator(backend).translate(
+            "Hallo. Wie geht es dir?"
+        )
+
+        backend.translate.assert_awaited_once()
+        self.assertEqual(translation.source, "de")
+        self.assertEqual(backend.translate.await_args.kwargs["sourcelang"], "auto")
+
+    async def test_invalid_response_raises(self) -> None:
+        with self.assertRaises(errors.HTTPError):
+            await translate.Translator(_backend([])).translate("Hallo")
+
+        backend = mock.Mock(translate=mock.AsyncMock(side_effect=ValueError))
+
+        with self.assertRaises(errors.HTTPError):
+            await translate.Translator(backend).translate("Hallo")
+
+    async def test_timeout_raises(self) -> None:
+        async def translate_slowly(*_: object, **__: object) -> None:
+            await asyncio.sleep(1)
+
+        backend = mock.Mock(translate=translate_slowly)
+
+        with self.assertRaises(errors.HTTPError):
+            await translate.Translator(backend, timeout=0.01).translate("Hallo")
+
+
+class TestTranslationCache(unittest.IsolatedAsyncioTestCase):
+    def test_key_normalizes_whitespace(self) -> None:
+        self.assertEqual(
+            translate.cache_key("Hallo  Welt\n", "auto", "en"),
+            translate.cache_key("Hallo Welt", "auto", "en"),
+        )
+        self.assertNotEqual(
+            translate.cache_key("Hallo Welt", "auto", "en"),
+            translate.cache_key("Hallo Welt", "auto", "fr"),
+        )
+
+    async def test_repeat_translation_skips_upstream(self) -> None:
+        backend = _backend()
+        translator = translate.Translator(backend, cache=translate.TranslationCache())
+        first = await translator.translate("Hallo. Wie geht es dir?")
+        second = await translator.translate("Hallo.  Wie geht es dir?")
+
+        self.assertEqual(first, second)
+        backend.translate.assert_awaited_once()
+
+    async def test_disk_tier_survives_restart(self) -> None:
+        translation = translate.Translation("Hallo", "Hello", "de", "en")
+        key = translate.cache_key("Hallo", "auto", "en")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory, "translations.sqlite3")
+            first = translate.TranslationCache(path=path)
+            await first.put(key, translation)
+            first.close()
+
+            second = translate.TranslationCache(path=path)
+            self.assertEqual(await second.get(key), translation)
+            self.assertEqual(second.memory.get(key), translation)
+            second.close()
+
+    async def test_disk_tier_is_pruned(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory, "translations.sqlite3")
+            translation_cache = translate.TranslationCache(path=path, max_rows=10)
+
+            for index in range(1000):
+                await translation_cache.put(
+                    translate.cache_key(str(index), "auto", "en"),
+                    translate.Translation(str(index), str(index), "en", "en"),
+                )
+
+            assert translation_cache._db is not None
+            (rows,) = translation_cache._db.execute(
+                "SELECT COUNT(*) FROM translations"
+            ).fetchone()
+            self.assertEqual(rows, 10)
+            translation_cache.close()
+
+
+def _fake_translate(text: str, **_: object) -> mock.Mock:
+    # Every line is a sentence, translated by upper casing it
+    lines = text.splitlines(keepends=True)
+    sentences = [{"orig": line, "trans": line.upper()} for line in lines]
+    return mock.Mock(raw={"sentences": sentences, "src": "xx"})
+
+
+class TestTranslateMany(unittest.IsolatedAsyncioTestCase):
+    async def test_packs_texts_into_batches(self) -> None:
+        backend = mock.Mock(translate=mock.AsyncMock(side_effect=_fake_translate))
+        texts = [
+            f"Wir sehen uns morgen im Kino {index}\n\nbis dann" for index in range(10)
+        ]
+        chunks = [
+            chunk
+            async for chunk in translate.Translator(backend).translate_many(
+                texts, max_chars=120
+            )
+        ]
+
+        self.assertEqual(sum(map(len, chunks)), 10)
+        self.assertEqual(backend.translate.await_count, len(chunks))
+        self.assertLess(len(chunks), 10)
+        translations = [translation for chunk in chunks for translation in chunk]
+        self.assertEqual(
+            [translation.text.split() for translation in translations],
+            [
+                [
+                    "WIR",
+                    "SEHEN",
+                    "UNS",
+                    "MORGEN",
+                    "IM",
+                    "KINO",
+                    str(index),
+                    "BIS",
+                    "DANN",
+                ]
+                for index in range(10)
+            ],
+        )
+        self.assertEqual(translations[0].original, texts[0])
+
+    async def test_keeps_detected_source(self) -> None:
+        backend = mock.Mock(translate=mock.AsyncMock(side_effect=_fake_translate))
+        texts = ["Ich gehe jetzt schlafen, bis morgen", "das war der Film"]
+        translations = [
+            translation
+            async for chunk in translate.Translator(backend).translate_many(texts)
+            for translation in chunk
+        ]
+
+        self.assertEqual(
+            [translation.source for translation in translations], ["xx"] * 2
+        )
+
+    async def test_batches_only_texts_of_one_language(self) -> None:
+        backend = mock.Mock(translate=mock.AsyncMock(side_effect=_fake_translate))
+        cache = translate.TranslationCache()
+        texts = [
+            "Ich gehe jetzt schlafen, bis morgen",
+            "Je vais dormir maintenant, à demain",
+            "das war der Film",
+            "zzz qqq",
+            "xxx yyy",
+        ]
+        translations = [
+            translation
+            async for chunk in translate.Translator(
+                backend, cache=cache
+            ).translate_many(texts)
+            for translation in chunk
+        ]
+
+        self.assertEqual([translation.original for translation in translations], texts)
+        sent = [args.args[0] for args in backend.translate.await_args_list]
+        self.assertEqual(
+            sent,
+            [
+                "Ich gehe jetzt schlafen, bis morgen\n\ndas war der Film",
+                "Je vais dormir maintenant, à demain",
+                "zzz qqq",
+                "xxx yyy",
+            ],
+        )
+        # Only the texts translated alone are cached
+        for text, cached in zip(texts, (False, True, False, True, True)):
+            translation = await cache.get(translate.cache_key(text, "auto", "en"))
+            self.assertEqual(translation is not None, cached, text)
+
+    async def test_skipped_and_cached_texts_are_not_sent(self) -> None:
+        backend = mock.Mock(translate=mock.AsyncMock(side_effect=_fake_translate))
+        translator = translate.Translator(backend, cache=translate.TranslationCache())
+        await translator.translate("zzz qqq")
+        backend.translate.reset_mock()
+
+        chunks = [
+            chunk
+            async for chunk in translator.translate_many(
+                ["zzz qqq", "Thank you for your help, see you all tomorrow"]
+            )
+        ]
+
+        backend.translate.assert_not_awaited()
+        self.assertEqual([len(chunk) for chunk in chunks], [2])
+
+    def test_split_falls_back_when_sentences_cross_texts(self) -> None:
+        raw = {"sentences": [{"orig": "a\n\nb", "trans": "A B"}], "src": "xx"}
+
+        self.assertIsNone(translate.split(raw, ["a", "b"], "en"))
@@ -0,0 +1,93 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from aiohttp import test_utils, web
+
+from scripty import errors
+from scripty.functions import metrics, upstream
+
+
+class TestUpstreamClient(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.calls = 0
+        app = web.Application()
+        app.router.add_get("/flaky", self.flaky)
+        app.router.add_get("/slow-once", self.slow_once)
+        app.router.add_get("/hang", self.hang)
+        self.server = test_utils.TestServer(app)
+        await self.server.start_server()
+        self.client = upstream.UpstreamClient()
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        await self.server.close()
+
+    async def flaky(self, _: web.Request) -> web.Response:
+        self.calls += 1
+
+        if self.calls == 1:
+            return web.Response(status=503)
+
+        return web.json_response({"ok": True})
+
+    async def slow_once(self, _: web.Request) -> web.Response:
+        self.calls += 1
+
+        if self.calls == 1:
+            await asyncio.sleep(5)
+
+        return web.Response(text='{"call": %d}' % self.calls)
+
+    async def hang(self, _: web.Request) -> web.Response:
+        await asyncio.sleep(5)
+        return web.Response()
+
+    async def test_retries_retryable_status(self) -> None:
+        service = upstream.Service("test-retry", timeout=2.0, retries=1)
+        data = await self.client.get_json(service, str(self.server.make_url("/flaky")))
+
+        self.assertEqual(data, {"ok": True})
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(metrics.UPSTREAM_RETRIES.get("test-retry"), 1)
+        self.assertEqual(metrics.UPSTREAM_LATENCY.count("test-retry"), 1)
+
+    async def test_returns_last_response_when_out_of_retries(self) -> None:
+        service = upstream.Service("test-status", timeout=2.0, retries=0)
+        url = str(self.server.make_url("/flaky"))
+
+        self.assertEqual((await self.client.request(service, "GET", url)).status, 503)
+
+        with self.assertRaises(errors.HTTPError):
+            self.calls = 0
+            await self.client.get_json(service, url)
+
+    async def test_no_backoff_after_last_attempt(self) -> None:
+        service = upstream.Service("test-last", timeout=2.0, retries=0)
+        url = str(self.server.make_url("/flaky"))
+
+        with mock.patch("asyncio.sleep") as sleep:
+            self.assertEqual(
+                (await self.client.request(service, "GET", url)).status, 503
+            )
+
+        sleep.assert_not_called()
+
+    async def test_hedges_slow_request(self) -> None:
+        service = upstream.Service(
+            "test-hedge", timeout=2.0, retries=0, hedge_after=0.05
+        )
+        data = await self.client.get_json(
+            service, str(self.server.make_url("/slow-once"))
+        )
+
+        self.assertEqual(data, {"call": 2})
+        self.assertEqual(metrics.UPSTREAM_HEDGES.get("test-hedge"), 1)
+
+    async def test_timeout_raises(self) -> None:
+        service = upstream.Service("test-timeout", timeout=0.1, retries=2)
+
+        with self.assertRaises(errors.HTTPError):
+            await self.client.request(
+                service, "GET", str(self.server.make_url("/hang"))
+            )
@@ -0,0 +1,36 @@
+import asyncio
+import time
+import unittest
+
+from scripty.functions import watchdog
+
+
+def block_loop() -> None:
+    time.sleep(0.3)
+
+
+class TestLoopMonitor(unittest.IsolatedAsyncioTestCase):
+    async def test_percentiles(self) -> None:
+        monitor = watchdog.LoopMonitor()
+        self.assertIsNone(monitor.percentiles(0.5))
+
+        for lag in range(100):
+            monitor.record(lag / 1000)
+
+        self.assertEqual(monitor.percentiles(0.5, 0.99, 1.0), (0.05, 0.099, 0.099))
+
+    async def test_stall_captured(self) -> None:
+        monitor = watchdog.LoopMonitor(interval=0.05, threshold=0.1)
+        monitor.start()
+
+        await asyncio.sleep(0.1)
+        block_loop()
+        await asyncio.sleep(0.1)
+        await monitor.close()
+
+        self.assertEqual(len(monitor.stalls), 1)
+        self.assertIn("block_loop", monitor.stalls[0].stack)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import sys
+import unittest
+from unittest import mock
+
+import hikari
+import tanjun
+
+from scripty.functions import snapshot
+from scripty.modules import dev
+
+
+class TestDev(unittest.IsolatedAsyncioTestCase):
+    async def test_reload_keeps_registered_caches(self) -> None:
+        client = tanjun.Client(mock.Mock(hikari.api.RESTClient))
+        client.load_modules("scripty.modules.mod")
+        self.addCleanup(client.unload_modules, "scripty.modules.mod")
+        bans = sys.modules["scripty.modules.mod"]._guild_ban_cache
+        ctx = mock.Mock(respond=mock.AsyncMock())
+
+        await dev.reload.callback(ctx, client, "mod")
+
+        self.assertIs(sys.modules["scripty.modules.mod"]._guild_ban_cache, bans)
+        self.assertIs(
+            snapshot.REGISTRY.get_or_create("mod.guild_bans", mock.Mock()), bans
+        )
+        ctx.respond.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
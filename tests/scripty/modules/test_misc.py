@@ -0,0 +1,24 @@
+import unittest
+from unittest import mock
+
+import hikari
+
+from scripty.functions import components, polls
+from scripty.modules import misc
+
+
+class TestPolls(unittest.IsolatedAsyncioTestCase):
+    async def test_unknown_poll_keeps_buttons(self) -> None:
+        board = polls.PollBoard(mock.Mock(hikari.api.RESTClient))
+        interaction = mock.Mock(hikari.ComponentInteraction)
+        interaction.message.id = hikari.Snowflake(1)
+
+        response = await misc.poll_vote(interaction, [components.pack(0)], board)
+
+        self.assertEqual(response.type, hikari.ResponseType.MESSAGE_CREATE)
+        self.assertEqual(response.flags, hikari.MessageFlag.EPHEMERAL)
+        self.assertIs(response.components, hikari.UNDEFINED)
+
+
+if __name__ == "__main__":
+    unittest.main()